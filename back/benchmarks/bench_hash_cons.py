@@ -0,0 +1,78 @@
+"""
+Relatório de memória do hash-consing de subárvores.
+
+Gera um corpus de programas com muitas expressões e blocos repetidos (como
+os programas gerados que usamos) e mede, com tracemalloc, os bytes retidos
+pelas árvores com e sem um HashConsBuilder compartilhado entre os
+programas. Execute a partir de `back/`:
+
+    python -m benchmarks.bench_hash_cons [programas]
+"""
+
+import random
+import sys
+
+from benchmarks.bench_syntax_tree import count_nodes
+from benchmarks.bench_token_stream import retained_bytes
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+from trees.hashcons import HashConsBuilder
+from trees.traversal import preorder
+
+EXPRESSIONS = ["a * b + c", "(x + 1) * (y - 1)", "total / 2 - desconto", "i + 1", "a * a + b * b"]
+
+BLOCKS = [
+    "if ({e} > limite) {{ total = total + {e}; print(total); }}",
+    "while (i < 10) {{ i = i + 1; soma = soma + {e}; }}",
+    "print({e}, {e});",
+    "x = {e};",
+]
+
+
+def corpus(programs, statements=200, seed=7):
+    rng = random.Random(seed)
+    return [
+        "\n".join(
+            rng.choice(BLOCKS).format(e=rng.choice(EXPRESSIONS)) for _ in range(statements)
+        )
+        for _ in range(programs)
+    ]
+
+
+def subnodes(node):
+    if hasattr(node.value, "children"):
+        return [node.value, *node.children]
+    return node.children
+
+
+def unique_nodes(trees):
+    seen = set()
+    for tree in trees:
+        for node in preorder(tree, subnodes):
+            seen.add(id(node))
+    return len(seen)
+
+
+def main():
+    programs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    streams = [RegexLexer(text).tokenize_stream() for text in corpus(programs)]
+
+    plain, plain_bytes = retained_bytes(lambda: [Parser(stream).parse() for stream in streams])
+    nodes = sum(count_nodes(tree) for tree in plain)
+    del plain
+
+    def build_shared():
+        builder = HashConsBuilder()
+        return builder, [Parser(stream, builder).parse() for stream in streams]
+
+    (builder, shared), shared_bytes = retained_bytes(build_shared)
+    shared_nodes = unique_nodes(shared)
+
+    print(f"Programas: {programs:,}  Nós: {nodes:,}  Nós distintos: {shared_nodes:,}")
+    print(f"{'sem hash-consing':>17}: {plain_bytes / 2**20:7.1f} MiB")
+    print(f"{'com hash-consing':>17}: {shared_bytes / 2**20:7.1f} MiB (inclui a tabela do builder)")
+    print(f"Economia: {1 - shared_bytes / plain_bytes:.0%}")
+
+
+if __name__ == "__main__":
+    main()
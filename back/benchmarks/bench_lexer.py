@@ -0,0 +1,81 @@
+"""
+Benchmark dos analisadores léxicos.
+
+Compara tokens/segundo do LexerInterpreter (caractere a caractere) com o
+RegexLexer (regex única). Execute a partir de `back/`:
+
+    python -m benchmarks.bench_lexer [repetições]
+"""
+
+import sys
+import time
+
+from lexical.src.lexer import LexerInterpreter
+from lexical.src.regex_lexer import RegexLexer
+
+SNIPPET = """
+int contador = 0;  # contador de iterações
+int resultado_parcial = 1;
+string mensagem = "Calculando o fatorial dos primeiros valores";
+while (contador < 1000) {
+    resultado_parcial = resultado_parcial * (contador + 1);
+    if (resultado_parcial >= 100000) {
+        print(mensagem, contador, resultado_parcial);
+    } else {
+        contador = contador + 1;
+    }
+}
+"""
+
+
+def build_program(repeat):
+    return SNIPPET * repeat
+
+
+def count_tokens(lexer_class, text):
+    lexer = lexer_class(text)
+    count = 0
+    token = lexer.get_next_token()
+    while token[1] is not None:
+        count += 1
+        token = lexer.get_next_token()
+    return count
+
+
+def bulk_tokens(lexer_class, text):
+    return len(lexer_class(text).tokenize())
+
+
+def bench(function, lexer_class, text, rounds=7):
+    best = float("inf")
+    tokens = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        tokens = function(lexer_class, text)
+        best = min(best, time.perf_counter() - start)
+    return tokens, best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = build_program(repeat)
+    print(f"Programa: {len(text)} caracteres")
+
+    cases = [
+        ("LexerInterpreter", count_tokens, LexerInterpreter),
+        ("RegexLexer", count_tokens, RegexLexer),
+        ("RegexLexer.tokenize", bulk_tokens, RegexLexer),
+    ]
+    baseline = None
+    for name, function, lexer_class in cases:
+        tokens, elapsed = bench(function, lexer_class, text)
+        rate = tokens / elapsed
+        baseline = baseline or rate
+        print(
+            f"{name:>20}: {tokens} tokens em {elapsed:.3f}s "
+            f"({rate:,.0f} tokens/s, {rate / baseline:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Escalabilidade do lexer simplificado da LPS (lps/frontend/simple_lexer.py).
+
+Tokeniza programas de 1 KB a 10 MB e mostra o tempo e o custo por byte de
+cada tamanho; em tempo linear o custo por byte se mantém aproximadamente
+constante. Execute a partir de `back/`:
+
+    python -m benchmarks.bench_lps_lexer [maior tamanho em bytes]
+"""
+
+import sys
+import timeit
+from collections import deque
+from pathlib import Path
+
+# Os módulos da LPS se importam a partir do diretório lps/
+sys.path.append(str(Path(__file__).parent.parent / "lps"))
+
+from frontend.simple_lexer import SimpleMiniparLexer
+
+SNIPPET = """
+int contador = 0;
+while (contador < 1000) {
+    contador = contador + 1;
+    print("valor", contador);
+}
+"""
+
+
+def build_program(size):
+    return (SNIPPET * (size // len(SNIPPET) + 1))[:size]
+
+
+def bench(source_code):
+    number = max(1, 1_000_000 // len(source_code))
+    elapsed = min(
+        timeit.repeat(
+            lambda: deque(SimpleMiniparLexer(source_code).iter_tokens(), maxlen=0),
+            number=number,
+            repeat=3 if len(source_code) < 10_000_000 else 1,
+        )
+    )
+    return elapsed / number
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    sizes = [size for size in (1_000, 10_000, 100_000, 1_000_000, 10_000_000) if size <= largest]
+
+    per_byte = []
+    for size in sizes:
+        elapsed = bench(build_program(size))
+        per_byte.append(elapsed / size)
+        print(f"{size:>10,} bytes: {elapsed * 1000:9.2f} ms ({elapsed / size * 1e9:.1f} ns/byte)")
+    print(f"Custo por byte: maior/menor = {max(per_byte) / min(per_byte):.2f}")
+
+
+if __name__ == "__main__":
+    main()
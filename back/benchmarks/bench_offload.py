@@ -0,0 +1,85 @@
+"""
+Teste de carga do pool de processos dos serviços (common/worker_pool.py).
+
+Simula `clientes` requisições simultâneas ao /parse (cada thread faz o papel
+de uma thread do servidor chamando `POOL.call(parse_tokens, ...)`) e compara
+a execução nas próprias threads (`OFFLOAD_WORKERS = 0`) com pools de 1 até
+`os.cpu_count()` processos. Para cada configuração mostra a vazão, as
+latências p50 e p99 e quantas requisições seriam respondidas com 503 por
+falta de vaga na fila (`OFFLOAD_QUEUE`).
+
+O ganho só aparece com mais de um núcleo: com um núcleo os processos apenas
+somam o custo de enviar tokens e árvores pelo pipe.
+
+Execute a partir de `back/`:
+
+    python -m benchmarks.bench_offload [clientes] [requisições por cliente] [fila]
+"""
+
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_syntax_tree import STATEMENTS
+from common.worker_pool import PoolBusy, WorkerPool
+from lexical.src.regex_lexer import lex_codes
+from syntactic.src.parser import parse_tokens
+
+# Programa típico enviado pelo editor, já em tokens como chega ao /parse
+TOKENS = lex_codes(STATEMENTS * 4)
+
+
+def load(pool, clients, requests):
+    def client(_):
+        latencies = []
+        rejected = 0
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                pool.call(parse_tokens, TOKENS, True)
+            except PoolBusy:
+                rejected += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+        return latencies, rejected
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(client, range(clients)))
+    seconds = time.perf_counter() - start
+
+    latencies = sorted(latency for done, _ in results for latency in done)
+    rejected = sum(rejected for _, rejected in results)
+    return seconds, latencies, rejected
+
+
+def report(label, seconds, latencies, rejected):
+    p50 = statistics.median(latencies) if latencies else 0.0
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    print(
+        f"{label:>14}: {len(latencies) / seconds:8.1f} req/s"
+        f"  p50 {p50 * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms  503: {rejected}"
+    )
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    queue = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    cpus = os.cpu_count() or 1
+    print(f"{len(TOKENS):,} tokens, {clients} clientes x {requests} requisições, fila {queue}, {cpus} CPUs")
+
+    for workers in range(cpus + 1):
+        pool = WorkerPool(workers, queue, warm=("syntactic.src.parser",))
+        try:
+            pool.start()
+            label = f"{workers} processos" if workers else "threads"
+            report(label, *load(pool, clients, requests))
+        finally:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
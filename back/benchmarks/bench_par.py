@@ -0,0 +1,82 @@
+"""
+Benchmark dos modos de execução dos blocos PAR.
+
+Executa um programa com vários blocos PAR limitados por CPU (laços como o
+fatorial do `test_text` de interpreter/main.py) em cada modo do ParRuntime
+(threads, processos e subinterpretadores) e compara com a execução em
+sequência; entre colchetes, o executor usado quando o modo não está
+disponível. A primeira execução de cada modo aquece o pool e não entra na
+medida. Execute a partir de `back/`:
+
+    python -m benchmarks.bench_par [ramos] [iterações]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+from interpreter.src.code_cache import CompiledProgram
+from interpreter.src.par_runtime import PAR_MODES, ParRuntime
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+
+BRANCH = """
+    PAR {{
+        int soma{n} = 0;
+        for (int i{n} = 0; i{n} < {iterations}; i{n} = i{n} + 1) {{
+            soma{n} = soma{n} + i{n} * i{n};
+        }}
+        print(soma{n});
+    }}
+"""
+
+
+def program(branches, iterations):
+    body = "".join(BRANCH.format(n=n, iterations=iterations) for n in range(branches))
+    return f"if (1 > 0) {{{body}}}"
+
+
+def run(compiled, runtime):
+    namespace = compiled.namespace()
+    namespace.update(runtime.bindings(globals(), namespace))
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output), runtime.scope():
+        exec(compiled.code, globals(), namespace)
+    return time.perf_counter() - start, output.getvalue()
+
+
+def main():
+    branches = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 300_000
+    tree = Parser(RegexLexer(program(branches, iterations)).tokenize_stream()).parse()
+    compiled = CompiledProgram.from_tree(tree)
+
+    # Sem escopo aberto os ramos rodam em sequência, na própria thread
+    sequential = ParRuntime()
+    namespace = compiled.namespace(par_block=sequential.par_block)
+    namespace["par_scope"] = contextlib.nullcontext
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as expected:
+        exec(compiled.code, globals(), namespace)
+    baseline = time.perf_counter() - start
+
+    print(f"Ramos: {branches}  Iterações por ramo: {iterations:,}  CPUs: {os.cpu_count()}")
+    print(f"{'sequencial':>14}: {baseline:7.3f}s")
+    for mode in PAR_MODES:
+        runtime = ParRuntime(max_workers=branches, mode=mode)
+        try:
+            run(compiled, runtime)
+            seconds, output = run(compiled, runtime)
+        finally:
+            runtime.shutdown()
+        if sorted(output.split()) != sorted(expected.getvalue().split()):
+            raise AssertionError(f"Unexpected output in {mode} mode")
+        executor = f" [{runtime.executor}]" if runtime.executor != mode else ""
+        print(f"{mode:>14}: {seconds:7.3f}s ({baseline / seconds:.2f}x){executor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark do analisador sintático em programas com muitas expressões.
+
+Mede tokens/segundo do Parser sobre um TokenStream já pronto (o custo do
+lexer fica de fora) e a profundidade das árvores de expressão geradas.
+Execute a partir de `back/`:
+
+    python -m benchmarks.bench_parser [repetições]
+"""
+
+import sys
+import time
+
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+
+SNIPPET = """
+int total = (a + b * c - d / 2) * (e - f + g * h) + i * j - k / l + m;
+int media = (soma_x * peso_x + soma_y * peso_y + soma_z * peso_z) / (peso_x + peso_y + peso_z);
+if (a * b + c > d - e * f) {
+    print(a + b * c - d, e * f / g + h * i - j, k - l - m - n);
+} else {
+    resultado = resultado + a * a + b * b + c * c + d * d;
+}
+while (contador * passo + inicio < limite * fator - margem) {
+    contador = contador + passo * 2 - ajuste / 3;
+}
+"""
+
+
+def depth(node):
+    # Profundidade da árvore (iterativa, para não estourar a pilha)
+    best = 0
+    stack = [(node, 1)]
+    while stack:
+        node, level = stack.pop()
+        best = max(best, level)
+        stack.extend((child, level + 1) for child in node.children)
+    return best
+
+
+def bench(tokens, rounds=7):
+    best = float("inf")
+    tree = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        tree = Parser(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return tree, best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tokens = RegexLexer(SNIPPET * repeat).tokenize_stream()
+    tree, elapsed = bench(tokens)
+    print(
+        f"Parser: {len(tokens)} tokens em {elapsed:.3f}s "
+        f"({len(tokens) / elapsed:,.0f} tokens/s, profundidade máxima {depth(tree)})"
+    )
+
+
+if __name__ == "__main__":
+    main()
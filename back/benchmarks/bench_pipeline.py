@@ -0,0 +1,82 @@
+"""
+Latência de obtenção da árvore sintática no /interpret: em processo vs HTTP.
+
+Mede, por programa:
+
+- em processo: `RegexLexer.tokenize_stream()` + `Parser.parse()`, como no
+  modo "in_process" do interpreter/main.py;
+- o trabalho local do modo "http" sem a rede: tokens em JSON (ida e volta),
+  parsing da lista de tokens e a árvore no formato binário (ida e volta);
+- se os serviços de lexing (8001) e parsing (8004) estiverem no ar, as duas
+  requisições reais do modo "http".
+
+Execute a partir de `back/`:
+
+    python -m benchmarks.bench_pipeline [repetições]
+"""
+
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.bench_syntax_tree import STATEMENTS
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+from trees import wire
+
+LEXER_URL = "http://localhost:8001/lex"
+PARSER_URL = "http://localhost:8004/parse"
+
+# Programa típico enviado pelo editor
+PROGRAM = STATEMENTS * 4
+
+
+def in_process(code):
+    return Parser(RegexLexer(code).tokenize_stream()).parse()
+
+
+def serialized(code):
+    tokens = [[kind.value, value] for kind, value in RegexLexer(code).tokenize()]
+    body = json.loads(json.dumps({"tokens": tokens}))
+    tree = Parser(body["tokens"]).parse()
+    return wire.decode_tree(wire.encode_tree(tree))
+
+
+def post(url, payload, accept="application/json"):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json", "Accept": accept},
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.read()
+
+
+def over_http(code):
+    tokens = json.loads(post(LEXER_URL, {"code": code}))
+    return wire.decode_tree(post(PARSER_URL, tokens, accept=wire.MEDIA_TYPE))
+
+
+def per_call(function, repeat):
+    function(PROGRAM)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(PROGRAM)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"Programa: {len(PROGRAM):,} caracteres, {repeat} repetições")
+    print(f"{'em processo':>22}: {per_call(in_process, repeat) * 1000:8.3f} ms")
+    print(f"{'http sem rede':>22}: {per_call(serialized, repeat) * 1000:8.3f} ms")
+    try:
+        print(f"{'http (serviços)':>22}: {per_call(over_http, repeat) * 1000:8.3f} ms")
+    except (urllib.error.URLError, OSError) as e:
+        print(f"{'http (serviços)':>22}: serviços indisponíveis ({e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Relatório de memória da árvore sintática.
+
+Mede, com tracemalloc, os bytes retidos por nó pela árvore de SyntaxNode
+gerada pelo Parser e pela mesma árvore compactada em um SyntaxArena. O
+TokenStream é montado antes da medição, então só a árvore é contada.
+Execute a partir de `back/`:
+
+    python -m benchmarks.bench_syntax_tree [comandos]
+"""
+
+import sys
+
+from benchmarks.bench_token_stream import retained_bytes
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+from trees.arena import SyntaxArena
+
+STATEMENTS = """
+int a = 10;
+b = a * 2 + c - 1;
+print("Hello", a, b);
+if (a > b) { a = a - 1; }
+x = (y + 3) * z / 4;
+"""
+
+
+def count_nodes(tree):
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+        if hasattr(node.value, "children"):
+            stack.append(node.value)
+    return count
+
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    per_snippet = STATEMENTS.count(";")
+    stream = RegexLexer(STATEMENTS * (target // per_snippet + 1)).tokenize_stream()
+
+    tree, tree_bytes = retained_bytes(lambda: Parser(stream).parse())
+    count = count_nodes(tree)
+    arena, arena_bytes = retained_bytes(lambda: SyntaxArena.from_tree(tree))
+    assert len(arena) == count
+
+    print(f"Comandos: {len(tree.children):,}  Nós: {count:,}")
+    print(f"{'SyntaxNode':>12}: {tree_bytes / 2**20:8.1f} MiB ({tree_bytes / count:6.1f} bytes/nó)")
+    print(f"{'SyntaxArena':>12}: {arena_bytes / 2**20:8.1f} MiB ({arena_bytes / count:6.1f} bytes/nó)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Relatório de memória: lista de tuplas vs TokenStream.
+
+Mede, com tracemalloc, os bytes retidos por token pela lista de tuplas
+(TokenEnums, valor) e pelo TokenStream compacto. Execute a partir de `back/`:
+
+    python -m benchmarks.bench_token_stream [tokens]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.bench_lexer import SNIPPET
+from lexical.src.regex_lexer import RegexLexer
+
+
+def retained_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    per_snippet = len(RegexLexer(SNIPPET).tokenize())
+    text = SNIPPET * (target // per_snippet + 1)
+
+    tokens, list_bytes = retained_bytes(lambda: RegexLexer(text).tokenize())
+    count = len(tokens)
+    del tokens
+
+    stream, stream_bytes = retained_bytes(lambda: RegexLexer(text).tokenize_stream())
+    assert len(stream) == count
+
+    print(f"Tokens: {count:,}")
+    print(f"{'lista de tuplas':>16}: {list_bytes / 2**20:8.1f} MiB ({list_bytes / count:6.1f} bytes/token)")
+    print(f"{'TokenStream':>16}: {stream_bytes / 2**20:8.1f} MiB ({stream_bytes / count:6.1f} bytes/token)")
+    print(f"Redução: {list_bytes / stream_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
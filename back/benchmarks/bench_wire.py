@@ -0,0 +1,54 @@
+"""
+Benchmark do formato de troca da árvore sintática: JSON vs binário.
+
+Compara o tamanho e o tempo de codificação/decodificação de
+`to_json()` + `json.dumps` / `json.loads` + `SyntaxNode.from_dict` com
+`wire.encode_tree` / `wire.decode_tree`. Execute a partir de `back/`:
+
+    python -m benchmarks.bench_wire [comandos]
+"""
+
+import json
+import sys
+import time
+
+from benchmarks.bench_syntax_tree import STATEMENTS
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+from trees import wire
+from trees.syntax_tree import SyntaxNode
+
+
+def best_time(function, rounds=5):
+    best = float("inf")
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    per_snippet = STATEMENTS.count(";")
+    tree = Parser(RegexLexer(STATEMENTS * (target // per_snippet + 1)).iter_tokens()).parse()
+
+    text, json_encode = best_time(lambda: json.dumps(tree.to_json()))
+    _, json_decode = best_time(lambda: SyntaxNode.from_dict(json.loads(text)))
+    data, wire_encode = best_time(lambda: wire.encode_tree(tree))
+    _, wire_decode = best_time(lambda: wire.decode_tree(data))
+
+    print(f"Comandos: {len(tree.children):,}")
+    for name, size, encode, decode in (
+        ("JSON", len(text.encode()), json_encode, json_decode),
+        ("binário", len(data), wire_encode, wire_decode),
+    ):
+        print(
+            f"{name:>8}: {size / 2**20:6.2f} MiB  "
+            f"codificação {encode * 1000:7.1f} ms  decodificação {decode * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import asyncio
+import random
+
+import httpx
+
+# Respostas que indicam falha passageira do serviço e podem ser repetidas
+RETRY_STATUSES = frozenset((502, 503, 504))
+
+
+class ServiceClient:
+    """
+    Cliente HTTP assíncrono para as chamadas entre os microsserviços.
+
+    Todas as chamadas compartilham um `httpx.AsyncClient`, cujo pool mantém
+    as conexões abertas (keep-alive) entre requisições; um único worker pode
+    ter muitas chamadas em andamento sem bloquear threads. Cada chamada tem
+    um timeout (o padrão do cliente ou `timeout=`) e, em erros de transporte
+    ou respostas de RETRY_STATUSES, é repetida até `retries` vezes, esperando
+    um tempo aleatório entre 0 e `backoff * 2**tentativa` segundos.
+
+    As chamadas feitas são idempotentes (lexing e parsing), então repeti-las
+    é seguro. O cliente é criado no primeiro uso e deve ser fechado com
+    `aclose()` ao encerrar o serviço; `transport` permite trocar a rede por
+    um `httpx.MockTransport` nos testes.
+    """
+
+    def __init__(
+        self,
+        timeout=5.0,
+        retries=2,
+        backoff=0.05,
+        max_connections=100,
+        max_keepalive=20,
+        transport=None,
+    ):
+        if retries < 0:
+            raise ValueError("retries must be zero or positive")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive
+        )
+        self.transport = transport
+        # Quantidade de tentativas repetidas desde a criação
+        self.retried = 0
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, transport=self.transport
+            )
+        return self._client
+
+    # Espera antes da tentativa seguinte a `attempt` (contada a partir de 0)
+    def backoff_delay(self, attempt):
+        return random.uniform(0, self.backoff * 2**attempt)
+
+    async def post(self, url, *, json=None, content=None, headers=None, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = await self.client.post(
+                    url, json=json, content=content, headers=headers, timeout=timeout
+                )
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or response.status_code not in RETRY_STATUSES:
+                    return response
+            self.retried += 1
+            await asyncio.sleep(self.backoff_delay(attempt))
+
+    async def aclose(self):
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
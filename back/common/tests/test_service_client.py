@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+try:
+    import httpx
+except ImportError:  # httpx faz parte de requirements.txt
+    httpx = None
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestServiceClient(unittest.TestCase):
+
+    def client(self, handler, **options):
+        from common.service_client import ServiceClient
+
+        return ServiceClient(backoff=0, transport=httpx.MockTransport(handler), **options)
+
+    def post(self, client, *args, **kwargs):
+        async def call():
+            try:
+                return await client.post(*args, **kwargs)
+            finally:
+                await client.aclose()
+
+        return asyncio.run(call())
+
+    def test_retries_transient_failures(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            if len(calls) == 2:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"tokens": []})
+
+        client = self.client(handler, retries=2)
+        response = self.post(client, "http://lexer/lex", json={"code": ""})
+        self.assertEqual(response.json(), {"tokens": []})
+        self.assertEqual((len(calls), client.retried), (3, 2))
+
+    def test_gives_up_after_the_last_retry(self):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        with self.assertRaises(httpx.ConnectError):
+            self.post(self.client(handler, retries=1), "http://lexer/lex")
+        client = self.client(lambda request: httpx.Response(504), retries=1)
+        self.assertEqual(self.post(client, "http://parser/parse").status_code, 504)
+
+    def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400)
+
+        self.assertEqual(self.post(self.client(handler), "http://parser/parse").status_code, 400)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import importlib
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from common.worker_pool import PoolBusy, WorkerPool, env_choice, env_int
+from lexical.src.regex_lexer import RegexLexer, lex_codes
+from syntactic.src.parser import parse_tokens
+from trees import wire
+
+CODE = 'int x = 2 * (3 + 4);\nprint("x", x);'
+
+
+class TestInlinePool(unittest.TestCase):
+
+    def test_calls_in_current_thread(self):
+        pool = WorkerPool()
+        self.assertFalse(pool.enabled)
+        pool.start()
+        self.assertEqual(pool.call(threading.get_ident), threading.get_ident())
+        self.assertIsNone(pool._pool)
+
+    def test_rejects_negative_sizes(self):
+        with self.assertRaises(ValueError):
+            WorkerPool(max_workers=-1)
+
+
+class TestEnvironment(unittest.TestCase):
+
+    def test_env_int(self):
+        with mock.patch.dict(os.environ, {"MINIPAR_TEST_SIZE": " 4 ", "MINIPAR_TEST_EMPTY": ""}):
+            self.assertEqual(env_int("MINIPAR_TEST_SIZE", 0), 4)
+            self.assertEqual(env_int("MINIPAR_TEST_EMPTY", 7), 7)
+            self.assertEqual(env_int("MINIPAR_TEST_MISSING", 7), 7)
+        with mock.patch.dict(os.environ, {"MINIPAR_TEST_SIZE": "many"}):
+            with self.assertRaisesRegex(ValueError, "MINIPAR_TEST_SIZE"):
+                env_int("MINIPAR_TEST_SIZE", 0)
+
+    def test_env_choice(self):
+        choices = ("a", "b")
+        with mock.patch.dict(os.environ, {"MINIPAR_TEST_MODE": " b ", "MINIPAR_TEST_EMPTY": ""}):
+            self.assertEqual(env_choice("MINIPAR_TEST_MODE", "a", choices), "b")
+            self.assertEqual(env_choice("MINIPAR_TEST_EMPTY", "a", choices), "a")
+            self.assertEqual(env_choice("MINIPAR_TEST_MISSING", "a", choices), "a")
+        with mock.patch.dict(os.environ, {"MINIPAR_TEST_MODE": "c"}):
+            with self.assertRaisesRegex(ValueError, "MINIPAR_TEST_MODE"):
+                env_choice("MINIPAR_TEST_MODE", "a", choices)
+
+    def test_service_pool_from_environment(self):
+        import lexical.main
+
+        self.addCleanup(importlib.reload, lexical.main)
+        with mock.patch.dict(os.environ, {"LEXER_OFFLOAD_WORKERS": "2", "LEXER_OFFLOAD_QUEUE": "8"}):
+            service = importlib.reload(lexical.main)
+        self.assertEqual((service.POOL.max_workers, service.POOL.max_queue), (2, 8))
+        self.assertIsNone(service.POOL._pool)
+
+    def test_pipeline_mode_from_environment(self):
+        import interpreter.main
+
+        self.addCleanup(importlib.reload, interpreter.main)
+        with mock.patch.dict(os.environ, {"INTERPRETER_PIPELINE_MODE": "http"}):
+            self.assertEqual(importlib.reload(interpreter.main).PIPELINE_MODE, "http")
+        with mock.patch.dict(os.environ, {"INTERPRETER_PIPELINE_MODE": "grpc"}):
+            with self.assertRaisesRegex(ValueError, "INTERPRETER_PIPELINE_MODE"):
+                importlib.reload(interpreter.main)
+
+
+class TestProcessPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = WorkerPool(max_workers=1, max_queue=0, warm=("lexical.src.regex_lexer", "syntactic.src.parser"))
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_results_match_inline(self):
+        tokens = self.pool.call(lex_codes, CODE)
+        self.assertEqual(tokens, lex_codes(CODE))
+        self.assertEqual(tokens, [[kind.value, value] for kind, value in RegexLexer(CODE).tokenize()])
+        self.assertEqual(self.pool.call(parse_tokens, tokens), parse_tokens(tokens))
+        tree = wire.decode_tree(self.pool.call(parse_tokens, tokens, True))
+        self.assertEqual(tree.to_json(), parse_tokens(tokens))
+
+    def test_errors_propagate(self):
+        with self.assertRaises(SyntaxError):
+            self.pool.call(parse_tokens, lex_codes("int x = ;"))
+
+    def test_full_queue_raises_pool_busy(self):
+        worker = threading.Thread(target=self.pool.call, args=(time.sleep, 0.5))
+        worker.start()
+        time.sleep(0.1)
+        try:
+            with self.assertRaises(PoolBusy):
+                self.pool.call(lex_codes, CODE)
+        finally:
+            worker.join()
+        # A vaga é liberada quando a chamada termina
+        self.assertEqual(self.pool.call(lex_codes, CODE), lex_codes(CODE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Códigos inteiros dos tokens (valores de TokenEnums).
+
+Usados pelo TokenStream e pelo Parser para comparações entre inteiros no
+lugar de membros de Enum.
+"""
+from common.tokens import TokenEnums
+
+
+RW_INT = TokenEnums.RW_INT.value
+RW_BOOL = TokenEnums.RW_BOOL.value
+RW_STRING = TokenEnums.RW_STRING.value
+RW_C_CHANNEL = TokenEnums.RW_C_CHANNEL.value
+RW_TRUE = TokenEnums.RW_TRUE.value
+RW_FALSE = TokenEnums.RW_FALSE.value
+RW_NULL = TokenEnums.RW_NULL.value
+RW_SEQ = TokenEnums.RW_SEQ.value
+RW_PAR = TokenEnums.RW_PAR.value
+RW_IF = TokenEnums.RW_IF.value
+RW_ELSE = TokenEnums.RW_ELSE.value
+RW_WHILE = TokenEnums.RW_WHILE.value
+RW_CHAN = TokenEnums.RW_CHAN.value
+RW_FOR = TokenEnums.RW_FOR.value
+RW_RETURN = TokenEnums.RW_RETURN.value
+OP_ASSIGN = TokenEnums.OP_ASSIGN.value
+OP_PLUS = TokenEnums.OP_PLUS.value
+OP_MINUS = TokenEnums.OP_MINUS.value
+OP_MULTIPLY = TokenEnums.OP_MULTIPLY.value
+OP_DIVIDE = TokenEnums.OP_DIVIDE.value
+DL_LPAREN = TokenEnums.DL_LPAREN.value
+DL_RPAREN = TokenEnums.DL_RPAREN.value
+DL_SEMICOLON = TokenEnums.DL_SEMICOLON.value
+DL_LBRACE = TokenEnums.DL_LBRACE.value
+DL_RBRACE = TokenEnums.DL_RBRACE.value
+DL_COMMA = TokenEnums.DL_COMMA.value
+DL_DOT = TokenEnums.DL_DOT.value
+DL_LBRACKET = TokenEnums.DL_LBRACKET.value
+DL_RBRACKET = TokenEnums.DL_RBRACKET.value
+ID = TokenEnums.ID.value
+NUM = TokenEnums.NUM.value
+STRING_LITERAL = TokenEnums.STRING_LITERAL.value
+EOF = TokenEnums.EOF.value
+RW_PRINT = TokenEnums.RW_PRINT.value
+RW_INPUT = TokenEnums.RW_INPUT.value
+OP_AND = TokenEnums.OP_AND.value
+OP_OR = TokenEnums.OP_OR.value
+OP_NOT = TokenEnums.OP_NOT.value
+OP_EQ = TokenEnums.OP_EQ.value
+OP_NE = TokenEnums.OP_NE.value
+OP_LT = TokenEnums.OP_LT.value
+OP_LE = TokenEnums.OP_LE.value
+OP_GT = TokenEnums.OP_GT.value
+OP_GE = TokenEnums.OP_GE.value
+OP_INC = TokenEnums.OP_INC.value
+OP_DEC = TokenEnums.OP_DEC.value
+OP_PLUS_ASSIGN = TokenEnums.OP_PLUS_ASSIGN.value
+OP_MINUS_ASSIGN = TokenEnums.OP_MINUS_ASSIGN.value
+BLOCK = TokenEnums.BLOCK.value
+DECLARATION = TokenEnums.DECLARATION.value
+CALL = TokenEnums.CALL.value
+PROGRAM = TokenEnums.PROGRAM.value
+
+# Membro de TokenEnums correspondente a cada código, e código de cada nome
+ENUMS = {member.value: member for member in TokenEnums}
+CODES = {member.name: member.value for member in TokenEnums}
+
+
+# Código inteiro de um tipo de token dado como membro de TokenEnums, código
+# inteiro ou nome
+def token_code(token_type):
+    if isinstance(token_type, int):
+        return token_type
+    if isinstance(token_type, str):
+        return CODES[token_type]
+    return token_type.value
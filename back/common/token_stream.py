@@ -0,0 +1,102 @@
+import re
+import sys
+from array import array
+from bisect import bisect_right
+
+from common.token_kinds import ENUMS, token_code
+
+NEWLINE_REGEX = re.compile("\n")
+
+
+class TokenStream:
+    """
+    Sequência compacta de tokens.
+
+    Em vez de uma lista de tuplas `(TokenEnums, valor)`, guarda o código
+    inteiro de cada token em `array('H')`, as posições de início e fim no
+    código-fonte em `array('I')` e o índice do valor em uma tabela lateral
+    de valores distintos (cada lexema repetido é armazenado uma única vez).
+    """
+
+    def __init__(self):
+        self.kinds = array("H")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.value_ids = array("I")
+        self.values = []
+        self._value_index = {}
+        # Posição de início de cada linha do código-fonte (None se desconhecido)
+        self.line_starts = None
+
+    # Adiciona um token; `kind` é o código inteiro (TokenEnums.value). Os
+    # valores são indexados por (tipo, valor), como na arena e no formato
+    # binário, para que 1, 1.0 e True não dividam a mesma entrada
+    def append(self, kind, value, start=0, end=0):
+        key = (type(value), value)
+        value_id = self._value_index.get(key)
+        if value_id is None:
+            value_id = self._value_index[key] = len(self.values)
+            self.values.append(value)
+
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.value_ids.append(value_id)
+
+    # Constrói a sequência consumindo um lexer com iter_tokens(), start e pos
+    @classmethod
+    def from_lexer(cls, lexer):
+        stream = cls()
+        append = stream.append
+        for token_type, value in lexer.iter_tokens():
+            append(token_type.value, value, lexer.start, lexer.pos)
+        if isinstance(getattr(lexer, "source", None), str):
+            stream.line_starts = array(
+                "I", [0, *(match.end() for match in NEWLINE_REGEX.finditer(lexer.source))]
+            )
+        return stream
+
+    # Constrói a sequência a partir de tuplas/listas (tipo, valor). O tipo pode
+    # ser um membro de TokenEnums, seu valor inteiro ou seu nome.
+    @classmethod
+    def from_tokens(cls, tokens):
+        stream = cls()
+        append = stream.append
+        for token_type, value in tokens:
+            append(token_code(token_type), value)
+        return stream
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # Código inteiro do i-ésimo token
+    def kind(self, index):
+        return self.kinds[index]
+
+    # Valor (lexema, número ou conteúdo da string) do i-ésimo token
+    def value(self, index):
+        return self.values[self.value_ids[index]]
+
+    # Linha (a partir de 1) do i-ésimo token, ou None sem o código-fonte
+    def line(self, index):
+        if self.line_starts is None:
+            return None
+        return bisect_right(self.line_starts, self.starts[index])
+
+    # Visão compatível com a lista de tuplas (TokenEnums, valor)
+    def __getitem__(self, index):
+        return ENUMS[self.kinds[index]], self.values[self.value_ids[index]]
+
+    def __iter__(self):
+        values = self.values
+        for kind, value_id in zip(self.kinds, self.value_ids):
+            yield ENUMS[kind], values[value_id]
+
+    # Bytes ocupados pelos arrays e pela tabela de valores
+    def nbytes(self):
+        arrays = (self.kinds, self.starts, self.ends, self.value_ids)
+        if self.line_starts is not None:
+            arrays += (self.line_starts,)
+        size = sum(item.buffer_info()[1] * item.itemsize for item in arrays)
+        return size + sum(sys.getsizeof(value) for value in self.values)
+
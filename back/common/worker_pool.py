@@ -0,0 +1,108 @@
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+class PoolBusy(Exception):
+    """
+    Todos os processos estão ocupados e a fila de espera está cheia.
+    """
+
+
+# Inteiro da variável de ambiente `name`, ou `default` se ela não estiver
+# definida (usado para configurar o pool de cada serviço)
+def env_int(name, default):
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+
+# Valor da variável de ambiente `name`, que deve ser um de `choices`, ou
+# `default` se ela não estiver definida
+def env_choice(name, default, choices):
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {list(choices)}, got {value!r}")
+    return value
+
+
+def _warm_worker(modules):
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _ready():
+    return True
+
+
+class WorkerPool:
+    """
+    Pool opcional de processos para o trabalho limitado por CPU dos serviços.
+
+    Com `max_workers=0` (padrão), `call(function, *args)` apenas chama a
+    função na thread atual. Com `max_workers > 0`, a chamada é enviada a um
+    processo do pool (argumentos e resultado trafegam por pipe, então devem
+    ser compactos: listas de tokens, bytes do formato binário da árvore) e a
+    thread só espera o resultado, sem disputar o GIL com os demais handlers.
+    Até `max_queue` chamadas aguardam além das que estão em execução; acima
+    disso `call` levanta PoolBusy. `start()` inicia os processos já
+    importando os módulos de `warm`.
+    """
+
+    def __init__(self, max_workers=0, max_queue=64, warm=()):
+        if max_workers < 0 or max_queue < 0:
+            raise ValueError("max_workers and max_queue must be zero or positive")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.warm = tuple(warm)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue) if max_workers else None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_workers > 0
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker,
+                        initargs=(self.warm,),
+                    )
+        return self._pool
+
+    # Inicia todos os processos e espera que estejam prontos
+    def start(self):
+        if self.enabled:
+            futures = [self.pool.submit(_ready) for _ in range(self.max_workers)]
+            for future in futures:
+                future.result()
+
+    def call(self, function, *args):
+        if not self.enabled:
+            return function(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PoolBusy(f"Worker pool is full ({self.max_workers} running, {self.max_queue} queued)")
+        try:
+            return self.pool.submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -1,11 +1,41 @@
-import requests
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+from common.service_client import ServiceClient
+from common.worker_pool import env_choice
 from fastapi import FastAPI
-from interpreter.src.interpreter import Interpreter
+from interpreter.src.interpreter import CODE_CACHE, PAR_RUNTIMES, SANDBOX, Interpreter
+from lexical.src.regex_lexer import RegexLexer
 from pydantic import BaseModel
+from syntactic.src.parser import Parser
+from trees import wire
 from trees.syntax_tree import SyntaxNode
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+# Cliente compartilhado das chamadas aos microsserviços (modo "http")
+SERVICE_CLIENT = ServiceClient(timeout=5.0, retries=2)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Os workers da sandbox ficam prontos antes da primeira requisição
+    await asyncio.to_thread(SANDBOX.start)
+    yield
+    await SERVICE_CLIENT.aclose()
+    SANDBOX.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Como /interpret obtém a árvore sintática: "in_process" chama o lexer e o
+# parser diretamente; "http" passa pelos microsserviços de lexing e parsing.
+# Definido pela variável de ambiente INTERPRETER_PIPELINE_MODE
+PIPELINE_MODES = ("in_process", "http")
+PIPELINE_MODE = env_choice("INTERPRETER_PIPELINE_MODE", "in_process", PIPELINE_MODES)
+
+LEXER_URL = "http://localhost:8001/lex"
+PARSER_URL = "http://localhost:8004/parse"
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,13 +48,22 @@ app.add_middleware(
 class InterpreterInput(BaseModel):
     code: str
     export: bool = False
+    # Execução dos blocos PAR: "thread" (padrão), "process" ou "subinterpreter"
+    par_mode: str = "thread"
 
 
 @app.post("/interpret")
-def interpret_code(input_data: InterpreterInput):
-    # Solicita a árvore sintática ao microsserviço de árvore sintática
+async def interpret_code(input_data: InterpreterInput):
+    # Obtém a árvore sintática (diretamente ou pelos microsserviços)
     print(input_data.code)
 
+    par_runtime = PAR_RUNTIMES.get(input_data.par_mode)
+    if par_runtime is None:
+        return {
+            "status": "error",
+            "message": f"Invalid PAR mode, expected one of {list(PAR_RUNTIMES)}",
+        }
+
     try:
 
         test_text = """
@@ -41,62 +80,90 @@ def interpret_code(input_data: InterpreterInput):
 
         """
 
-     
-        reponse_lexical = requests.post(
-            "http://localhost:8001/lex",
-            json={"code": input_data.code},
-        )
+        root = await build_tree(input_data.code)
 
-        if reponse_lexical.status_code != 200:
-            return {
-                "status": "error",
-                "message": "Failed to obtain syntax tree from the service",
-            }
+    except PipelineError as e:
+        return {"status": "error", "message": str(e)}
+    except httpx.HTTPError as e:
+        return {
+            "status": "error",
+            "message": f"Failed to contact syntax tree service: {str(e)}",
+        }
+    except (SyntaxError, ValueError) as e:
+        return {"status": "error", "message": f"Error while parsing: {str(e)}"}
 
-        tokens = reponse_lexical.json()  # Obtemos o JSON com os dados da árvore
+    # Cria o interpretador com a árvore sintática obtida; o programa roda em
+    # um worker da sandbox, com limites de CPU, memória e tempo
+    interpreter = Interpreter(
+        export=input_data.export, tree=root, par_runtime=par_runtime, sandbox=SANDBOX
+    )
 
-        parser_response = requests.post(
-            "http://localhost:8004/parse",
-            json=tokens,
-        )
+    # A interpretação usa CPU (ou espera a sandbox) fora do event loop, que
+    # segue atendendo outras requisições
+    try:
+        result = await asyncio.to_thread(interpreter.run)
+        return {"status": "success", "output": result}
+    except Exception as e:
+        return {"status": "error", "message": f"Error while interpreting: {str(e)}"}
 
-        # response = requests.get(
-        #     "http://localhost:8002/get_syntax_tree"
-        # )  # URL do microsserviço de árvore sintática   
 
-        # if response.status_code != 200:
-        #     return {
-        #         "status": "error",
-        #         "message": "Failed to obtain syntax tree from the service",
-        #     }
+class PipelineError(Exception):
+    """
+    Falha de um dos microsserviços do pipeline (modo "http").
+    """
 
-        syntax_tree_data = (
-            parser_response.json()
-        )  # Obtemos o JSON com os dados da árvore
 
-        if not syntax_tree_data:
-            return {
-                "status": "error",
-                "message": "Received empty syntax tree from the service",
-            }
+# Árvore sintática do código, obtida conforme PIPELINE_MODE
+async def build_tree(code):
+    if PIPELINE_MODE == "http":
+        return await remote_tree(code)
+    # Mesmo lexer e parser dos serviços, chamados como bibliotecas. O
+    # TokenStream ainda dá aos comandos a linha do código-fonte
+    return await asyncio.to_thread(lambda: Parser(RegexLexer(code).tokenize_stream()).parse())
 
-        # Convertendo o JSON para a árvore sintática (agora via serviço)
-        root = SyntaxNode.from_dict(syntax_tree_data["syntax_tree"])
-    
-        # Cria o interpretador com a árvore sintática obtida externamente
-        interpreter = Interpreter(export=input_data.export, tree=root)
-
-        # result = interpreter.run()
-        # return {"status": "success", "output": result}
-
-        try:
-            result = interpreter.run()  
-            return {"status": "success", "output": result}
-        except Exception as e:
-            return {"status": "error", "message": f"Error while interpreting: {str(e)}"}
-    
-    except requests.exceptions.RequestException as e:
-        return {
-            "status": "error",
-            "message": f"Failed to contact syntax tree service: {str(e)}",
-        }
+
+# Árvore sintática obtida pelos microsserviços de lexing (8001) e parsing (8004)
+async def remote_tree(code):
+    reponse_lexical = await SERVICE_CLIENT.post(LEXER_URL, json={"code": code})
+
+    if reponse_lexical.status_code != 200:
+        raise PipelineError("Failed to obtain syntax tree from the service")
+
+    tokens = reponse_lexical.json()  # Obtemos o JSON com os dados da árvore
+
+    # Pede a árvore no formato binário; o JSON fica como alternativa
+    parser_response = await SERVICE_CLIENT.post(
+        PARSER_URL,
+        json=tokens,
+        headers={"Accept": f"{wire.MEDIA_TYPE}, application/json;q=0.5"},
+    )
+
+    if parser_response.headers.get("content-type", "").startswith(wire.MEDIA_TYPE):
+        return wire.decode_tree(parser_response.content)
+
+    syntax_tree_data = parser_response.json()  # Obtemos o JSON com os dados da árvore
+
+    if not syntax_tree_data:
+        raise PipelineError("Received empty syntax tree from the service")
+
+    # Convertendo o JSON para a árvore sintática (agora via serviço)
+    return SyntaxNode.from_dict(syntax_tree_data["syntax_tree"])
+
+
+@app.get("/interpret/cache")
+def code_cache_stats():
+    # Tamanho, política de descarte, acertos e falhas do cache de código compilado
+    return CODE_CACHE.stats()
+
+
+@app.get("/interpret/par")
+def par_runtime_stats():
+    # Tamanho dos pools dos blocos PAR e tempos de execução dos ramos, por modo
+    return {mode: runtime.stats() for mode, runtime in PAR_RUNTIMES.items()}
+
+
+@app.get("/interpret/sandbox")
+def sandbox_stats():
+    # Workers, limites atingidos, reciclagens e os tempos de espera na fila e
+    # de execução dos programas
+    return SANDBOX.stats()
@@ -0,0 +1,120 @@
+import ast
+import threading
+from array import array
+from collections import OrderedDict
+
+from trees.pyast import PAR_CODE_NAME, lower_program
+from trees.traversal import preorder
+
+# Políticas de descarte aceitas pelo CodeCache
+EVICTION_POLICIES = ("lru", "fifo")
+
+# Nome de arquivo dos code objects; os números de linha são os do código Minipar
+FILENAME = "<minipar>"
+
+
+class CompiledProgram:
+    """
+    Programa Minipar já compilado para Python.
+
+    A árvore é traduzida direto para `ast` (ver `trees.pyast`) e compilada
+    sem passar por texto. `code` é o code object do programa e `par_code` a
+    tupla dos code objects dos corpos dos blocos PAR, na ordem dos índices
+    usados pelo programa (`__minipar_par__[i]`). A `ast` não é guardada; o
+    texto Python equivalente vem de `python_source(tree)`.
+    """
+
+    __slots__ = ("code", "par_code")
+
+    def __init__(self, code, par_code):
+        self.code = code
+        self.par_code = par_code
+
+    # Traduz e compila o programa representado pela árvore `tree`
+    @classmethod
+    def from_tree(cls, tree):
+        module, par_bodies = lower_program(tree)
+        par_code = tuple(compile(body, FILENAME, "exec") for body in par_bodies)
+        return cls(compile(module, FILENAME, "exec"), par_code)
+
+    # Locals com que o programa deve ser executado
+    def namespace(self, **names):
+        names[PAR_CODE_NAME] = self.par_code
+        return names
+
+
+# Texto Python equivalente ao programa da árvore, para depuração e para o
+# alvo "compile" do orquestrador (a execução não passa por texto)
+def python_source(tree):
+    return ast.unparse(lower_program(tree)[0])
+
+
+# Linhas Minipar dos nós da árvore, em pré-ordem (0 quando desconhecida). O
+# hash estrutural ignora as linhas, mas elas vão para os números de linha do
+# code object, então fazem parte da chave do cache
+def line_key(tree):
+    return array("I", [node.line or 0 for node in preorder(tree)]).tobytes()
+
+
+class CodeCache:
+    """
+    Cache limitado de programas compilados, indexado pelo hash estrutural da
+    árvore sintática e pelas linhas Minipar dos seus nós.
+
+    Ao passar de `maxsize` entradas, descarta a menos usada recentemente
+    (`policy="lru"`) ou a mais antiga (`policy="fifo"`). `hits` e `misses`
+    contam os acertos e as falhas; `maxsize=0` desativa o cache.
+    """
+
+    def __init__(self, maxsize=128, policy="lru"):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction policy {policy!r}, expected one of {EVICTION_POLICIES}")
+        if maxsize < 0:
+            raise ValueError("maxsize must be zero or positive")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Retorna o programa compilado da árvore, gerando e compilando apenas na
+    # primeira vez que a mesma estrutura aparece nas mesmas linhas
+    def get(self, tree):
+        key = (tree.structural_hash(), line_key(tree))
+        with self._lock:
+            program = self._entries.get(key)
+            if program is not None:
+                self.hits += 1
+                if self.policy == "lru":
+                    self._entries.move_to_end(key)
+                return program
+            self.misses += 1
+
+        # A compilação fica fora do lock; duas requisições simultâneas do
+        # mesmo programa podem compilá-lo duas vezes, com o mesmo resultado
+        program = CompiledProgram.from_tree(tree)
+        if self.maxsize:
+            with self._lock:
+                self._entries[key] = program
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return program
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
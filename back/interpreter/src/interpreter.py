@@ -1,14 +1,54 @@
 import json  # Importa o módulo JSON para manipulação de dados JSON
 import socket  # Importa o módulo socket para comunicação em rede
-import threading  # Importa o módulo threading para concorrência
 
 from common.tokens import TokenEnums as en  # Importa TokenEnums do módulo enum_tokens
+from common.worker_pool import env_choice, env_int
+from interpreter.src.code_cache import EVICTION_POLICIES, CodeCache
+from interpreter.src.output_sink import OutputSink
+from interpreter.src.par_runtime import ParRuntime
+from interpreter.src.sandbox import Sandbox
 from semantic.src.semantic_analyzer import SemanticAnalyzer
 from syntactic.src.parser import Parser  # Importa o módulo Parser
 from trees.syntax_tree import SyntaxNode
 
-import io
-import contextlib
+import builtins
+import os
+from functools import partial
+
+# Cache padrão de programas compilados, com tamanho e política de descarte
+# lidos das variáveis de ambiente CODE_CACHE_SIZE e CODE_CACHE_POLICY
+CODE_CACHE = CodeCache(
+    maxsize=env_int("CODE_CACHE_SIZE", 128),
+    policy=env_choice("CODE_CACHE_POLICY", "lru", EVICTION_POLICIES),
+)
+
+# Pool de threads padrão dos blocos PAR, com o tamanho em PAR_THREAD_WORKERS
+PAR_RUNTIME = ParRuntime(max_workers=env_int("PAR_THREAD_WORKERS", 8))
+
+# Execuções de PAR disponíveis por modo; "process" e "subinterpreter" são
+# opcionais, para blocos limitados por CPU, com os tamanhos em
+# PAR_PROCESS_WORKERS e PAR_SUBINTERPRETER_WORKERS
+PAR_RUNTIMES = {
+    "thread": PAR_RUNTIME,
+    "process": ParRuntime(max_workers=env_int("PAR_PROCESS_WORKERS", os.cpu_count() or 1), mode="process"),
+    "subinterpreter": ParRuntime(
+        max_workers=env_int("PAR_SUBINTERPRETER_WORKERS", os.cpu_count() or 1),
+        mode="subinterpreter",
+    ),
+}
+
+# Processos padrão em que os serviços executam os programas, com limites de
+# CPU, memória, tempo e (opcionalmente) passos por execução, lidos das
+# variáveis de ambiente SANDBOX_*; 0 desativa um limite. Os workers são
+# criados no primeiro uso
+SANDBOX = Sandbox(
+    max_workers=env_int("SANDBOX_WORKERS", os.cpu_count() or 1),
+    max_runs=env_int("SANDBOX_MAX_RUNS", 100),
+    cpu_seconds=env_int("SANDBOX_CPU_SECONDS", 5),
+    memory_bytes=env_int("SANDBOX_MEMORY_MB", 1024) * 2**20,
+    timeout=env_int("SANDBOX_TIMEOUT", 10),
+    max_steps=env_int("SANDBOX_MAX_STEPS", 0),
+)
 
 
 def _calculate(num1, operator, num2):
@@ -32,10 +72,11 @@ def _calculate(num1, operator, num2):
     return result
 
 
-def c_channel(host, type):
+def c_channel(host, type, out=print):
     """
     Função para criar canais de soquete cliente ou servidor com base no tipo fornecido.
     A entrada é agora passada por parâmetros, sem a necessidade de usar input().
+    As mensagens são escritas com `out` (a saída da execução, nos programas).
     """
     this_addr = (host, 5546)
     size = 1024
@@ -46,19 +87,19 @@ def c_channel(host, type):
         server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server.bind(this_addr)
         server.listen()
-        print("[SERVER] Waiting for connections...")
+        out("[SERVER] Waiting for connections...")
         first = True
         op = False
         conn, addr = server.accept()
         try:
             while True:
                 if first:
-                    print(f"[SERVER] Connected to {addr}")
+                    out(f"[SERVER] Connected to {addr}")
                     conn.send("What procedure do you wish to execute?".encode(format))
                     first = False
 
                 a = conn.recv(size).decode(format)
-                print(f"[SERVER] Received command: {a} from {addr}")
+                out(f"[SERVER] Received command: {a} from {addr}")
                 if a == "exit":
                     break
 
@@ -68,7 +109,7 @@ def c_channel(host, type):
                     conn.send("Awaiting expression...".encode(format))
 
                 elif a.startswith("Expression:"):
-                    print(f"[SERVER] Received expression: {a} from {addr}")
+                    out(f"[SERVER] Received expression: {a} from {addr}")
                     a = a.replace("Expression: ", "").split()
                     result = _calculate(a[0], a[1], a[2])
                     message = f"Result: {result}"
@@ -83,7 +124,7 @@ def c_channel(host, type):
         client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         client.connect(this_addr)
         message = client.recv(size).decode(format)
-        print(f"Message from server: {message}")
+        out(f"Message from server: {message}")
 
         # Recebe o procedimento como parâmetro ou via rede (sem usar input())
         procedure = "calculadora"  # Exemplo de valor passado diretamente
@@ -91,7 +132,7 @@ def c_channel(host, type):
 
         while True:
             message = client.recv(size).decode(format)
-            print(f"Message from server: {message}")
+            out(f"Message from server: {message}")
 
             if message == "Awaiting expression...":
                 expression = "5 + 3"  # Exemplo de expressão passada diretamente
@@ -99,24 +140,28 @@ def c_channel(host, type):
             elif "Invalid" in message:
                 break
             elif message.startswith("Result"):
-                print(f"{message}")
+                out(f"{message}")
                 break
 
         client.close()
 
-def par_block(block):
+def seq_block():
     """
-    Função para executar um bloco de código concorrentemente usando threading.
+    Função de espaço reservado para a execução sequencial de blocos de código.
     """
-    thread = threading.Thread(target=lambda: exec(block[0]))
-    thread.start()
+    pass
 
 
-def seq_block():
+def program_globals(sink):
     """
-    Função de espaço reservado para a execução sequencial de blocos de código.
+    Globals novos para uma execução de programa, com a saída em `sink`.
     """
-    pass
+    return {
+        "__name__": __name__,
+        "__builtins__": builtins,
+        "c_channel": partial(c_channel, out=sink.print),
+        "print": sink.print,
+    }
 
 
 class Interpreter:
@@ -124,8 +169,21 @@ class Interpreter:
     Classe que representa um interpretador para uma linguagem de programação.
     """
 
-    def __init__(self, tree: SyntaxNode | None = None, export=False):
+    def __init__(
+        self,
+        tree: SyntaxNode | None = None,
+        export=False,
+        cache=None,
+        par_runtime=None,
+        sandbox=None,
+    ):
         self.semantic = SemanticAnalyzer()  # Instância do analisador semântico
+        # Cache de programas compilados, compartilhado entre as instâncias por padrão
+        self.cache = CODE_CACHE if cache is None else cache
+        # Execução dos blocos PAR, também compartilhada por padrão
+        self.par_runtime = PAR_RUNTIME if par_runtime is None else par_runtime
+        # Sandbox em que o programa é executado (None executa neste processo)
+        self.sandbox = sandbox
         self.output = []  # Saída gerada durante a interpretação
         self.export = (
             export  # Sinalizador indicando se os resultados devem ser exportados
@@ -141,18 +199,10 @@ class Interpreter:
             self.save_tree()
         self.semantic.visit(self.tree)
 
-        evalueted_tree = self.tree.evaluate()
+        # Programas já vistos reaproveitam o código gerado e compilado
+        program = self.cache.get(self.tree)
 
-        # Criar um buffer para capturar a saída
-        buffer = io.StringIO()
-
-        print("ÁRVORE: ", evalueted_tree)
-        # Redirecionar a saída padrão para o buffer
-        with contextlib.redirect_stdout(buffer):
-            exec(evalueted_tree)
-
-        # Obter a saída capturada
-        saida = buffer.getvalue()
+        saida = self.execute(program)
 
         # Atualiza o self.output com o resultado do exec()
 
@@ -160,6 +210,25 @@ class Interpreter:
             self.save_tree()
         return saida
 
+    def execute(self, program):
+        """
+        Executa um programa já compilado (CompiledProgram) e retorna sua saída.
+        """
+        if self.sandbox is not None:
+            return self.sandbox.run(program, self.par_runtime.mode)
+
+        # Cada execução tem seus próprios globals, com um `print` que escreve
+        # apenas na sua saída; assim várias execuções podem rodar ao mesmo
+        # tempo no processo. O escopo PAR externo garante que todos os ramos
+        # terminem antes de a saída ser lida
+        sink = OutputSink()
+        run_globals = program_globals(sink)
+        namespace = program.namespace()
+        namespace.update(self.par_runtime.bindings(run_globals, namespace))
+        with self.par_runtime.scope():
+            exec(program.code, run_globals, namespace)
+        return sink.getvalue()
+
     def save_tree(self):
         """
         Salva a árvore sintática abstrata em um arquivo JSON.
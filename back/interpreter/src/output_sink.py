@@ -0,0 +1,34 @@
+import builtins
+import threading
+
+
+class OutputSink:
+    """
+    Saída de uma única execução de programa.
+
+    `print` tem a mesma assinatura da função embutida e é injetado nos
+    globals do programa no lugar dela, então cada execução acumula apenas a
+    própria saída, sem trocar o `sys.stdout` do processo. Cada chamada é
+    gravada inteira sob um lock, e linhas de ramos PAR concorrentes não se
+    misturam. Chamadas com `file=` vão direto para a função embutida.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._lock = threading.Lock()
+
+    def print(self, *values, sep=" ", end="\n", file=None, flush=False):
+        if file is not None:
+            builtins.print(*values, sep=sep, end=end, file=file, flush=flush)
+            return
+        if sep is None:
+            sep = " "
+        if end is None:
+            end = "\n"
+        text = sep.join(map(str, values)) + end
+        with self._lock:
+            self._parts.append(text)
+
+    def getvalue(self):
+        with self._lock:
+            return "".join(self._parts)
@@ -0,0 +1,269 @@
+import contextlib
+import importlib
+import marshal
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from types import CodeType
+
+from interpreter.src.output_sink import OutputSink
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:  # Python < 3.14
+    InterpreterPoolExecutor = None
+
+# Modos de execução aceitos pelo ParRuntime
+PAR_MODES = ("thread", "process", "subinterpreter")
+
+# Subinterpretadores com GIL próprio estão disponíveis neste Python
+SUBINTERPRETERS = InterpreterPoolExecutor is not None
+
+# Quantidade de tempos por ramo guardados para `stats()`
+RECENT_BRANCHES = 64
+
+# Tipos de variáveis copiadas para os ramos isolados (em outro processo ou
+# subinterpretador) e de volta
+SHAREABLE_TYPES = (bool, int, float, str, bytes, type(None))
+
+
+# Primeira linha com código do ramo (co_firstlineno de um módulo é sempre 1)
+def first_line(code):
+    return next((line for _, _, line in code.co_lines() if line), code.co_firstlineno)
+
+
+class ParScope:
+    """
+    Conjunto de ramos PAR que precisam terminar antes do fim do bloco que os
+    iniciou.
+
+    Usado como `with runtime.scope():` em volta do bloco (o código gerado faz
+    isso com `par_scope()`). Na saída, ramos que ainda não começaram são
+    executados na própria thread, o que evita que ramos aninhados esperem por
+    um pool esgotado; os demais são aguardados. A primeira exceção de um
+    ramo é relançada, a menos que o bloco já esteja saindo por outra exceção.
+    """
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+        self.pending = []
+
+    def __enter__(self):
+        self.runtime._scopes().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.runtime._scopes().pop()
+        error = None
+        for future, branch, finish in self.pending:
+            try:
+                result = branch() if future.cancel() else future.result()
+                if finish is not None:
+                    finish(result)
+            except BaseException as e:
+                error = error or e
+        self.pending = []
+        if error is not None and exc_type is None:
+            raise error
+        return False
+
+
+class ParRuntime:
+    """
+    Execução dos blocos PAR em um pool compartilhado e limitado.
+
+    Cada código passado a `par_block` vira um ramo submetido ao pool. Os
+    ramos pertencem ao `scope()` aberto mais interno da thread que os criou
+    e são aguardados quando ele fecha; sem escopo aberto, o ramo roda na
+    hora, na própria thread. `stats()` informa o tamanho do pool, quantos
+    ramos rodaram e quanto tempo levaram.
+
+    Com `mode="thread"` os ramos rodam em threads, direto nos dicionários do
+    programa. Com `mode="process"` rodam em processos já iniciados e com
+    `mode="subinterpreter"` em subinterpretadores reaproveitados, cada um com
+    seu GIL. Esses ramos isolados recebem o code object (via marshal) e uma
+    cópia das variáveis de SHAREABLE_TYPES, e ao serem aguardados têm sua
+    saída impressa e as variáveis que criaram ou alteraram copiadas de
+    volta, na ordem em que foram iniciados. Sem suporte a subinterpretadores
+    (Python < 3.14), o modo "subinterpreter" usa threads; `executor` indica
+    o que de fato é usado.
+    """
+
+    def __init__(self, max_workers=8, mode="thread"):
+        if mode not in PAR_MODES:
+            raise ValueError(f"Invalid PAR mode {mode!r}, expected one of {PAR_MODES}")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.mode = mode
+        self.executor = "thread" if mode == "subinterpreter" and not SUBINTERPRETERS else mode
+        self.branches = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.recent = deque(maxlen=RECENT_BRANCHES)
+        self._pool = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # Pool criado no primeiro uso. Os processos importam `globals_module`
+    # ao iniciar, para que o primeiro ramo não pague essa importação
+    def pool(self, globals_module=None):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create_pool(globals_module)
+        return self._pool
+
+    def _create_pool(self, globals_module):
+        if self.executor == "subinterpreter":
+            return InterpreterPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_warm_worker,
+                initargs=(globals_module,),
+            )
+        if self.executor == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+                initargs=(globals_module,),
+            )
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="minipar-par")
+
+    # Pilha de escopos abertos na thread atual
+    def _scopes(self):
+        scopes = getattr(self._local, "scopes", None)
+        if scopes is None:
+            scopes = self._local.scopes = []
+        return scopes
+
+    def scope(self):
+        return ParScope(self)
+
+    # Inicia um ramo para cada code object (ou texto Python) de `blocks`,
+    # executado com os dicionários `globals` e `locals` do programa
+    def par_block(self, blocks, globals=None, locals=None):
+        scopes = self._scopes()
+        for block in blocks:
+            code = block
+            if not isinstance(block, CodeType):
+                code = compile(block.strip(), "<minipar PAR>", "exec")
+            branch = partial(self._run_branch, code, globals, locals)
+            if not scopes:
+                branch()
+            elif self.executor != "thread":
+                self._submit_isolated(scopes[-1], branch, code, globals, locals)
+            else:
+                future = self.pool().submit(branch)
+                scopes[-1].pending.append((future, branch, None))
+
+    def _run_branch(self, code, globals, locals):
+        start = time.perf_counter()
+        failed = True
+        try:
+            exec(code, globals, locals)
+            failed = False
+        finally:
+            self._record(code, time.perf_counter() - start, failed)
+
+    def _submit_isolated(self, scope, branch, code, globals, locals):
+        globals_module = globals.get("__name__") if globals is not None else None
+        variables = {
+            name: value
+            for name, value in (locals if locals is not None else globals or {}).items()
+            if isinstance(value, SHAREABLE_TYPES) and not name.startswith("__")
+        }
+        future = self.pool(globals_module).submit(
+            _run_isolated, marshal.dumps(code), globals_module, variables
+        )
+        finish = partial(self._finish_isolated, code, globals, locals)
+        scope.pending.append((future, branch, finish))
+
+    # Aplica no programa o resultado de um ramo isolado (None se o ramo
+    # acabou rodando na própria thread)
+    def _finish_isolated(self, code, globals, locals, result):
+        if result is None:
+            return
+        changes, output, seconds, error = result
+        self._record(code, seconds, error is not None)
+        # A saída vai para o `print` do programa, se ele tiver um próprio
+        (globals or {}).get("print", print)(output, end="")
+        if error is not None:
+            raise error
+        if locals is not None:
+            locals.update(changes)
+
+    def _record(self, code, seconds, failed):
+        with self._lock:
+            self.branches += 1
+            self.failures += failed
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self.recent.append({"line": first_line(code), "seconds": seconds, "failed": failed})
+
+    # Nomes que o código gerado usa para o paralelismo, ligados aos
+    # dicionários em que o programa é executado
+    def bindings(self, globals, locals):
+        return {
+            "par_block": partial(self.par_block, globals=globals, locals=locals),
+            "par_scope": self.scope,
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "executor": self.executor,
+                "max_workers": self.max_workers,
+                "branches": self.branches,
+                "failures": self.failures,
+                "total_seconds": self.total_seconds,
+                "max_seconds": self.max_seconds,
+                "recent": list(self.recent),
+            }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+def _warm_worker(globals_module):
+    if globals_module:
+        importlib.import_module(globals_module)
+
+
+# Executa um ramo em um processo ou subinterpretador do pool. Retorna as variáveis criadas ou
+# alteradas, a saída impressa, o tempo gasto e a exceção levantada (ou None).
+# PARs aninhados rodam em sequência dentro do próprio ramo
+def _run_isolated(code, globals_module, variables):
+    code = marshal.loads(code)
+    globals = {}
+    if globals_module:
+        globals = dict(vars(importlib.import_module(globals_module)))
+    output = OutputSink()
+    globals["print"] = output.print
+    env = dict(variables)
+    env.update(par_block=partial(ParRuntime().par_block, globals=globals, locals=env))
+    env.update(par_scope=contextlib.nullcontext)
+
+    error = None
+    start = time.perf_counter()
+    try:
+        exec(code, globals, env)
+    except Exception as e:
+        error = e
+    seconds = time.perf_counter() - start
+
+    changes = {}
+    for name, value in env.items():
+        if not isinstance(value, SHAREABLE_TYPES) or name.startswith("__"):
+            continue
+        if name not in variables or type(variables[name]) is not type(value) or variables[name] != value:
+            changes[name] = value
+    return changes, output.getvalue(), seconds, error
@@ -0,0 +1,405 @@
+import itertools
+import marshal
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+
+from interpreter.src.code_cache import FILENAME
+
+try:
+    import resource
+except ImportError:  # Windows: sem limites de CPU e memória
+    resource = None
+
+# Processos dos workers: criados por um forkserver que já importou o
+# interpretador (cada worker é um fork dele) ou, onde não há fork, por spawn
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Módulos importados uma vez no forkserver e herdados por todos os workers
+PRELOAD = ["interpreter.src.interpreter"]
+
+# Limites aplicados às execuções
+LIMITS = ("cpu", "memory", "wall", "steps")
+
+# Intervalo, em segundos, em que as chamadas que esperam um worker verificam
+# se a sandbox foi encerrada ou se uma vaga foi liberada
+WAIT_INTERVAL = 0.1
+
+
+class SandboxError(Exception):
+    """
+    O worker que executava o programa terminou sem responder.
+    """
+
+
+class LimitExceeded(SandboxError):
+    """
+    O programa passou de um dos limites da sandbox; `limit` é um de LIMITS.
+    """
+
+    def __init__(self, limit, message):
+        super().__init__(message)
+        self.limit = limit
+        self.message = message
+
+    def __reduce__(self):
+        return type(self), (self.limit, self.message)
+
+
+class StepBudget:
+    """
+    Contador de linhas executadas do código Minipar (code objects com nome
+    de arquivo FILENAME), via `sys.settrace`, em todas as threads do worker.
+    """
+
+    def __init__(self, max_steps):
+        self.max_steps = max_steps
+        self.reset()
+
+    def reset(self):
+        # next() em itertools.count é atômico, então ramos PAR em threads
+        # podem contar ao mesmo tempo
+        self.counter = itertools.count(1)
+
+    def install(self):
+        sys.settrace(self.trace)
+        threading.settrace(self.trace)
+
+    def trace(self, frame, event, arg):
+        if frame.f_code.co_filename != FILENAME:
+            return None
+        return self.trace_line
+
+    def trace_line(self, frame, event, arg):
+        if event == "line" and next(self.counter) > self.max_steps:
+            raise LimitExceeded("steps", f"Program exceeded {self.max_steps} steps")
+        return self.trace_line
+
+
+def _cpu_exceeded(signum, frame):
+    raise LimitExceeded("cpu", "Program exceeded its CPU time limit")
+
+
+def _cpu_used():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+# Limite de CPU (acumulado no processo) até o fim da execução atual; None
+# retira o limite
+def _limit_cpu(seconds):
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = hard if seconds is None else math.ceil(_cpu_used() + seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+# Laço do worker: recebe (programa em marshal, modo PAR, segundos de CPU) e
+# responde (saída, erro, reciclar) até receber None ou o pipe fechar. O
+# worker lidera um grupo de processos próprio, herdado pelos processos que
+# os blocos PAR criarem, para que a sandbox possa encerrar todos juntos
+def _serve(conn, memory_bytes, max_steps):
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    runtimes = {}
+    try:
+        _serve_jobs(conn, memory_bytes, max_steps, runtimes)
+    finally:
+        for runtime in runtimes.values():
+            runtime.shutdown()
+
+
+def _serve_jobs(conn, memory_bytes, max_steps, runtimes):
+    from interpreter.src.code_cache import CompiledProgram
+    from interpreter.src.interpreter import Interpreter
+    from interpreter.src.par_runtime import ParRuntime
+
+    if resource is not None:
+        if memory_bytes:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+        signal.signal(signal.SIGXCPU, _cpu_exceeded)
+    budget = None
+    if max_steps:
+        budget = StepBudget(max_steps)
+        budget.install()
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        payload, par_mode, cpu_seconds = job
+
+        code, par_code = marshal.loads(payload)
+        if par_mode not in runtimes:
+            runtimes[par_mode] = ParRuntime(mode=par_mode)
+        if budget is not None:
+            budget.reset()
+
+        output = error = None
+        try:
+            if resource is not None and cpu_seconds:
+                _limit_cpu(cpu_seconds)
+            try:
+                interpreter = Interpreter(par_runtime=runtimes[par_mode])
+                output = interpreter.execute(CompiledProgram(code, par_code))
+            finally:
+                if resource is not None and cpu_seconds:
+                    _limit_cpu(None)
+        except MemoryError:
+            error = LimitExceeded("memory", "Program exceeded its memory limit")
+        except Exception as e:
+            error = e
+
+        # Depois de um limite o worker pode ter ramos PAR ainda rodando, a
+        # memória fragmentada ou o rastreamento desligado: é substituído
+        recycle = isinstance(error, LimitExceeded)
+        try:
+            conn.send((output, error, recycle))
+        except Exception:
+            conn.send((output, SandboxError(f"{type(error).__name__}: {error}"), recycle))
+
+
+# Mata o worker e os processos do seu grupo. Antes do join o pid do worker
+# não pode ser reaproveitado, então o grupo ainda é o dele
+def _kill_group(process):
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    if process.is_alive():
+        process.kill()
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "runs")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.runs = 0
+
+
+class Sandbox:
+    """
+    Execução dos programas em processos separados do serviço, com limites.
+
+    `run(program, par_mode)` envia o CompiledProgram (via marshal) a um
+    worker livre e retorna a saída do programa, ou levanta o erro que ele
+    levantou. Os workers são forks de um processo que já importou o
+    interpretador e ficam prontos entre as execuções; são no máximo
+    `max_workers`, e chamadas além disso esperam na fila. Cada execução tem:
+
+    - `cpu_seconds` de CPU (RLIMIT_CPU; o SIGXCPU vira LimitExceeded);
+    - `memory_bytes` de espaço de endereçamento no worker (RLIMIT_AS;
+      MemoryError vira LimitExceeded);
+    - `timeout` segundos de relógio, após os quais o worker é morto junto com
+      os processos dos seus blocos PAR;
+    - opcionalmente `max_steps` linhas de código Minipar executadas, contadas
+      com `sys.settrace` (o que deixa a execução mais lenta).
+
+    Limites desativados são None (ou 0). Um worker é substituído após
+    `max_runs` execuções, após passar de um limite ou se morrer. `stats()`
+    separa o tempo de espera na fila do tempo de execução.
+    """
+
+    def __init__(
+        self,
+        max_workers=2,
+        max_runs=100,
+        cpu_seconds=5,
+        memory_bytes=1024 * 2**20,
+        timeout=10.0,
+        max_steps=None,
+        start_method=START_METHOD,
+    ):
+        if max_workers < 1 or max_runs < 1:
+            raise ValueError("max_workers and max_runs must be at least 1")
+        self.max_workers = max_workers
+        self.max_runs = max_runs
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.timeout = timeout
+        self.max_steps = max_steps
+        self.context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            self.context.set_forkserver_preload(PRELOAD)
+        self.runs = 0
+        self.failures = 0
+        self.recycled = 0
+        self.limits = dict.fromkeys(LIMITS, 0)
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._idle = queue.SimpleQueue()
+        self._workers = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _spawn(self):
+        conn, child_conn = self.context.Pipe()
+        process = self.context.Process(
+            target=_serve,
+            args=(child_conn, self.memory_bytes, self.max_steps),
+            name="minipar-sandbox",
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, conn)
+
+    # Cria o worker de uma vaga já reservada em `_workers`, devolvendo a vaga
+    # se ele não puder ser criado
+    def _spawn_reserved(self):
+        try:
+            return self._spawn()
+        except BaseException:
+            with self._lock:
+                self._workers -= 1
+            raise
+
+    # Inicia todos os workers (inclusive depois de um `shutdown()`)
+    def start(self):
+        with self._lock:
+            self._closed = False
+        while True:
+            with self._lock:
+                if self._workers >= self.max_workers:
+                    return
+                self._workers += 1
+            self._idle.put(self._spawn_reserved())
+
+    # Worker livre; cria um novo se ainda houver vaga, senão espera na fila.
+    # A espera é refeita a cada WAIT_INTERVAL porque uma vaga pode ser
+    # liberada sem que um worker volte à fila (substituto que não pôde ser
+    # criado, `shutdown()`)
+    def _acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise SandboxError("Sandbox is shut down")
+                spawn = self._workers < self.max_workers
+                if spawn:
+                    self._workers += 1
+            if spawn:
+                return self._spawn_reserved()
+            try:
+                return self._idle.get(timeout=WAIT_INTERVAL)
+            except queue.Empty:
+                pass
+
+    def _release(self, worker, retire):
+        worker.runs += 1
+        if not retire and worker.runs < self.max_runs and not self._closed:
+            self._idle.put(worker)
+            return
+        self._stop(worker)
+        with self._lock:
+            self.recycled += 1
+            replace = not self._closed
+            if not replace:
+                self._workers -= 1
+        if replace:
+            # Substituto já aquecido para a próxima chamada; se não puder ser
+            # criado agora, a vaga fica livre e `_acquire` tenta de novo
+            try:
+                self._idle.put(self._spawn_reserved())
+            except Exception:
+                pass
+
+    @staticmethod
+    def _stop(worker, wait=1.0):
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+        worker.process.join(wait)
+        if worker.process.is_alive():
+            _kill_group(worker.process)
+            worker.process.join()
+        worker.conn.close()
+
+    def run(self, program, par_mode="thread"):
+        payload = marshal.dumps((program.code, program.par_code))
+        queued = time.perf_counter()
+        worker = self._acquire()
+        start = time.perf_counter()
+        retire = True
+        error = None
+        try:
+            worker.conn.send((payload, par_mode, self.cpu_seconds))
+            if self.timeout and not worker.conn.poll(self.timeout):
+                _kill_group(worker.process)
+                error = LimitExceeded("wall", f"Program exceeded its {self.timeout}s time limit")
+            else:
+                output, error, retire = worker.conn.recv()
+        except (EOFError, OSError):
+            _kill_group(worker.process)
+            worker.process.join()
+            error = SandboxError(f"Sandbox worker exited unexpectedly (exit code {worker.process.exitcode})")
+        finally:
+            seconds = time.perf_counter() - start
+            self._record(start - queued, seconds, error)
+            self._release(worker, retire)
+        if error is not None:
+            raise error
+        return output
+
+    def _record(self, waited, seconds, error):
+        with self._lock:
+            self.runs += 1
+            self.failures += error is not None
+            if isinstance(error, LimitExceeded):
+                self.limits[error.limit] += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def stats(self):
+        with self._lock:
+            runs = self.runs or 1
+            return {
+                "start_method": self.context.get_start_method(),
+                "workers": self._workers,
+                "max_workers": self.max_workers,
+                "max_runs": self.max_runs,
+                "cpu_seconds": self.cpu_seconds,
+                "memory_bytes": self.memory_bytes,
+                "timeout": self.timeout,
+                "max_steps": self.max_steps,
+                "runs": self.runs,
+                "failures": self.failures,
+                "recycled": self.recycled,
+                "limits": dict(self.limits),
+                "queue_wait": {"mean_seconds": self.total_wait / runs, "max_seconds": self.max_wait},
+                "execution": {"mean_seconds": self.total_seconds / runs, "max_seconds": self.max_seconds},
+            }
+
+    # Encerra os workers livres; os ocupados são encerrados ao terminar
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._stop(worker)
+            with self._lock:
+                self._workers -= 1
@@ -0,0 +1,146 @@
+import contextlib
+import importlib
+import io
+import os
+import traceback
+import unittest
+from unittest import mock
+
+from interpreter.src import code_cache, interpreter
+from interpreter.src.code_cache import CodeCache, CompiledProgram, python_source
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+
+
+def parse(source):
+    return Parser(RegexLexer(source).iter_tokens()).parse()
+
+
+PROGRAMS = ["print(1);", "print(2);", "print(3);"]
+
+
+class TestCodeCache(unittest.TestCase):
+
+    def test_hit_skips_codegen_and_compile(self):
+        cache = CodeCache(maxsize=4)
+        first = cache.get(parse("int a = 1; PAR { print(a); }"))
+
+        with mock.patch.object(CompiledProgram, "from_tree") as from_tree:
+            second = cache.get(parse("int a = 1; PAR { print(a); }"))
+        from_tree.assert_not_called()
+
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(len(first.par_code), 1)
+
+    def test_lru_and_fifo_eviction(self):
+        for policy, survivor in (("lru", PROGRAMS[0]), ("fifo", PROGRAMS[1])):
+            with self.subTest(policy=policy):
+                cache = CodeCache(maxsize=2, policy=policy)
+                cache.get(parse(PROGRAMS[0]))
+                cache.get(parse(PROGRAMS[1]))
+                cache.get(parse(PROGRAMS[0]))
+                cache.get(parse(PROGRAMS[2]))
+
+                self.assertEqual(len(cache), 2)
+                misses = cache.misses
+                cache.get(parse(survivor))
+                self.assertEqual(cache.misses, misses)
+
+    def test_disabled_and_invalid_configuration(self):
+        cache = CodeCache(maxsize=0)
+        cache.get(parse(PROGRAMS[0]))
+        cache.get(parse(PROGRAMS[0]))
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 2))
+
+        with self.assertRaises(ValueError):
+            CodeCache(policy="random")
+        self.assertIn("lru", code_cache.EVICTION_POLICIES)
+
+    def test_service_cache_from_environment(self):
+        self.addCleanup(importlib.reload, interpreter)
+        with mock.patch.dict(os.environ, {"CODE_CACHE_SIZE": "16", "CODE_CACHE_POLICY": "fifo"}):
+            cache = importlib.reload(interpreter).CODE_CACHE
+        self.assertEqual((cache.maxsize, cache.policy), (16, "fifo"))
+        with mock.patch.dict(os.environ, {"CODE_CACHE_POLICY": "random"}):
+            with self.assertRaisesRegex(ValueError, "CODE_CACHE_POLICY"):
+                importlib.reload(interpreter)
+
+
+class TestCompiledProgram(unittest.TestCase):
+
+    def run_program(self, program, **names):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exec(program.code, {}, program.namespace(**names))
+        return output.getvalue()
+
+    def test_same_output_as_text_codegen(self):
+        source = """
+        int a = 2;
+        string s = "x\\ty";
+        for (int i = 0; i < 3; i = i + 1) { a = a * 2 - -1; }
+        if (a > 10 && !(a == 0) || a < 0) { print(a / 2, s); } else { }
+        while (a > 20) { a = a - 7; }
+        seq { print(a < 3, a >= 3, a != 3); }
+        """
+        tree = parse(source)
+        program = CompiledProgram.from_tree(tree)
+
+        expected = io.StringIO()
+        with contextlib.redirect_stdout(expected):
+            exec(compile(tree.evaluate(), "<minipar>", "exec"), {})
+        self.assertEqual(self.run_program(program), expected.getvalue())
+        self.assertIn("x\ty", expected.getvalue())
+        self.assertIn("while a > 20:", python_source(tree))
+
+    def test_chained_and_mixed_comparisons(self):
+        # Comparações aninhadas não são comparações encadeadas do Python:
+        # 0 == 0 == 0 é (0 == 0) == 0 e a < b == c < d é (a < b) == (c < d)
+        tree = parse("print(0 == 0 == 0, 1 < 2 == 3 < 4, 3 > 2 > 1, 1 != 2 != 1);")
+        expected = "False True False False\n"
+
+        text = io.StringIO()
+        with contextlib.redirect_stdout(text):
+            exec(compile(tree.evaluate(), "<minipar>", "exec"), {})
+        self.assertEqual(text.getvalue(), expected)
+        self.assertEqual(self.run_program(CompiledProgram.from_tree(tree)), expected)
+
+    def test_par_bodies_are_precompiled(self):
+        program = CompiledProgram.from_tree(parse("PAR { print(1); } PAR { print(2); }"))
+        blocks = []
+        scope = contextlib.nullcontext
+        self.run_program(program, par_block=blocks.extend, par_scope=scope)
+        self.assertEqual(blocks, list(program.par_code))
+        output = self.run_program(program, par_block=lambda block: exec(block[0]), par_scope=scope)
+        self.assertEqual(output, "1\n2\n")
+
+    def test_tracebacks_point_to_minipar_lines(self):
+        source = "int a = 1;\nint b = 0;\n\nif (a > 0) {\n    print(a);\n    print(a / b);\n}\n"
+        tokens = RegexLexer(source).tokenize_stream()
+        program = CompiledProgram.from_tree(Parser(tokens).parse())
+
+        try:
+            self.run_program(program)
+        except ZeroDivisionError as error:
+            frame = traceback.extract_tb(error.__traceback__)[-1]
+        else:
+            self.fail("ZeroDivisionError not raised")
+        self.assertEqual((frame.filename, frame.lineno), ("<minipar>", 6))
+
+    def test_cache_keeps_line_numbers(self):
+        # Mesma estrutura em outra disposição: o cache não reaproveita o
+        # código compilado com as linhas da primeira versão
+        cache = CodeCache()
+        for source, line in (("int a = 0;\nprint(1 / a);", 2), ("int a = 0;\n\n\nprint(1 / a);", 4)):
+            program = cache.get(Parser(RegexLexer(source).tokenize_stream()).parse())
+            try:
+                self.run_program(program)
+            except ZeroDivisionError as error:
+                frame = traceback.extract_tb(error.__traceback__)[-1]
+            self.assertEqual(frame.lineno, line)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import contextlib
+import io
+import socket
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from interpreter.src import interpreter
+from interpreter.src.code_cache import CodeCache
+from interpreter.src.interpreter import Interpreter
+from interpreter.src.output_sink import OutputSink
+from interpreter.src.par_runtime import ParRuntime
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+
+PROGRAM = """
+int id = {n};
+int i = 0;
+while (i < 20) {{
+    i = i + 1;
+    PAR {{ print("programa", id, i); }}
+    print(id, i * id);
+}}
+"""
+
+
+def expected_lines(n):
+    lines = []
+    for i in range(1, 21):
+        lines += [f"programa {n} {i}", f"{n} {i * n}"]
+    return sorted(lines)
+
+
+class TestOutputSink(unittest.TestCase):
+
+    def test_print_signature(self):
+        sink = OutputSink()
+        sink.print(1, "a", sep="-", end="!")
+        sink.print()
+        sink.print("x", sep=None, end=None)
+        other = io.StringIO()
+        sink.print("fora", file=other)
+        self.assertEqual(sink.getvalue(), "1-a!\nx\n")
+        self.assertEqual(other.getvalue(), "fora\n")
+
+
+class TestConcurrentRuns(unittest.TestCase):
+
+    def test_outputs_and_variables_stay_separate(self):
+        runtime = ParRuntime(max_workers=8)
+        self.addCleanup(runtime.shutdown)
+        cache = CodeCache()
+        trees = [Parser(RegexLexer(PROGRAM.format(n=n)).tokenize_stream()).parse() for n in range(64)]
+
+        def run(tree):
+            return Interpreter(tree=tree, cache=cache, par_runtime=runtime).run()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=64) as pool:
+                outputs = list(pool.map(run, trees))
+
+        for n, output in enumerate(outputs):
+            self.assertEqual(sorted(output.splitlines()), expected_lines(n))
+        # Variáveis dos programas não vão para os globals do módulo
+        self.assertNotIn("id", vars(interpreter))
+        self.assertNotIn("i", vars(interpreter))
+
+
+class TestChannel(unittest.TestCase):
+
+    def serve(self, listener):
+        conn, _ = listener.accept()
+        with conn:
+            conn.send(b"What procedure do you wish to execute?")
+            conn.recv(1024)
+            conn.send(b"Result: 8.0")
+
+    def test_client_messages_go_to_program_output(self):
+        listener = socket.create_server(("127.0.0.1", 5546))
+        self.addCleanup(listener.close)
+        server = threading.Thread(target=self.serve, args=(listener,))
+        server.start()
+        self.addCleanup(server.join)
+
+        code = 'string host = "127.0.0.1";\nc_channel(host, "client", "calculadora");\nprint("fim");'
+        tree = Parser(RegexLexer(code).tokenize_stream()).parse()
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            output = Interpreter(tree=tree, cache=CodeCache()).run()
+
+        self.assertEqual(
+            output,
+            "Message from server: What procedure do you wish to execute?\n"
+            "Message from server: Result: 8.0\n"
+            "Result: 8.0\n"
+            "fim\n",
+        )
+        self.assertNotIn("Message from server", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
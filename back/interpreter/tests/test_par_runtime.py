@@ -0,0 +1,137 @@
+import contextlib
+import importlib
+import io
+import os
+import threading
+import unittest
+from unittest import mock
+
+from interpreter.src.code_cache import CodeCache
+from interpreter.src.interpreter import Interpreter
+from interpreter.src import interpreter, par_runtime
+from interpreter.src.par_runtime import ParRuntime
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+
+
+def run(source, runtime):
+    tree = Parser(RegexLexer(source).tokenize_stream()).parse()
+    interpreter = Interpreter(tree=tree, cache=CodeCache(maxsize=0), par_runtime=runtime)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return interpreter.run()
+
+
+class TestParRuntime(unittest.TestCase):
+
+    def setUp(self):
+        self.runtime = ParRuntime(max_workers=2)
+        self.addCleanup(self.runtime.shutdown)
+
+    def test_branches_are_joined_and_see_program_variables(self):
+        output = run(
+            """
+            int a = 3;
+            int i = 0;
+            while (i < 5) {
+                i = i + 1;
+                PAR { print(a * i); }
+            }
+            PAR { print("fim"); }
+            """,
+            self.runtime,
+        )
+        lines = output.splitlines()
+        self.assertEqual(sorted(lines[:5], key=int), ["3", "6", "9", "12", "15"])
+        self.assertEqual(lines[5], "fim")
+
+        stats = self.runtime.stats()
+        self.assertEqual((stats["branches"], stats["failures"]), (6, 0))
+        self.assertEqual(stats["recent"][-1]["line"], 8)
+
+    def test_branch_exceptions_propagate(self):
+        namespace = {}
+        failing = compile("1 / 0", "<minipar>", "exec")
+        passing = compile("done = True", "<minipar>", "exec")
+        with self.assertRaises(ZeroDivisionError):
+            with self.runtime.scope():
+                self.runtime.par_block([failing, passing], namespace)
+        # O outro ramo termina antes de a exceção ser relançada
+        self.assertTrue(namespace["done"])
+        self.assertEqual(self.runtime.stats()["failures"], 1)
+
+    def test_nested_branches_do_not_exhaust_the_pool(self):
+        runtime = ParRuntime(max_workers=1)
+        self.addCleanup(runtime.shutdown)
+        output = run("PAR { PAR { PAR { print(1); } print(2); } print(3); }", runtime)
+        self.assertEqual(sorted(output.split()), ["1", "2", "3"])
+
+    def test_branches_run_concurrently(self):
+        barrier = threading.Barrier(2)
+        namespace = {"barrier": barrier}
+        namespace.update(self.runtime.bindings(namespace, None))
+        block = compile("barrier.wait(timeout=5)", "<minipar>", "exec")
+        with self.runtime.scope():
+            self.runtime.par_block([block, block], namespace)
+        self.assertEqual(self.runtime.stats()["branches"], 2)
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            ParRuntime(max_workers=0)
+
+    def test_pool_sizes_from_environment(self):
+        self.addCleanup(importlib.reload, interpreter)
+        environ = {"PAR_THREAD_WORKERS": "3", "PAR_PROCESS_WORKERS": "2", "PAR_SUBINTERPRETER_WORKERS": "5"}
+        with mock.patch.dict(os.environ, environ):
+            runtimes = importlib.reload(interpreter).PAR_RUNTIMES
+        sizes = {mode: runtime.max_workers for mode, runtime in runtimes.items()}
+        self.assertEqual(sizes, {"thread": 3, "process": 2, "subinterpreter": 5})
+        self.assertIs(runtimes["thread"], interpreter.PAR_RUNTIME)
+
+
+
+class TestProcessMode(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.runtime = ParRuntime(max_workers=2, mode="process")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.runtime.shutdown()
+
+    def test_output_and_variables_come_back(self):
+        output = run(
+            """
+            int a = 3;
+            if (a > 0) {
+                PAR { int f = 1; int i = 1; while (i < 6) { f = f * i; i = i + 1; } print(f); }
+                PAR { a = a * 10; }
+            }
+            print(a);
+            """,
+            self.runtime,
+        )
+        self.assertEqual(output, "120\n30\n")
+        self.assertEqual(self.runtime.stats()["mode"], "process")
+
+    def test_branch_exceptions_propagate(self):
+        failing = compile("1 / 0", "<minipar>", "exec")
+        with self.assertRaises(ZeroDivisionError):
+            with self.runtime.scope():
+                self.runtime.par_block([failing], {})
+
+    def test_subinterpreter_mode(self):
+        runtime = ParRuntime(max_workers=2, mode="subinterpreter")
+        self.addCleanup(runtime.shutdown)
+        output = run("int a = 2; if (a > 0) { PAR { a = a * 21; } } print(a);", runtime)
+        self.assertEqual(output, "42\n")
+        expected = "subinterpreter" if par_runtime.SUBINTERPRETERS else "thread"
+        self.assertEqual(runtime.stats()["executor"], expected)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            ParRuntime(mode="fiber")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import importlib
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from interpreter.src import interpreter
+from interpreter.src.code_cache import CompiledProgram
+from interpreter.src.interpreter import Interpreter
+from interpreter.src.sandbox import LimitExceeded, Sandbox, SandboxError
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+
+PROGRAM = """
+int x = 6;
+PAR { print("ramo", x * 7); }
+print("fim");
+"""
+
+LOOP = "while (1) { int y = 1; }"
+
+
+def compile_program(code):
+    return CompiledProgram.from_tree(Parser(RegexLexer(code).tokenize_stream()).parse())
+
+
+class TestSandbox(unittest.TestCase):
+
+    def sandbox(self, **options):
+        sandbox = Sandbox(max_workers=1, **options)
+        self.addCleanup(sandbox.shutdown)
+        return sandbox
+
+    def assertLimit(self, sandbox, code, limit):
+        try:
+            sandbox.run(compile_program(code))
+        except LimitExceeded as e:
+            self.assertEqual(e.limit, limit)
+        else:
+            self.fail(f"{limit} limit was not enforced")
+        self.assertEqual(sandbox.stats()["limits"][limit], 1)
+        # O worker é substituído e a sandbox segue atendendo
+        self.assertEqual(sandbox.stats()["recycled"], 1)
+        self.assertEqual(sorted(sandbox.run(compile_program(PROGRAM)).splitlines()), ["fim", "ramo 42"])
+
+    def test_output_matches_in_process(self):
+        sandbox = self.sandbox()
+        program = compile_program(PROGRAM)
+        expected = Interpreter().execute(program)
+        output = Interpreter(sandbox=sandbox).execute(program)
+        self.assertEqual(sorted(output.splitlines()), sorted(expected.splitlines()))
+
+    def test_errors_propagate_without_recycling(self):
+        sandbox = self.sandbox()
+        with self.assertRaises(ZeroDivisionError):
+            sandbox.run(compile_program("int y = 0;\nprint(1 / y);"))
+        stats = sandbox.stats()
+        self.assertEqual((stats["runs"], stats["failures"], stats["recycled"]), (1, 1, 0))
+
+    def test_workers_recycled_after_max_runs(self):
+        sandbox = self.sandbox(max_runs=2)
+        sandbox.start()
+        program = compile_program(PROGRAM)
+        for _ in range(5):
+            sandbox.run(program)
+        stats = sandbox.stats()
+        self.assertEqual((stats["runs"], stats["recycled"], stats["workers"]), (5, 2, 1))
+        self.assertIn("mean_seconds", stats["queue_wait"])
+        self.assertIn("mean_seconds", stats["execution"])
+
+    def test_cpu_limit(self):
+        self.assertLimit(self.sandbox(cpu_seconds=1, timeout=30), LOOP, "cpu")
+
+    def test_wall_clock_limit(self):
+        self.assertLimit(self.sandbox(cpu_seconds=None, timeout=0.5), LOOP, "wall")
+
+    def test_memory_limit(self):
+        code = 'string s = "minipar";\nwhile (1) { s = s + s; }'
+        self.assertLimit(self.sandbox(memory_bytes=512 * 2**20), code, "memory")
+
+    def test_step_limit(self):
+        self.assertLimit(self.sandbox(max_steps=1000), LOOP, "steps")
+
+    def test_failed_spawn_frees_its_slot(self):
+        sandbox = self.sandbox(max_runs=1)
+        program = compile_program(PROGRAM)
+        with mock.patch.object(Sandbox, "_spawn", side_effect=OSError("no processes")):
+            with self.assertRaises(OSError):
+                sandbox.run(program)
+            self.assertEqual(sandbox.stats()["workers"], 0)
+        # A reposição do worker reciclado falha sem afetar a execução
+        spawn = Sandbox._spawn
+        with mock.patch.object(Sandbox, "_spawn", autospec=True, side_effect=[spawn(sandbox), OSError("no processes")]):
+            self.assertEqual(sorted(sandbox.run(program).splitlines()), ["fim", "ramo 42"])
+        self.assertEqual((sandbox.stats()["workers"], sandbox.stats()["recycled"]), (0, 1))
+        self.assertEqual(sorted(sandbox.run(program).splitlines()), ["fim", "ramo 42"])
+
+    def run_waiting(self, sandbox, program):
+        result = {}
+
+        def run():
+            try:
+                result["output"] = sandbox.run(program)
+            except Exception as e:
+                result["error"] = e
+
+        waiter = threading.Thread(target=run, daemon=True)
+        waiter.start()
+        time.sleep(0.3)
+        self.assertTrue(waiter.is_alive())
+        return waiter, result
+
+    def test_waiting_call_takes_freed_slot(self):
+        sandbox = self.sandbox(max_runs=1)
+        worker = sandbox._acquire()
+        waiter, result = self.run_waiting(sandbox, compile_program(PROGRAM))
+        # O substituto do worker não pode ser criado e a vaga fica livre
+        spawn = Sandbox._spawn
+        calls = []
+
+        def failing_once(self):
+            calls.append(self)
+            if len(calls) == 1:
+                raise OSError("no processes")
+            return spawn(self)
+
+        with mock.patch.object(Sandbox, "_spawn", failing_once):
+            sandbox._release(worker, retire=True)
+            waiter.join(10)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(sorted(result["output"].splitlines()), ["fim", "ramo 42"])
+
+    def test_waiting_call_fails_on_shutdown(self):
+        sandbox = self.sandbox()
+        worker = sandbox._acquire()
+        waiter, result = self.run_waiting(sandbox, compile_program(PROGRAM))
+        sandbox.shutdown()
+        waiter.join(5)
+        self.assertFalse(waiter.is_alive())
+        self.assertIsInstance(result["error"], SandboxError)
+        sandbox._release(worker, retire=False)
+        self.assertEqual(sandbox.stats()["workers"], 0)
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "requires process groups")
+    def test_wall_clock_limit_kills_par_processes(self):
+        sandbox = self.sandbox(cpu_seconds=None, timeout=5)
+        sandbox.run(compile_program(PROGRAM))
+        worker = sandbox._idle.get()
+        sandbox._idle.put(worker)
+        # O worker lidera o grupo herdado pelos processos dos ramos PAR
+        self.assertEqual(os.getpgid(worker.process.pid), worker.process.pid)
+        with self.assertRaises(LimitExceeded):
+            sandbox.run(compile_program(f"PAR {{ {LOOP} }} PAR {{ print(1); }}"), "process")
+        # Nem o worker nem os processos dos ramos PAR sobrevivem (os mortos
+        # somem do grupo quando o init os recolhe)
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                os.killpg(worker.process.pid, 0)
+            except ProcessLookupError:
+                break
+            self.assertLess(time.monotonic(), deadline, "PAR processes outlived the worker")
+            time.sleep(0.1)
+
+
+class TestServiceSandbox(unittest.TestCase):
+
+    def test_limits_from_environment(self):
+        self.addCleanup(importlib.reload, interpreter)
+        environ = {
+            "SANDBOX_WORKERS": "3",
+            "SANDBOX_MAX_RUNS": "10",
+            "SANDBOX_CPU_SECONDS": "0",
+            "SANDBOX_MEMORY_MB": "256",
+            "SANDBOX_TIMEOUT": "2",
+            "SANDBOX_MAX_STEPS": "5000",
+        }
+        with mock.patch.dict(os.environ, environ):
+            stats = importlib.reload(interpreter).SANDBOX.stats()
+        self.assertEqual(
+            (stats["max_workers"], stats["max_runs"], stats["cpu_seconds"]),
+            (3, 10, 0),
+        )
+        self.assertEqual(
+            (stats["memory_bytes"], stats["timeout"], stats["max_steps"]),
+            (256 * 2**20, 2, 5000),
+        )
+        self.assertEqual(stats["workers"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
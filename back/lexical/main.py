@@ -1,29 +1,130 @@
-from common.tokens import TokenEnums
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from common.worker_pool import PoolBusy, WorkerPool, env_int
 from fastapi import FastAPI, HTTPException
-from lexical.src.lexer import LexerInterpreter
+from fastapi.responses import StreamingResponse
+from lexical.src.regex_lexer import RegexLexer, lex_codes
+from lexical.src.session import LexerSession
 from pydantic import BaseModel
 
-app = FastAPI()
+# Processos que executam o /lex (LEXER_OFFLOAD_WORKERS; 0, o padrão,
+# mantém o lexing nas threads do servidor) e quantas requisições podem esperar
+# por um deles antes de responder 503 (LEXER_OFFLOAD_QUEUE)
+OFFLOAD_WORKERS = env_int("LEXER_OFFLOAD_WORKERS", 0)
+OFFLOAD_QUEUE = env_int("LEXER_OFFLOAD_QUEUE", 64)
+POOL = WorkerPool(OFFLOAD_WORKERS, OFFLOAD_QUEUE, warm=("lexical.src.regex_lexer",))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    POOL.start()
+    yield
+    POOL.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Quantidade de tokens agrupados em cada escrita do /lex/stream
+STREAM_BATCH_SIZE = 1024
+
+# Sessões de lexing incremental abertas pelo editor (as mais antigas são
+# descartadas ao passar do limite)
+MAX_SESSIONS = 256
+sessions = OrderedDict()
+sessions_lock = threading.Lock()
 
 
 class CodeInput(BaseModel):
     code: str
 
 
+class EditInput(BaseModel):
+    start: int
+    end: int
+    text: str
+
+
 @app.post("/lex")
 def lex_code(input_data: CodeInput):
     try:
-        lexer = LexerInterpreter(input_data.code)
-        tokens = []
-        token = lexer.get_next_token()
-
         # Processa tokens até encontrar o "EOF"
-        while token[0] != TokenEnums.EOF:
-            tokens.append(token)
-            token = lexer.get_next_token()
+        tokens = POOL.call(lex_codes, input_data.code)
 
         return {"tokens": tokens}
 
+    except PoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     except Exception as e:
         # Se houver algum erro durante o processo de lexing, retorna uma mensagem de erro
         raise HTTPException(status_code=400, detail=f"Error during lexing: {str(e)}")
+
+
+@app.post("/lex/stream")
+def lex_code_stream(input_data: CodeInput):
+    # Emite um token por linha (NDJSON) à medida que são reconhecidos, sem
+    # montar a lista completa. Erros de lexing encerram o fluxo com uma linha
+    # {"error": ...}, já que o status HTTP foi enviado no início da resposta.
+    def generate():
+        batch = []
+        try:
+            for token_type, value in RegexLexer(input_data.code).iter_tokens():
+                batch.append(json.dumps([token_type.value, value]))
+                if len(batch) == STREAM_BATCH_SIZE:
+                    yield "\n".join(batch) + "\n"
+                    batch.clear()
+        except Exception as e:
+            batch.append(json.dumps({"error": f"Error during lexing: {str(e)}"}))
+
+        if batch:
+            yield "\n".join(batch) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.post("/lex/session")
+def create_session(input_data: CodeInput):
+    try:
+        session = LexerSession(input_data.code)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error during lexing: {str(e)}")
+
+    session_id = uuid.uuid4().hex
+    with sessions_lock:
+        sessions[session_id] = (session, threading.Lock())
+        while len(sessions) > MAX_SESSIONS:
+            sessions.popitem(last=False)
+
+    return {"session_id": session_id, "tokens": session.tokens}
+
+
+@app.post("/lex/session/{session_id}")
+def edit_session(session_id: str, input_data: EditInput):
+    # Aplica uma edição e retorna apenas o trecho alterado: os tokens no
+    # intervalo [first, last) da resposta anterior devem ser trocados por `tokens`
+    with sessions_lock:
+        entry = sessions.get(session_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        sessions.move_to_end(session_id)
+
+    session, lock = entry
+    with lock:
+        try:
+            first, last, tokens = session.edit(input_data.start, input_data.end, input_data.text)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error during lexing: {str(e)}")
+
+    return {"first": first, "last": last, "tokens": tokens}
+
+
+@app.delete("/lex/session/{session_id}")
+def delete_session(session_id: str):
+    with sessions_lock:
+        if sessions.pop(session_id, None) is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id}
@@ -0,0 +1,42 @@
+import sys
+from itertools import product
+
+from common.tokens import TokenEnums
+from lexical.src.dictionary import WordDict
+
+
+# Todas as grafias (maiúsculas/minúsculas) de uma palavra ASCII
+def spellings(word):
+    return ("".join(chars) for chars in product(*({c.lower(), c.upper()} for c in word)))
+
+
+def build_keyword_table(words=None, enum=None):
+    """
+    Gera a tabela de palavras reservadas a partir de `WordDict.words`.
+
+    A tabela já contém todas as grafias de cada palavra, de modo que uma única
+    consulta em dict distingue palavra reservada de identificador, sem
+    `lower()` por identificador. Cada entrada aponta para o token pronto
+    `(tipo, lexema)`. Com `enum`, os tipos são convertidos pelo nome para essa
+    enumeração (por exemplo, `common.tokens.TokenEnums`).
+    """
+    if words is None:
+        words = WordDict.words
+
+    table = {}
+    for word, kind in words.items():
+        if enum is not None:
+            kind = enum[kind.name]
+        for spelling in spellings(word):
+            spelling = sys.intern(spelling)
+            table[spelling] = (kind, spelling)
+    return table
+
+
+KEYWORDS = build_keyword_table()
+
+
+# Retorna o token de uma palavra: a palavra reservada correspondente ou um ID
+# com o lexema internado (comparável por identidade na tabela de símbolos).
+def classify_word(lexeme, keywords=KEYWORDS):
+    return keywords.get(lexeme) or (TokenEnums.ID, sys.intern(lexeme))
@@ -1,5 +1,6 @@
 from common.tokens import TokenEnums
 from lexical.src.dictionary import WordDict
+from lexical.src.keywords import classify_word
 
 
 class LexerInterpreter:
@@ -30,10 +31,7 @@ class LexerInterpreter:
             result += self.current_char
             self.advance()
 
-        if result.lower() in WordDict.words:
-            return WordDict.words[result.lower()], result
-        else:
-            return TokenEnums.ID, result
+        return classify_word(result)
 
     # Obtém o próximo token do texto.
     def get_next_token(self):
@@ -86,6 +84,12 @@ class LexerInterpreter:
                 else:
                     self.advance()
                     return TokenEnums.OP_NOT, char
+            if char in "&|" and self.text[self.pos + 1 : self.pos + 2] == char:
+                self.advance()
+                self.advance()
+                if char == "&":
+                    return TokenEnums.OP_AND, "&&"
+                return TokenEnums.OP_OR, "||"
             if char == '"':
                 string_value = ""
                 self.advance()
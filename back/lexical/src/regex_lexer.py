@@ -0,0 +1,134 @@
+import re
+import sys
+
+from common.token_stream import TokenStream
+from common.tokens import TokenEnums
+from lexical.src.dictionary import WordDict
+from lexical.src.keywords import KEYWORDS
+from lexical.src.source import CHUNK_SIZE, SourceBuffer
+
+# Espaços em branco e comentários (# até o fim da linha).
+SKIP_REGEX = re.compile(r"(?:\s+|\#[^\n]*)*+")
+
+# Expressão regular única com todas as alternativas de token, precedida pelo
+# salto de espaços/comentários. Cada grupo nomeado corresponde a uma
+# categoria; o casamento é feito com `match(text, pos)`, sem cópias do texto.
+# O salto é possessivo para que um comentário nunca seja reinterpretado como token.
+TOKEN_REGEX = re.compile(
+    r"""
+    (?:\s+|\#[^\n]*)*+
+    (?:
+        (?P<ID>[^\W\d]\w*)
+      | (?P<NUM>\d+)
+      | (?P<STRING>"[^"]*"?)
+      | (?P<PUNCT>[=<>!]=?|&&|\|\||[{}(),+\-*/;.\[\]])
+    )
+    """,
+    re.VERBOSE,
+)
+
+# Tabela de pontuação com os mesmos membros de enum emitidos pelo LexerInterpreter
+PUNCTUATION = {symbol: token for symbol, token in WordDict.symbols.items() if len(symbol) == 1}
+PUNCTUATION.update(
+    {
+        "=": TokenEnums.OP_ASSIGN,
+        "==": TokenEnums.OP_EQ,
+        "<": TokenEnums.OP_LT,
+        "<=": TokenEnums.OP_LE,
+        ">": TokenEnums.OP_GT,
+        ">=": TokenEnums.OP_GE,
+        "!": TokenEnums.OP_NOT,
+        "!=": TokenEnums.OP_NE,
+        "&&": TokenEnums.OP_AND,
+        "||": TokenEnums.OP_OR,
+        "{": TokenEnums.DL_LBRACE,
+        "}": TokenEnums.DL_RBRACE,
+        "(": TokenEnums.DL_LPAREN,
+        ")": TokenEnums.DL_RPAREN,
+        ",": TokenEnums.DL_COMMA,
+    }
+)
+
+EOF_TOKEN = (TokenEnums.EOF, None)
+
+
+class RegexLexer:
+
+    # Inicializa o lexer com uma str, um objeto de arquivo ou um mmap.
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.start = 0
+        self.pos = 0
+        self._scanner = None
+
+    # Gera os tokens sob demanda, casando um token inteiro por vez, sem
+    # concatenação por caractere. `start` e `pos` guardam o início e o fim
+    # absolutos do último token no código-fonte. `position` permite retomar a
+    # análise a partir de uma fronteira de token (apenas para fontes str).
+    def iter_tokens(self, position=0):
+        buffer = SourceBuffer(self.source, self.chunk_size)
+        match_token = TOKEN_REGEX.match
+        keywords = KEYWORDS
+        intern = sys.intern
+        punctuation = PUNCTUATION
+        text = buffer.text
+        size = len(text)
+        pos = position
+
+        while True:
+            match = match_token(text, pos)
+
+            # Um token que encosta no fim do bloco pode continuar no próximo
+            if (match is None or match.end() == size) and buffer.fill(pos):
+                text = buffer.text
+                size = len(text)
+                pos = 0
+                continue
+
+            if match is None:
+                pos = SKIP_REGEX.match(text, pos).end()
+                self.pos = buffer.offset + pos
+                if pos >= size:
+                    return
+                raise SyntaxError(
+                    f"Invalid character {text[pos]!r} at position {self.pos}"
+                )
+
+            kind = match.lastgroup
+            lexeme = match.group(kind)
+            start, pos = match.span(kind)
+            self.start = buffer.offset + start
+            self.pos = buffer.offset + pos
+
+            if kind == "ID":
+                yield keywords.get(lexeme) or (TokenEnums.ID, intern(lexeme))
+            elif kind == "PUNCT":
+                yield punctuation[lexeme], lexeme
+            elif kind == "NUM":
+                yield TokenEnums.NUM, int(lexeme)
+            elif len(lexeme) > 1 and lexeme[-1] == '"':
+                yield TokenEnums.STRING_LITERAL, lexeme[1:-1]
+            else:
+                # String sem aspas de fechamento vai até o fim do texto
+                yield TokenEnums.STRING_LITERAL, lexeme[1:]
+
+    # Obtém o próximo token do texto.
+    def get_next_token(self):
+        if self._scanner is None:
+            self._scanner = self.iter_tokens()
+        return next(self._scanner, EOF_TOKEN)
+
+    # Retorna todos os tokens até o EOF (exclusivo).
+    def tokenize(self):
+        return list(self.iter_tokens())
+
+    # Retorna todos os tokens em um TokenStream compacto, com suas posições.
+    def tokenize_stream(self):
+        return TokenStream.from_lexer(self)
+
+
+# Tokens de `code` como pares [código inteiro, valor], compactos para envio
+# entre processos (usado pelo /lex com o pool de processos)
+def lex_codes(code):
+    return [[kind.value, value] for kind, value in RegexLexer(code).iter_tokens()]
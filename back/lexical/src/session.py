@@ -0,0 +1,140 @@
+from lexical.src.regex_lexer import RegexLexer
+
+
+class LexerSession:
+    """
+    Sessão de lexing incremental para o editor.
+
+    Mantém o texto e a lista de tokens de um documento. Cada edição
+    `(start, end, new_text)` substitui `text[start:end]` e reanalisa apenas a
+    partir da última fronteira segura de token antes da edição, até que os
+    tokens novos voltem a coincidir com os antigos. O custo é proporcional ao
+    trecho alterado, e não ao tamanho do documento.
+
+    As posições dos tokens posteriores à última edição não são reescritas a
+    cada edição: a diferença de tamanho fica pendente (`_shift`) a partir do
+    índice `_shift_from` e só é aplicada quando uma edição seguinte cruza
+    esses tokens.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.stale = False
+        self._relex_all()
+
+    # Analisa o documento inteiro do zero
+    def _relex_all(self):
+        lexer = RegexLexer(self.text)
+        tokens, starts, ends = [], [], []
+        for token in lexer.iter_tokens():
+            tokens.append(token)
+            starts.append(lexer.start)
+            ends.append(lexer.pos)
+
+        self.tokens = tokens
+        self._starts = starts
+        self._ends = ends
+        self._shift_from = len(tokens)
+        self._shift = 0
+        self.stale = False
+
+    # Posição inicial real do i-ésimo token
+    def _start(self, index):
+        if index >= self._shift_from:
+            return self._starts[index] + self._shift
+        return self._starts[index]
+
+    # Posição final real do i-ésimo token
+    def _end(self, index):
+        if index >= self._shift_from:
+            return self._ends[index] + self._shift
+        return self._ends[index]
+
+    # Move o início do deslocamento pendente para o índice `index`
+    def _move_shift(self, index):
+        shift = self._shift
+        starts, ends = self._starts, self._ends
+        if shift:
+            for i in range(self._shift_from, index):
+                starts[i] += shift
+                ends[i] += shift
+            for i in range(index, self._shift_from):
+                starts[i] -= shift
+                ends[i] -= shift
+        self._shift_from = index
+
+    # Índice do primeiro token que termina em `pos` ou depois
+    def _first_ending_at(self, pos):
+        low, high = 0, len(self.tokens)
+        while low < high:
+            middle = (low + high) // 2
+            if self._end(middle) < pos:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # Lista de (início, fim) de todos os tokens
+    def positions(self):
+        return [(self._start(i), self._end(i)) for i in range(len(self.tokens))]
+
+    def edit(self, start, end, new_text):
+        """
+        Substitui `text[start:end]` por `new_text`.
+
+        Retorna `(first, last, tokens)`: os tokens antigos no intervalo
+        `[first, last)` foram substituídos por `tokens`. Em caso de erro de
+        lexing o texto é atualizado, os tokens anteriores são mantidos e a
+        próxima edição reanalisa o documento inteiro.
+        """
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f"Invalid edit range {start}:{end}")
+
+        text = self.text[:start] + new_text + self.text[end:]
+        delta = len(new_text) - (end - start)
+        self.text = text
+
+        if self.stale:
+            count = len(self.tokens)
+            self._relex_all()
+            return 0, count, list(self.tokens)
+
+        # Um token que termina antes da edição não é afetado por ela: seu fim
+        # é decidido pelo caractere seguinte, que não mudou.
+        first = self._first_ending_at(start)
+        restart = self._end(first - 1) if first > 0 else 0
+
+        tokens, starts, ends = [], [], []
+        count = len(self.tokens)
+        last = first
+        edit_end = start + len(new_text)
+        lexer = RegexLexer(text)
+
+        try:
+            for token in lexer.iter_tokens(restart):
+                token_start = lexer.start
+                if token_start >= edit_end:
+                    # Depois da edição, um token que começa onde começava um
+                    # token antigo resincroniza o fluxo: o restante é igual.
+                    old_start = token_start - delta
+                    while last < count and self._start(last) < old_start:
+                        last += 1
+                    if last < count and self._start(last) == old_start:
+                        break
+
+                tokens.append(token)
+                starts.append(token_start)
+                ends.append(lexer.pos)
+            else:
+                last = count
+        except SyntaxError:
+            self.stale = True
+            raise
+
+        self._move_shift(last)
+        self.tokens[first:last] = tokens
+        self._starts[first:last] = starts
+        self._ends[first:last] = ends
+        self._shift_from = first + len(tokens)
+        self._shift += delta
+        return first, last, tokens
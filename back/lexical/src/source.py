@@ -0,0 +1,75 @@
+import codecs
+import contextlib
+import mmap
+
+# Tamanho (em caracteres/bytes) de cada bloco lido de arquivos e mmaps.
+CHUNK_SIZE = 64 * 1024
+
+# Arquivos a partir deste tamanho são mapeados em memória por open_source.
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class SourceBuffer:
+    """
+    Janela deslizante sobre o código-fonte.
+
+    Aceita uma `str`, um objeto de arquivo (texto ou binário) ou um `mmap`.
+    Strings são usadas diretamente, sem cópia; as demais fontes são lidas em
+    blocos de `chunk_size`, e bytes são decodificados incrementalmente em UTF-8.
+    `offset` é a posição absoluta de `text[0]` no código-fonte.
+    """
+
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.offset = 0
+        self.chunk_size = chunk_size
+        self._decoder = None
+
+        if isinstance(source, str):
+            self.text = source
+            self.eof = True
+            self._read = None
+        else:
+            self.text = ""
+            self.eof = False
+            self._read = source.read
+
+    def fill(self, pos):
+        """
+        Descarta `text[:pos]` e acrescenta o próximo bloco da fonte.
+
+        Retorna False quando a fonte já foi toda lida, caso em que `text`
+        não é alterado.
+        """
+        if self.eof:
+            return False
+
+        chunk = self._read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        if isinstance(chunk, (bytes, bytearray)):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = self._decoder.decode(chunk, final=self.eof)
+
+        self.text = self.text[pos:] + chunk
+        self.offset += pos
+        return True
+
+
+@contextlib.contextmanager
+def open_source(path, mmap_threshold=MMAP_THRESHOLD):
+    """
+    Abre um arquivo .mp para leitura pelos lexers.
+
+    Arquivos grandes são entregues como `mmap` (lidos sob demanda pelo
+    SourceBuffer); arquivos pequenos são lidos inteiros como `str`.
+    """
+    with open(path, "rb") as file:
+        size = file.seek(0, 2)
+        if size == 0 or size < mmap_threshold:
+            file.seek(0)
+            yield file.read().decode("utf-8")
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
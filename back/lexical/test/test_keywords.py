@@ -0,0 +1,40 @@
+import sys
+import unittest
+
+from common.tokens import TokenEnums as en
+from lexical.src.dictionary import WordDict
+from lexical.src.keywords import KEYWORDS, build_keyword_table, classify_word, spellings
+
+
+class TestKeywords(unittest.TestCase):
+
+    def test_same_result_as_lowercase_lookup(self):
+        for word, kind in WordDict.words.items():
+            for spelling in spellings(word):
+                with self.subTest(spelling=spelling):
+                    self.assertEqual(classify_word(spelling), (kind, spelling))
+
+        for lexeme in ["x", "iff", "Seqs", "_if", "c_chan", "İf"]:
+            with self.subTest(lexeme=lexeme):
+                self.assertNotIn(lexeme.lower(), WordDict.words)
+                self.assertEqual(classify_word(lexeme), (en.ID, lexeme))
+
+    def test_no_other_character_lowercases_into_a_keyword(self):
+        letters = set("".join(WordDict.words))
+        for code in range(sys.maxunicode + 1):
+            char = chr(code)
+            if char.lower() in letters:
+                self.assertIn(char, set("".join(KEYWORDS)))
+
+    def test_identifiers_are_interned(self):
+        first = classify_word("".join(["conta", "dor"]))[1]
+        second = classify_word("".join(["cont", "ador"]))[1]
+        self.assertIs(first, second)
+
+    def test_enum_conversion(self):
+        table = build_keyword_table(enum=en)
+        self.assertIs(table["Seq"][0], en.RW_SEQ)
+
+
+if __name__ == "__main__":
+    unittest.main()
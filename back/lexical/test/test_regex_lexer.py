@@ -0,0 +1,81 @@
+import io
+import mmap
+import tempfile
+import unittest
+
+from common.tokens import TokenEnums as en
+from lexical.src.lexer import LexerInterpreter
+from lexical.src.regex_lexer import RegexLexer
+
+PROGRAM = """
+int a = 10; # Comment
+string s = "Olá, mundo";
+if (a >= 5) {
+    print("Hello", a);
+    PAR {
+        a = a + 5 * (2 - 1) / 3;
+        print(a != 7, a == 7, a <= 7, a < 7, a > 7, !a);
+    }
+} else {
+    seq {
+        x_1 = v[0].y;
+        print("!");
+    }
+}
+while (a < 100 && !(a == 50 || a == 60)) { a = a + 1; }
+for (int i = 0; i < 3; i = i + 1) { print(i); }
+c_channel(calc, "server");
+"""
+
+
+def collect(lexer):
+    tokens = []
+    token = lexer.get_next_token()
+    while token[0] != en.EOF:
+        tokens.append(token)
+        token = lexer.get_next_token()
+    return tokens
+
+
+class TestRegexLexer(unittest.TestCase):
+
+    def test_same_stream_as_lexer_interpreter(self):
+        expected = collect(LexerInterpreter(PROGRAM))
+        self.assertEqual(collect(RegexLexer(PROGRAM)), expected)
+        self.assertEqual(RegexLexer(PROGRAM).tokenize(), expected)
+
+    def test_edge_cases(self):
+        for text in ['"unterminated', '""', "a#only comment", "12abc", "   ", ""]:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    collect(RegexLexer(text)), collect(LexerInterpreter(text))
+                )
+
+    def test_invalid_character(self):
+        with self.assertRaises(SyntaxError):
+            RegexLexer("int a = 1 @ 2;").tokenize()
+
+    def test_iter_tokens_from_file_objects(self):
+        expected = RegexLexer(PROGRAM).tokenize()
+        sources = [
+            io.StringIO(PROGRAM),
+            io.BytesIO(PROGRAM.encode("utf-8")),
+        ]
+        for source in sources:
+            with self.subTest(source=type(source).__name__):
+                lexer = RegexLexer(source, chunk_size=7)
+                self.assertEqual(list(lexer.iter_tokens()), expected)
+                self.assertEqual(lexer.pos, len(PROGRAM))
+
+    def test_iter_tokens_from_mmap(self):
+        expected = RegexLexer(PROGRAM).tokenize()
+        with tempfile.TemporaryFile() as file:
+            file.write(PROGRAM.encode("utf-8"))
+            file.flush()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                tokens = list(RegexLexer(mapped, chunk_size=5).iter_tokens())
+        self.assertEqual(tokens, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
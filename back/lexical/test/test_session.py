@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from common.tokens import TokenEnums as en
+from lexical.src.regex_lexer import RegexLexer
+from lexical.src.session import LexerSession
+
+PROGRAM = """
+int a = 10; # Comment
+string s = "Olá, mundo";
+while (a < 100) { a = a + 1; }
+print(a != 7, a == 7);
+"""
+
+
+def lex(text):
+    lexer = RegexLexer(text)
+    tokens, positions = [], []
+    for token in lexer.iter_tokens():
+        tokens.append(token)
+        positions.append((lexer.start, lexer.pos))
+    return tokens, positions
+
+
+class TestLexerSession(unittest.TestCase):
+
+    def assertSameAsFullLex(self, session):
+        tokens, positions = lex(session.text)
+        self.assertEqual(session.tokens, tokens)
+        self.assertEqual(session.positions(), positions)
+
+    def test_edit_returns_changed_range(self):
+        session = LexerSession("int a = 1;")
+        first, last, tokens = session.edit(4, 5, "abc")
+        self.assertEqual((first, last), (1, 2))
+        self.assertEqual(tokens, [(en.ID, "abc")])
+        self.assertSameAsFullLex(session)
+
+    def test_merge_with_previous_token(self):
+        session = LexerSession("a = b;")
+        first, last, tokens = session.edit(3, 3, "=")
+        self.assertEqual((first, last), (1, 2))
+        self.assertEqual(tokens, [(en.OP_EQ, "==")])
+        self.assertSameAsFullLex(session)
+
+    def test_edits_that_change_the_rest_of_the_file(self):
+        session = LexerSession(PROGRAM)
+        # Abre uma string que só fecha na próxima aspa
+        session.edit(1, 1, '"')
+        self.assertSameAsFullLex(session)
+        session.edit(1, 2, "")
+        self.assertSameAsFullLex(session)
+        # Remove a quebra de linha após o comentário
+        newline = PROGRAM.index("\n", PROGRAM.index("#"))
+        session.edit(newline, newline + 1, "")
+        self.assertSameAsFullLex(session)
+
+    def test_random_edits(self):
+        pieces = ["a", "b1", "7", " ", "\n", "#", '"', "=", "<", "!", "(", ";", "if", "while"]
+        rng = random.Random(5)
+        session = LexerSession(PROGRAM)
+        client = list(session.tokens)
+        for _ in range(500):
+            start = rng.randint(0, len(session.text))
+            end = min(len(session.text), start + rng.randint(0, 4))
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+            first, last, tokens = session.edit(start, end, text)
+            client[first:last] = tokens
+            self.assertEqual(client, session.tokens)
+        self.assertSameAsFullLex(session)
+
+    def test_invalid_character_recovers_on_next_edit(self):
+        session = LexerSession("int a = 1;")
+        count = len(session.tokens)
+        with self.assertRaises(SyntaxError):
+            session.edit(9, 9, "@")
+        self.assertEqual(session.text, "int a = 1@;")
+        first, last, tokens = session.edit(9, 10, "")
+        self.assertEqual((first, last), (0, count))
+        self.assertEqual(tokens, lex("int a = 1;")[0])
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            LexerSession("a").edit(1, 3, "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
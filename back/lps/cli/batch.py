@@ -0,0 +1,175 @@
+"""
+Construção em lote de vários arquivos Minipar.
+
+Expande arquivos, diretórios e padrões glob em uma lista de arquivos .mp e
+distribui a construção de cada um entre processos de um ProcessPoolExecutor.
+Os resultados e erros de cada arquivo são reunidos em um único relatório.
+"""
+
+import contextlib
+import dataclasses
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from cli.builder import ProductBuilder
+from product_config.product_config import ProductConfig, InterfaceType
+
+
+SOURCE_SUFFIX = '.mp'
+
+
+@dataclass
+class FileResult:
+    """Resultado da construção de um arquivo."""
+    input_file: str
+    success: bool
+    elapsed: float
+    output_file: Optional[str] = None
+    error: Optional[str] = None
+    log: str = ""
+
+
+@dataclass
+class BatchReport:
+    """Relatório consolidado de uma construção em lote."""
+    results: List[FileResult]
+    elapsed: float
+    jobs: int
+
+    @property
+    def failures(self) -> List[FileResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Converte o relatório para dicionário."""
+        return {
+            "files": len(self.results),
+            "succeeded": len(self.results) - len(self.failures),
+            "failed": len(self.failures),
+            "jobs": self.jobs,
+            "elapsed": self.elapsed,
+            "files_per_second": self.files_per_second,
+            "results": [dataclasses.asdict(result) for result in self.results],
+        }
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expande arquivos, diretórios (recursivamente) e globs em arquivos .mp."""
+    files: List[str] = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(str(item) for item in path.rglob(f'*{SOURCE_SUFFIX}'))
+        elif glob.has_magic(pattern):
+            matches = sorted(item for item in glob.glob(pattern, recursive=True) if Path(item).is_file())
+        else:
+            matches = [pattern]
+
+        if not matches:
+            raise FileNotFoundError(f"Nenhum arquivo encontrado para: {pattern}")
+        files.extend(matches)
+
+    # Remove repetições mantendo a ordem
+    return list(dict.fromkeys(files))
+
+
+def output_paths(input_files: List[str], output_dir: str) -> List[str]:
+    """Caminhos de saída em `output_dir`, preservando a estrutura de diretórios."""
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(item)) for item in input_files])
+    return [
+        str(Path(output_dir) / Path(os.path.relpath(os.path.abspath(item), base)).with_suffix('.out'))
+        for item in input_files
+    ]
+
+
+def build_file(config: ProductConfig, input_file: str, output_file: Optional[str] = None) -> FileResult:
+    """Constrói um arquivo, capturando a saída do terminal e o erro, se houver."""
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            builder = ProductBuilder(config)
+            builder.build(input_file)
+            if output_file and builder.get_output():
+                Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+                builder.save_output(output_file)
+            else:
+                output_file = None
+        success, error = True, None
+    except Exception as e:
+        success, error = False, str(e)
+
+    return FileResult(
+        input_file=input_file,
+        success=success,
+        elapsed=time.perf_counter() - start,
+        output_file=output_file,
+        error=error,
+        log=log.getvalue(),
+    )
+
+
+def _build_file_task(task) -> FileResult:
+    """Ponto de entrada dos processos do pool."""
+    return build_file(*task)
+
+
+def build_many(config: ProductConfig, input_files: List[str], jobs: Optional[int] = None,
+               output_dir: Optional[str] = None) -> BatchReport:
+    """Constrói vários arquivos em paralelo e retorna o relatório consolidado."""
+    jobs = jobs or os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(input_files)))
+
+    # Nos processos do pool a interface é sempre de terminal (saída capturada)
+    config = dataclasses.replace(config, interface_type=InterfaceType.TERMINAL)
+    if output_dir:
+        output_files = output_paths(input_files, output_dir)
+    else:
+        output_files = [None] * len(input_files)
+
+    tasks = list(zip([config] * len(input_files), input_files, output_files))
+    start = time.perf_counter()
+    if jobs == 1:
+        results = [_build_file_task(task) for task in tasks]
+    else:
+        # Vários arquivos por envio reduzem o custo de comunicação entre processos
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_build_file_task, tasks, chunksize=chunksize))
+
+    return BatchReport(results=results, elapsed=time.perf_counter() - start, jobs=jobs)
+
+
+def print_report(report: BatchReport, verbose: bool = False) -> None:
+    """Imprime o relatório consolidado da construção em lote."""
+    for result in report.results:
+        if verbose and result.log:
+            print(f"--- {result.input_file} ---")
+            print(result.log.rstrip())
+        if not result.success:
+            print(f"❌ {result.input_file}: {result.error}")
+        elif verbose:
+            print(f"✅ {result.input_file} ({result.elapsed * 1000:.1f} ms)")
+
+    succeeded = len(report.results) - len(report.failures)
+    print()
+    print(f"Arquivos: {len(report.results)} | Sucesso: {succeeded} | Falhas: {len(report.failures)}")
+    print(f"Tempo total: {report.elapsed:.2f}s com {report.jobs} processo(s) "
+          f"({report.files_per_second:.1f} arquivos/s)")
+
+
+def save_report(report: BatchReport, report_file: str) -> None:
+    """Salva o relatório consolidado em JSON."""
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
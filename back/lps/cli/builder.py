@@ -15,9 +15,11 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from product_config.product_config import ProductConfig, ProductType, BackendType
 from frontend.lexer_impl import MiniparLexer
+from frontend.simple_lexer import TRACE_NONE, TRACE_SUMMARY, TRACE_TOKENS
 from frontend.parser_impl import MiniparParser
 from frontend.semantic_impl import MiniparSemanticAnalyzer
 from frontend.symbol_table_impl import MiniparSymbolTable
+from lexical.src.source import open_source
 from ir_generator import MiniparIRGenerator
 from backends import X86_64Backend, RISCVBackend, ARMv7Backend
 from interfaces.ast import ASTNode
@@ -85,17 +87,13 @@ class ProductBuilder:
         if not self.config.frontend.enable_parser:
             raise ValueError("Parser é obrigatório")
         
-        # Lê o arquivo de entrada
-        with open(input_file, 'r', encoding='utf-8') as f:
-            source_code = f.read()
-        
-        # Análise léxica
-        lexer = MiniparLexer(source_code)
-        tokens = lexer.tokenize()
-        
-        # Análise sintática
-        parser = MiniparParser(tokens)
-        self.ast = parser.parse()
+        # Abre o arquivo de entrada (arquivos grandes são mapeados com mmap)
+        with open_source(input_file) as source_code:
+            # Análise léxica e sintática em fluxo: o parser consome os tokens
+            # sob demanda, sem que a lista completa fique em memória
+            lexer = MiniparLexer(source_code, self._lexer_trace_level())
+            parser = MiniparParser(lexer.iter_tokens())
+            self.ast = parser.parse()
         
         # Análise semântica (se habilitada)
         if self.config.frontend.enable_semantic_checker:
@@ -105,6 +103,14 @@ class ProductBuilder:
         if self.config.verbose:
             print(f"Frontend construído com sucesso. AST gerada com {len(self.ast.children)} nós.")
     
+    def _lexer_trace_level(self) -> int:
+        """Nível de rastreamento do lexer conforme os modos debug/verbose."""
+        if self.config.debug:
+            return TRACE_TOKENS
+        if self.config.verbose:
+            return TRACE_SUMMARY
+        return TRACE_NONE
+    
     def _build_ir(self) -> None:
         """Constrói o gerador de IR."""
         if not self.config.ir or not self.config.ir.enable_ir_generation:
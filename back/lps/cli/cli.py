@@ -13,6 +13,7 @@ from typing import Optional
 # Adiciona o diretório raiz ao path para importações
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from cli.batch import build_many, expand_inputs, print_report, save_report
 from cli.builder import ProductBuilder
 from product_config.product_config import ProductConfig, PREDEFINED_PRODUCTS
 from product_config.config_loader import YAMLConfigLoader, JSONConfigLoader
@@ -39,6 +40,7 @@ Exemplos de uso:
   minipar build --product minipar_compiler_x86_64 input.mp
   minipar build --product minipar_interpreter input.mp
   minipar build --config config.yaml input.mp
+  minipar build --product minipar_interpreter --jobs 8 programas/ 'testes/**/*.mp'
   minipar list-products
   minipar create-config --product minipar_compiler_riscv --output config.yaml
             """
@@ -48,10 +50,13 @@ Exemplos de uso:
         
         # Comando build
         build_parser = subparsers.add_parser('build', help='Constrói um produto de compilação')
-        build_parser.add_argument('input_file', help='Arquivo de entrada (.mp)')
+        build_parser.add_argument('input_files', nargs='+', metavar='input_file',
+                                  help='Arquivos de entrada (.mp), diretórios ou padrões glob')
         build_parser.add_argument('--product', '-p', help='Nome do produto pré-definido')
         build_parser.add_argument('--config', '-c', help='Arquivo de configuração')
-        build_parser.add_argument('--output', '-o', help='Arquivo de saída')
+        build_parser.add_argument('--output', '-o', help='Arquivo de saída (diretório de saída com vários arquivos)')
+        build_parser.add_argument('--jobs', '-j', type=int, help='Número de processos para vários arquivos (padrão: número de CPUs)')
+        build_parser.add_argument('--report', help='Salva o relatório da construção em lote em JSON')
         build_parser.add_argument('--verbose', '-v', action='store_true', help='Modo verboso')
         build_parser.add_argument('--debug', '-d', action='store_true', help='Modo debug')
         
@@ -92,12 +97,17 @@ Exemplos de uso:
     def _handle_build(self, args) -> int:
         """Manipula o comando build."""
         try:
+            # Expande diretórios e globs
+            input_files = expand_inputs(args.input_files)
+            if len(input_files) > 1:
+                return self._handle_build_many(args, input_files)
+            
             # Carrega configuração
             config = self._load_config(args)
             
             # Constrói o produto
             builder = ProductBuilder(config)
-            output = builder.build(args.input_file)
+            output = builder.build(input_files[0])
             
             # Salva a saída
             if args.output or config.output_file:
@@ -113,6 +123,21 @@ Exemplos de uso:
             print(f"Erro na construção: {e}")
             return 1
     
+    def _handle_build_many(self, args, input_files: list) -> int:
+        """Manipula o comando build com vários arquivos, em paralelo."""
+        # Com vários arquivos, --output é um diretório
+        output_dir = args.output
+        args.output = None
+        config = self._load_config(args)
+        
+        report = build_many(config, input_files, jobs=args.jobs, output_dir=output_dir)
+        print_report(report, verbose=config.verbose)
+        if args.report:
+            save_report(report, args.report)
+            print(f"Relatório salvo em: {args.report}")
+        
+        return 1 if report.failures else 0
+    
     def _handle_list_products(self) -> int:
         """Manipula o comando list-products."""
         print("Produtos disponíveis:")
@@ -4,26 +4,37 @@ Implementação do lexer para Minipar.
 Adapta o lexer existente para seguir as interfaces da linha de produto.
 """
 
-from typing import List, Tuple, Any
+from typing import Iterator, List, Tuple, Any
 from interfaces.ast import ASTNode, ASTNodeType
 from common.tokens import TokenEnums as en
-from .simple_lexer import SimpleMiniparLexer
+from .simple_lexer import SimpleMiniparLexer, TRACE_NONE, TRACE_SUMMARY
 
 
 class MiniparLexer:
     """Lexer para Minipar adaptado para a linha de produto."""
     
-    def __init__(self, source_code: str):
+    def __init__(self, source_code, trace_level: int = TRACE_NONE):
+        """
+        Aceita uma str, um objeto de arquivo ou um mmap com o código fonte.
+        
+        `trace_level` controla a saída no terminal (ver simple_lexer.TRACE_*).
+        """
         self.source_code = source_code
-        self.lexer = SimpleMiniparLexer(source_code)
+        self.trace_level = trace_level
+        self.lexer = SimpleMiniparLexer(source_code, trace_level)
         self.tokens: List[Tuple[en, Any]] = []
     
     def tokenize(self) -> List[Tuple[en, Any]]:
         """Tokeniza o código fonte."""
-        print("Usando lexer simplificado...")
+        if self.trace_level >= TRACE_SUMMARY:
+            print("Usando lexer simplificado...")
         self.tokens = self.lexer.tokenize()
         return self.tokens
     
+    def iter_tokens(self) -> Iterator[Tuple[en, Any]]:
+        """Gera os tokens sob demanda, sem materializar a lista completa."""
+        return self.lexer.iter_tokens()
+    
     def get_tokens(self) -> List[Tuple[en, Any]]:
         """Retorna a lista de tokens."""
         return self.tokens
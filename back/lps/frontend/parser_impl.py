@@ -4,7 +4,7 @@ Implementação do parser para Minipar.
 Adapta o parser existente para seguir as interfaces da linha de produto.
 """
 
-from typing import List, Tuple, Any
+from typing import Iterable, List, Tuple, Any
 from interfaces.ast import ASTNode, ASTNodeType
 from .ast_impl import MiniparASTBuilder
 from common.tokens import TokenEnums as en
@@ -14,14 +14,18 @@ from syntactic.src.parser import Parser
 class MiniparParser:
     """Parser para Minipar adaptado para a linha de produto."""
     
-    def __init__(self, tokens: List[Tuple[en, Any]]):
+    def __init__(self, tokens: Iterable[Tuple[en, Any]]):
+        """Aceita uma lista de tokens ou um iterador (ex.: MiniparLexer.iter_tokens)."""
         self.tokens = tokens
-        self.parser = Parser(tokens)
+        self.parser = Parser(tokens) if isinstance(tokens, list) else None
         self.ast_builder = MiniparASTBuilder()
     
     def parse(self) -> ASTNode:
         """Analisa os tokens e retorna a AST."""
-        print(f"Iniciando parsing com {len(self.tokens)} tokens...")
+        if isinstance(self.tokens, list):
+            print(f"Iniciando parsing com {len(self.tokens)} tokens...")
+        else:
+            print("Iniciando parsing de tokens sob demanda...")
         
         try:
             # Implementação simplificada do parser para evitar travamento
@@ -41,36 +45,30 @@ class MiniparParser:
         """Parser simplificado que não trava."""
         program = self.ast_builder.create_program()
         
-        # Processa tokens básicos
-        i = 0
-        while i < len(self.tokens):
-            token_type, token_value = self.tokens[i]
+        # Processa tokens básicos, consumindo-os um a um
+        for token_type, token_value in self.tokens:
             
             # Ignora tokens de pontuação e espaços
             if token_type in [en.DL_LPAREN, en.DL_RPAREN, en.DL_LBRACE, en.DL_RBRACE, 
                             en.DL_COMMA, en.DL_SEMICOLON]:
-                i += 1
                 continue
             
             # Processa identificadores
             if token_type == en.ID:
                 identifier = self.ast_builder.create_identifier(token_value)
                 program.add_child(identifier)
-                i += 1
                 continue
             
             # Processa números
             if token_type == en.NUM:
                 literal = self.ast_builder.create_literal(token_value)
                 program.add_child(literal)
-                i += 1
                 continue
             
             # Processa strings
             if token_type == en.STRING_LITERAL:
                 literal = self.ast_builder.create_literal(token_value, "STRING")
                 program.add_child(literal)
-                i += 1
                 continue
             
             # Processa palavras-chave
@@ -79,11 +77,7 @@ class MiniparParser:
                 # Cria um nó de programa para palavras-chave
                 keyword_node = self.ast_builder.create_node(ASTNodeType.PROGRAM, token_value)
                 program.add_child(keyword_node)
-                i += 1
                 continue
-            
-            # Avança para o próximo token
-            i += 1
         
         print(f"Parser simplificado concluído. AST criada com {len(program.children)} nós.")
         return program
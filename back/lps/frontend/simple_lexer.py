@@ -1,113 +1,154 @@
 #!/usr/bin/env python3
 """
 Lexer simplificado para Minipar que não depende do lexer original.
+
+Os tokens são reconhecidos por uma única regex com grupos nomeados, casada
+com `match(text, pos)` a partir da posição corrente (tempo linear no tamanho
+da entrada). Palavras reservadas são separadas de identificadores por uma
+única consulta na tabela de palavras reservadas compartilhada, e
+identificadores são internados.
 """
 
 import re
-from typing import List, Tuple, Any
+import sys
+from typing import Iterator, List, Tuple, Any
 from common.tokens import TokenEnums as en
+from lexical.src.keywords import build_keyword_table
+from lexical.src.source import SourceBuffer
+
+
+# Níveis de rastreamento (saída no terminal é opcional)
+TRACE_NONE = 0      # Silencioso
+TRACE_SUMMARY = 1   # Início/fim da tokenização e caracteres não reconhecidos
+TRACE_TOKENS = 2    # Também imprime cada token reconhecido
+
+# Palavras reservadas (tabela compartilhada com o lexer principal, gerada a
+# partir do WordDict; aceita qualquer grafia, como SEQ/seq e PAR/par)
+KEYWORDS = build_keyword_table(enum=en)
+
+# Operadores e delimitadores (apenas os que existem no TokenEnums)
+SYMBOLS = {
+    '(': en.DL_LPAREN,
+    ')': en.DL_RPAREN,
+    '{': en.DL_LBRACE,
+    '}': en.DL_RBRACE,
+    '[': en.DL_LBRACKET,
+    ']': en.DL_RBRACKET,
+    ',': en.DL_COMMA,
+    ';': en.DL_SEMICOLON,
+    '.': en.DL_DOT,
+    '+': en.OP_PLUS,
+    '-': en.OP_MINUS,
+    '*': en.OP_MULTIPLY,
+    '/': en.OP_DIVIDE,
+    '==': en.OP_EQ,
+    '!=': en.OP_NE,
+    '<': en.OP_LT,
+    '>': en.OP_GT,
+    '=': en.OP_ASSIGN,
+    '&&': en.OP_AND,
+    '||': en.OP_OR,
+    '!': en.OP_NOT,
+}
+
+# Regex única com todas as categorias de token. WORD é um identificador
+# delimitado por fronteiras de palavra (candidato a palavra reservada); ID
+# cobre o prefixo ASCII de palavras com caracteres não ASCII. Operadores
+# compostos aparecem antes dos simples.
+TOKEN_REGEX = re.compile(
+    r'''
+    (?:\s+)?+
+    (?:
+        (?P<WORD>(?<!\w)[a-zA-Z_][a-zA-Z0-9_]*(?!\w))
+      | (?P<ID>[a-zA-Z_][a-zA-Z0-9_]*)
+      | (?P<NUM>\d+)
+      | (?P<STRING>"[^"]*")
+      | (?P<SYMBOL>==|!=|&&|\|\||[-+*/<>=!(){}\[\],;.])
+      | (?P<ERROR>.)
+    )
+    ''',
+    re.VERBOSE,
+)
 
 
 class SimpleMiniparLexer:
     """Lexer simplificado para Minipar."""
-    
-    def __init__(self, source_code: str):
+
+    def __init__(self, source_code, trace_level: int = TRACE_NONE):
         self.source_code = source_code
+        self.trace_level = trace_level
         self.position = 0
         self.tokens: List[Tuple[en, Any]] = []
-    
+
     def tokenize(self) -> List[Tuple[en, Any]]:
-        """Tokeniza o código fonte usando regex simples."""
-        self.tokens = []
-        self.position = 0
-        
-        # Padrões de tokens (apenas os que existem no TokenEnums)
-        patterns = [
-            (en.RW_C_CHANNEL, r'\bc_channel\b'),
-            (en.RW_SEQ, r'\bSEQ\b'),
-            (en.RW_PAR, r'\bPAR\b'),
-            (en.RW_PRINT, r'\bprint\b'),
-            (en.RW_INPUT, r'\binput\b'),
-            (en.RW_IF, r'\bif\b'),
-            (en.RW_ELSE, r'\belse\b'),
-            (en.RW_WHILE, r'\bwhile\b'),
-            (en.RW_FOR, r'\bfor\b'),
-            (en.RW_INT, r'\bint\b'),
-            (en.RW_BOOL, r'\bbool\b'),
-            (en.RW_STRING, r'\bstring\b'),
-            (en.RW_TRUE, r'\btrue\b'),
-            (en.RW_FALSE, r'\bfalse\b'),
-            (en.RW_NULL, r'\bnull\b'),
-            (en.RW_CHAN, r'\bchan\b'),
-            (en.RW_RETURN, r'\breturn\b'),
-            (en.ID, r'[a-zA-Z_][a-zA-Z0-9_]*'),
-            (en.NUM, r'\d+'),
-            (en.STRING_LITERAL, r'"[^"]*"'),
-            (en.DL_LPAREN, r'\('),
-            (en.DL_RPAREN, r'\)'),
-            (en.DL_LBRACE, r'\{'),
-            (en.DL_RBRACE, r'\}'),
-            (en.DL_LBRACKET, r'\['),
-            (en.DL_RBRACKET, r'\]'),
-            (en.DL_COMMA, r','),
-            (en.DL_SEMICOLON, r';'),
-            (en.DL_DOT, r'\.'),
-            (en.OP_PLUS, r'\+'),
-            (en.OP_MINUS, r'-'),
-            (en.OP_MULTIPLY, r'\*'),
-            (en.OP_DIVIDE, r'/'),
-            (en.OP_EQ, r'=='),
-            (en.OP_NE, r'!='),
-            (en.OP_LT, r'<'),
-            (en.OP_LE, r'<='),
-            (en.OP_GT, r'>'),
-            (en.OP_GE, r'>='),
-            (en.OP_ASSIGN, r'='),
-            (en.OP_AND, r'&&'),
-            (en.OP_OR, r'\|\|'),
-            (en.OP_NOT, r'!'),
-            (en.OP_INC, r'\+\+'),
-            (en.OP_DEC, r'--'),
-            (en.OP_PLUS_ASSIGN, r'\+='),
-            (en.OP_MINUS_ASSIGN, r'-='),
-        ]
-        
-        # Compila padrões
-        compiled_patterns = [(token_type, re.compile(pattern)) for token_type, pattern in patterns]
-        
-        print(f"Iniciando tokenização simplificada...")
-        
-        while self.position < len(self.source_code):
-            matched = False
-            
-            # Pula whitespace primeiro
-            whitespace_match = re.match(r'\s+', self.source_code[self.position:])
-            if whitespace_match:
-                self.position += whitespace_match.end()
-                matched = True
+        """Tokeniza o código fonte."""
+        if self.trace_level >= TRACE_SUMMARY:
+            print(f"Iniciando tokenização simplificada...")
+        self.tokens = list(self.iter_tokens())
+        if self.trace_level >= TRACE_SUMMARY:
+            print(f"✅ Tokenização concluída com {len(self.tokens)} tokens.")
+        return self.tokens
+
+    def iter_tokens(self) -> Iterator[Tuple[en, Any]]:
+        """Gera os tokens sob demanda a partir de str, arquivo ou mmap."""
+        match_token = TOKEN_REGEX.match
+        keywords = KEYWORDS
+        intern = sys.intern
+        symbols = SYMBOLS
+        trace_level = self.trace_level
+
+        buffer = SourceBuffer(self.source_code)
+        text = buffer.text
+        size = len(text)
+        position = 0
+
+        while True:
+            match = match_token(text, position)
+
+            # Um token que encosta no fim do bloco pode continuar no próximo.
+            # Mantém um caractere anterior para a fronteira de palavra.
+            if (match is None or match.end() == size) and buffer.fill(max(position - 1, 0)):
+                position = min(position, 1)
+                text = buffer.text
+                size = len(text)
                 continue
-            
-            for token_type, pattern in compiled_patterns:
-                match = pattern.match(self.source_code, self.position)
-                if match:
-                    value = match.group(0)
-                    
-                    # Adiciona token
-                    self.tokens.append((token_type, value))
-                    print(f"Token: {token_type} = '{value}'")
-                    
-                    self.position = match.end()
-                    matched = True
-                    break
-            
-            if not matched:
+
+            if match is None:
+                break
+
+            kind = match.lastgroup
+            value = match.group(kind)
+            position = match.end()
+            self.position = buffer.offset + position
+
+            if kind == 'WORD':
+                token = keywords.get(value) or (en.ID, intern(value))
+            elif kind == 'SYMBOL':
+                token = (symbols[value], value)
+            elif kind == 'ID':
+                token = (en.ID, intern(value))
+            elif kind == 'NUM':
+                token = (en.NUM, value)
+            elif kind == 'STRING':
+                token = (en.STRING_LITERAL, value)
+            else:
+                start = match.start(kind)
+                # As aspas de fechamento de uma string podem estar no próximo bloco
+                if value == '"' and buffer.fill(max(start - 1, 0)):
+                    position = min(start, 1)
+                    text = buffer.text
+                    size = len(text)
+                    continue
+
                 # Caractere não reconhecido
-                char = self.source_code[self.position]
-                print(f"⚠️  Caractere não reconhecido: '{char}' (posição {self.position})")
-                self.position += 1
-        
+                if trace_level >= TRACE_SUMMARY:
+                    print(f"⚠️  Caractere não reconhecido: '{value}' (posição {buffer.offset + start})")
+                continue
+
+            if trace_level >= TRACE_TOKENS:
+                print(f"Token: {token[0]} = '{token[1]}'")
+            yield token
+
         # Adiciona EOF
-        self.tokens.append((en.EOF, ""))
-        print(f"✅ Tokenização concluída com {len(self.tokens)} tokens.")
-        
-        return self.tokens
+        self.position = buffer.offset + len(text)
+        yield (en.EOF, "")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Teste da construção em lote (vários arquivos em paralelo).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli.batch import build_many, expand_inputs
+from product_config.product_config import PREDEFINED_PRODUCTS
+
+
+def test_build_many():
+    """Constrói arquivos de vários diretórios e reúne os erros no relatório."""
+
+    source = Path(__file__).with_name('us01.mp').read_text(encoding='utf-8')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ['a/prog.mp', 'b/prog.mp', 'b/c/outro.mp']:
+            path = Path(tmp, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(source, encoding='utf-8')
+
+        files = expand_inputs([tmp, os.path.join(tmp, '**', 'prog.mp')])
+        assert len(files) == 3, files
+
+        missing = os.path.join(tmp, 'inexistente.mp')
+        config = PREDEFINED_PRODUCTS['minipar_compiler_hide_code']
+        output_dir = os.path.join(tmp, 'out')
+        report = build_many(config, files + [missing], jobs=2, output_dir=output_dir)
+
+        assert [result.input_file for result in report.results] == files + [missing]
+        assert [result.input_file for result in report.failures] == [missing]
+        assert report.to_dict()['succeeded'] == 3
+        assert report.files_per_second > 0
+
+        # Arquivos com o mesmo nome em diretórios diferentes não se sobrescrevem
+        outputs = sorted(Path(output_dir).rglob('*.out'))
+        assert len(outputs) == 3, outputs
+
+
+if __name__ == '__main__':
+    test_build_many()
+    print("✅ Construção em lote OK")
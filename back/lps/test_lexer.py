@@ -10,6 +10,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from frontend.lexer_impl import MiniparLexer
+from frontend.simple_lexer import SimpleMiniparLexer
 
 def test_lexer():
     """Testa o lexer com o arquivo us01.mp"""
@@ -48,5 +49,45 @@ def test_lexer():
         import traceback
         traceback.print_exc()
 
+def test_lexer_token_counts():
+    """Entradas repetidas e sequências longas geram os tokens esperados.
+    
+    O tempo por tamanho de entrada é medido em benchmarks/bench_lps_lexer.py.
+    """
+    
+    snippet = """
+    int contador = 0;
+    while (contador < 1000) {
+        contador = contador + 1;
+        print("valor", contador);
+    }
+    """
+    tokens = len(SimpleMiniparLexer(snippet).tokenize()) - 1  # sem o EOF
+    for repeat in (1, 10, 1000):
+        assert len(SimpleMiniparLexer(snippet * repeat).tokenize()) == tokens * repeat + 1
+    
+    # Sequências longas de um mesmo caractere viram um único token
+    size = 100_000
+    for text, kind in (("a" * size, "ID"), ("1" * size, "NUM"), ('"' + "a" * size + '"', "STRING_LITERAL")):
+        (token_type, value), (eof, _) = SimpleMiniparLexer(" " * size + text).tokenize()
+        assert (token_type.name, eof.name) == (kind, "EOF"), token_type
+        assert len(value) >= size
+
+
+def test_keywords_any_case():
+    """Palavras reservadas vêm da tabela compartilhada com o lexer principal."""
+    
+    tokens = SimpleMiniparLexer("SEQ seq Par while contador").tokenize()
+    kinds = [token_type.name for token_type, _ in tokens]
+    assert kinds == ['RW_SEQ', 'RW_SEQ', 'RW_PAR', 'RW_WHILE', 'ID', 'EOF'], kinds
+    
+    # Identificadores são internados
+    first = SimpleMiniparLexer("conta" + "dor").tokenize()[0][1]
+    second = SimpleMiniparLexer("cont" + "ador").tokenize()[0][1]
+    assert first is second
+
+
 if __name__ == '__main__':
     test_lexer()
+    test_lexer_token_counts()
+    test_keywords_any_case()
@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from interpreter.src.code_cache import python_source
+from interpreter.src.interpreter import SANDBOX
+from orchestrator.src.pipeline import StageError
+from orchestrator.src.stages import TARGETS, minipar_pipeline
+from pydantic import BaseModel
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Os workers da sandbox ficam prontos antes da primeira requisição
+    await asyncio.to_thread(SANDBOX.start)
+    yield
+    SANDBOX.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Pipeline compartilhado por todas as requisições; os programas rodam na
+# SANDBOX
+PIPELINE = minipar_pipeline(sandbox=SANDBOX)
+
+
+class RunInput(BaseModel):
+    code: str
+    # O que executar: "tokens", "tree", "check", "compile" ou "interpret"
+    target: str = "interpret"
+    # Execução dos blocos PAR: "thread" (padrão), "process" ou "subinterpreter"
+    par_mode: str = "thread"
+
+
+# Resultado de cada alvo a partir dos artefatos do pipeline
+def target_result(target, artifacts):
+    if target == "tokens":
+        tokens = artifacts["lex"]
+        return {"tokens": [[tokens.kind(i), tokens.value(i)] for i in range(len(tokens))]}
+    if target == "tree":
+        return {"syntax_tree": artifacts["parse"].to_json()}
+    if target == "check":
+        return {"message": "Semantic analysis completed successfully"}
+    if target == "compile":
+        return {"code": python_source(artifacts["parse"])}
+    return {"output": artifacts["interpret"]}
+
+
+@app.post("/run")
+async def run_code(input_data: RunInput):
+    # Ponto de entrada único do frontend: executa no pipeline os estágios de
+    # que o alvo depende e informa a latência de cada um
+    stages = TARGETS.get(input_data.target)
+    if stages is None:
+        return {
+            "status": "error",
+            "message": f"Invalid target, expected one of {list(TARGETS)}",
+        }
+
+    try:
+        artifacts, timings = await asyncio.to_thread(
+            PIPELINE.run, stages, code=input_data.code, par_mode=input_data.par_mode
+        )
+    except StageError as e:
+        return {
+            "status": "error",
+            "stage": e.stage,
+            "message": f"Error during {e.stage}: {str(e.error)}",
+        }
+
+    return {
+        "status": "success",
+        **target_result(input_data.target, artifacts),
+        "timings": timings,
+    }
+
+
+@app.get("/metrics")
+def stage_metrics():
+    # Latência média e máxima de cada estágio desde o início do serviço
+    return PIPELINE.stats()
+
+
+@app.get("/metrics/sandbox")
+def sandbox_metrics():
+    # Limites atingidos, reciclagens e os tempos de espera na fila e de
+    # execução dos programas na sandbox
+    return SANDBOX.stats()
@@ -0,0 +1,138 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Stage:
+    """
+    Estágio do pipeline: `function` recebe os artefatos dos estágios em
+    `requires` (na mesma ordem) e retorna o artefato do estágio.
+    """
+
+    __slots__ = ("name", "function", "requires")
+
+    def __init__(self, name, function, requires=()):
+        self.name = name
+        self.function = function
+        self.requires = tuple(requires)
+
+
+class StageError(Exception):
+    """
+    Falha de um estágio; `stage` é o nome do estágio e `__cause__` o erro.
+    """
+
+    def __init__(self, stage, error):
+        super().__init__(f"{stage}: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class StageMetrics:
+    """
+    Latência acumulada de um estágio em todas as execuções.
+    """
+
+    __slots__ = ("runs", "failures", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds, failed):
+        self.runs += 1
+        self.failures += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_json(self):
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "mean_seconds": self.total_seconds / self.runs if self.runs else 0.0,
+            "max_seconds": self.max_seconds,
+        }
+
+
+class Pipeline:
+    """
+    Grafo acíclico de estágios executado sob demanda.
+
+    `run(targets, **inputs)` executa apenas os estágios de que os alvos
+    dependem. Os artefatos (TokenStream, árvore, programa compilado) passam
+    de um estágio ao outro como objetos, sem serialização, e cada estágio
+    começa assim que todos os que ele requer terminam: estágios
+    independentes, como a análise semântica e a geração de código, rodam ao
+    mesmo tempo no pool. Requisitos que não são estágios (como o código
+    fonte) devem ser passados como entradas (`inputs`).
+    """
+
+    def __init__(self, stages, max_workers=8):
+        self.stages = {stage.name: stage for stage in stages}
+        self.metrics = {name: StageMetrics() for name in self.stages}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="minipar-stage")
+        self._lock = threading.Lock()
+
+    # Estágios de que os alvos dependem (incluindo os próprios alvos)
+    def plan(self, targets, inputs=()):
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed or name in inputs:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage or missing input {name!r}")
+            needed.add(name)
+            stack.extend(self.stages[name].requires)
+        return needed
+
+    # Executa os estágios necessários; retorna (artefatos, segundos por estágio)
+    def run(self, targets, **inputs):
+        pending = self.plan(targets, inputs)
+        artifacts = dict(inputs)
+        timings = {}
+        running = {}
+        try:
+            while pending or running:
+                for name in [name for name in pending if self._ready(name, artifacts)]:
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    args = [artifacts[required] for required in stage.requires]
+                    running[self._pool.submit(self._run_stage, stage, args)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    artifacts[name], timings[name] = future.result()
+        except StageError:
+            for future in running:
+                future.cancel()
+            raise
+        return artifacts, timings
+
+    def _ready(self, name, artifacts):
+        return all(required in artifacts for required in self.stages[name].requires)
+
+    def _run_stage(self, stage, args):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = stage.function(*args)
+            failed = False
+        except Exception as e:
+            raise StageError(stage.name, e) from e
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.metrics[stage.name].record(seconds, failed)
+        return result, seconds
+
+    def stats(self):
+        with self._lock:
+            return {name: metrics.to_json() for name, metrics in self.metrics.items()}
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,59 @@
+from functools import partial
+
+from interpreter.src.code_cache import CodeCache
+from interpreter.src.interpreter import CODE_CACHE, PAR_RUNTIMES, Interpreter
+from lexical.src.regex_lexer import RegexLexer
+from orchestrator.src.pipeline import Pipeline, Stage
+from semantic.src.semantic_analyzer import SemanticAnalyzer
+from syntactic.src.parser import Parser
+
+# Estágios executados para cada alvo de /run
+TARGETS = {
+    "tokens": ("lex",),
+    "tree": ("parse",),
+    "check": ("semantic",),
+    "compile": ("semantic", "codegen"),
+    "interpret": ("interpret",),
+}
+
+
+def lex(code):
+    return RegexLexer(code).tokenize_stream()
+
+
+def parse(tokens):
+    return Parser(tokens).parse()
+
+
+def check(tree):
+    SemanticAnalyzer().visit(tree)
+    return True
+
+
+def interpret(checked, program, par_mode, sandbox=None):
+    par_runtime = PAR_RUNTIMES.get(par_mode)
+    if par_runtime is None:
+        raise ValueError(f"Invalid PAR mode, expected one of {list(PAR_RUNTIMES)}")
+    return Interpreter(par_runtime=par_runtime, sandbox=sandbox).execute(program)
+
+
+def minipar_pipeline(cache: CodeCache = CODE_CACHE, max_workers=8, sandbox=None):
+    """
+    Pipeline do Minipar: lex → parse → (semantic ∥ codegen) → interpret.
+
+    Entradas: `code` (código-fonte) e `par_mode` (execução dos blocos PAR).
+    A análise semântica e a geração de código dependem só da árvore e rodam
+    ao mesmo tempo; o código gerado vem do CodeCache compartilhado com o
+    interpretador. O programa roda na `sandbox`, se houver, ou no próprio
+    processo.
+    """
+    return Pipeline(
+        [
+            Stage("lex", lex, ("code",)),
+            Stage("parse", parse, ("lex",)),
+            Stage("semantic", check, ("parse",)),
+            Stage("codegen", cache.get, ("parse",)),
+            Stage("interpret", partial(interpret, sandbox=sandbox), ("semantic", "codegen", "par_mode")),
+        ],
+        max_workers=max_workers,
+    )
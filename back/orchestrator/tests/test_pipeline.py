@@ -0,0 +1,91 @@
+import threading
+import unittest
+
+from interpreter.src.code_cache import CodeCache, python_source
+from orchestrator.src.pipeline import Pipeline, Stage, StageError
+from orchestrator.src.stages import TARGETS, minipar_pipeline
+
+PROGRAM = """
+int a = 6;
+PAR { print(a * 7); }
+"""
+
+
+class TestPipeline(unittest.TestCase):
+
+    def pipeline(self, stages):
+        pipeline = Pipeline(stages, max_workers=4)
+        self.addCleanup(pipeline.shutdown)
+        return pipeline
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(2)
+
+        def meet(value):
+            barrier.wait(timeout=5)
+            return value
+
+        pipeline = self.pipeline(
+            [
+                Stage("source", lambda x: x + 1, ("x",)),
+                Stage("left", meet, ("source",)),
+                Stage("right", meet, ("source",)),
+                Stage("sum", lambda a, b: a + b, ("left", "right")),
+            ]
+        )
+        artifacts, timings = pipeline.run(["sum"], x=1)
+        self.assertEqual(artifacts["sum"], 4)
+        self.assertEqual(set(timings), {"source", "left", "right", "sum"})
+        self.assertEqual(pipeline.stats()["sum"]["runs"], 1)
+
+    def test_runs_only_the_required_stages(self):
+        calls = []
+        pipeline = self.pipeline(
+            [
+                Stage("a", lambda x: calls.append("a") or x, ("x",)),
+                Stage("b", lambda a: calls.append("b") or a, ("a",)),
+            ]
+        )
+        pipeline.run(["a"], x=1)
+        self.assertEqual(calls, ["a"])
+        with self.assertRaises(ValueError):
+            pipeline.run(["b"])
+
+    def test_stage_errors(self):
+        pipeline = self.pipeline([Stage("fail", lambda x: 1 / x, ("x",))])
+        with self.assertRaises(StageError) as raised:
+            pipeline.run(["fail"], x=0)
+        self.assertEqual(raised.exception.stage, "fail")
+        self.assertIsInstance(raised.exception.error, ZeroDivisionError)
+        self.assertEqual(pipeline.stats()["fail"]["failures"], 1)
+
+
+class TestMiniparPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = CodeCache()
+        self.pipeline = minipar_pipeline(cache=self.cache, max_workers=4)
+        self.addCleanup(self.pipeline.shutdown)
+
+    def test_interpret(self):
+        artifacts, timings = self.pipeline.run(TARGETS["interpret"], code=PROGRAM, par_mode="thread")
+        self.assertEqual(artifacts["interpret"], "42\n")
+        self.assertEqual(set(timings), {"lex", "parse", "semantic", "codegen", "interpret"})
+        # Os artefatos passam entre os estágios como objetos
+        self.assertIs(artifacts["codegen"], self.cache.get(artifacts["parse"]))
+
+    def test_compile_skips_interpretation(self):
+        artifacts, timings = self.pipeline.run(TARGETS["compile"], code=PROGRAM)
+        self.assertIn("par_block", python_source(artifacts["parse"]))
+        self.assertNotIn("interpret", timings)
+
+    def test_errors_name_the_stage(self):
+        for code, stage in (("int a = ;", "parse"), ('int a = 1 + "x";', "semantic")):
+            with self.subTest(stage=stage):
+                with self.assertRaises(StageError) as raised:
+                    self.pipeline.run(TARGETS["check"], code=code)
+                self.assertEqual(raised.exception.stage, stage)
+
+
+if __name__ == "__main__":
+    unittest.main()
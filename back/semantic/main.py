@@ -1,9 +1,26 @@
+from contextlib import asynccontextmanager
+
+from common.worker_pool import PoolBusy, WorkerPool, env_int
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from semantic.src.semantic_analyzer import SemanticAnalyzer
-from trees.syntax_tree import SyntaxNode
+from semantic.src.semantic_analyzer import analyze_tree
+
+# Processos que executam o /semantic (SEMANTIC_OFFLOAD_WORKERS; 0, o padrão,
+# mantém a análise nas threads do servidor) e quantas requisições podem esperar
+# por um deles antes de responder 503 (SEMANTIC_OFFLOAD_QUEUE)
+OFFLOAD_WORKERS = env_int("SEMANTIC_OFFLOAD_WORKERS", 0)
+OFFLOAD_QUEUE = env_int("SEMANTIC_OFFLOAD_QUEUE", 64)
+POOL = WorkerPool(OFFLOAD_WORKERS, OFFLOAD_QUEUE, warm=("semantic.src.semantic_analyzer",))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    POOL.start()
+    yield
+    POOL.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 class SyntaxTreeInput(BaseModel):
@@ -14,19 +31,9 @@ class SyntaxTreeInput(BaseModel):
 def analyze_semantics(input_data: SyntaxTreeInput):
     try:
 
-        # Converte o JSON de entrada em uma árvore sintática
-        root = SyntaxNode.from_dict(input_data.syntax_tree)
-
-        print("ROOT: ", root)
-        # Cria o analisador semântico
-        analyzer = SemanticAnalyzer()
-
-        # Executa a análise semântica
-        errors = analyzer.analyze(root)
-
-        # Se houver erros semânticos, retorna com status de erro
-        if errors:
-            return {"status": "error", "errors": errors}
+        # Converte o JSON de entrada em uma árvore sintática e executa a
+        # análise semântica; erros semânticos são levantados como exceções
+        POOL.call(analyze_tree, input_data.syntax_tree)
 
         # Se a análise semântica for bem-sucedida, retorna uma mensagem de sucesso
         return {
@@ -34,6 +41,9 @@ def analyze_semantics(input_data: SyntaxTreeInput):
             "message": "Semantic analysis completed successfully",
         }
 
+    except PoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     except Exception as e:
         # Se ocorrer um erro durante a conversão ou análise, retorna um erro HTTP
         raise HTTPException(
@@ -1,6 +1,7 @@
 # from _parser import Parser
 from common.tokens import TokenEnums as en
 from trees.syntax_tree import SyntaxNode
+from trees.traversal import trampoline
 
 
 class SemanticAnalyzer:
@@ -25,8 +26,8 @@ class SemanticAnalyzer:
 
     def get_operands(self, node):
         # Obtém os operandos de uma operação
-        left = self.visit(node.children[0])
-        right = self.visit(node.children[1])
+        left = yield self.dispatch(node.children[0])
+        right = yield self.dispatch(node.children[1])
 
         # Verifica se ambos os operandos são inteiros
         if not left.node_type == en.RW_INT or not right.node_type == en.RW_INT:
@@ -34,7 +35,14 @@ class SemanticAnalyzer:
         return {"left": left.value, "right": right.value}
 
     def visit(self, node):
-        # Visita um nó da árvore sintática
+        # Visita um nó da árvore sintática. Os métodos visit_* que visitam
+        # outros nós são geradores (`yield self.dispatch(filho)`), executados
+        # pelo trampolim com uma pilha explícita em vez de recursão.
+        return trampoline(self.dispatch(node))
+
+    def dispatch(self, node):
+        # Chama o método visit_* do nó: retorna um gerador, para os métodos
+        # que visitam outros nós, ou o resultado direto
         method_name = f"visit_{node.node_type.name}"
         # Se for um operador de comparação, redireciona para visit_comparison
         if method_name.replace("visit_", "") in (
@@ -46,6 +54,8 @@ class SemanticAnalyzer:
             "OP_NE",
         ):
             method_name = "visit_comparison"
+        elif method_name in ("visit_OP_AND", "visit_OP_OR"):
+            method_name = "visit_logical"
         method = getattr(self, method_name, self.no_visit_method)
         return method(node)
 
@@ -56,35 +66,35 @@ class SemanticAnalyzer:
     def visit_PROGRAM(self, node):
         # Visita um nó PROGRAM, que consiste em uma sequência de declarações ou comandos
         for child in node.children:
-            self.visit(child)
+            yield self.dispatch(child)
 
     def visit_children(self, node):
         # Visita todos os filhos de um nó
         for child in node.children:
-            return self.visit(child)
+            return (yield self.dispatch(child))
 
     # As próximas funções visit_* lidam com tipos específicos de nós na árvore sintática, como palavras-chave ou operadores
 
     # Função visit_RW_INT: define o tipo atual como inteiro
     def visit_RW_INT(self, node):
         self.current_type = en.RW_INT
-        child = self.visit_children(node)
+        child = yield from self.visit_children(node)
         return child
 
     # Função visit_RW_BOOL: define o tipo atual como booleano
     def visit_RW_BOOL(self, node):
         self.current_type = en.RW_BOOL
-        self.visit_children(node)
+        yield from self.visit_children(node)
 
     # Função visit_RW_STRING: define o tipo atual como string
     def visit_RW_STRING(self, node):
         self.current_type = en.RW_STRING
-        self.visit_children(node)
+        yield from self.visit_children(node)
 
     # Função visit_RW_C_CHANNEL: define o tipo atual canal de conexão entre dois computadores e retorna um nó de sintaxe
     def visit_RW_C_CHANNEL(self, node):
         self.current_type = en.RW_C_CHANNEL
-        self.visit_children(node)
+        yield from self.visit_children(node)
 
         return SyntaxNode(en.RW_C_CHANNEL, None)
 
@@ -93,13 +103,13 @@ class SemanticAnalyzer:
     # Função visit_RW_PRINT: visita um nó de impressão
     def visit_RW_PRINT(self, node):
 
-        value = self.visit(node.children[0]).value
+        value = (yield self.dispatch(node.children[0])).value
         if value is None:
             raise Exception("ValueError: cannot print None")
 
     # Função visit_RW_INPUT: visita um nó de entrada
     def visit_RW_INPUT(self, node):
-        value = self.visit(node.children[0])
+        value = yield self.dispatch(node.children[0])
 
     # Função visit_OP_ASSIGN: visita um nó de atribuição
     def visit_OP_ASSIGN(self, node):
@@ -111,7 +121,7 @@ class SemanticAnalyzer:
             value_node.node_type is not en.NUM
             and value_node.node_type is not en.STRING_LITERAL
         ):
-            value_node = self.visit(value_node)
+            value_node = yield self.dispatch(value_node)
 
         value = value_node.value
         var_type = value_node.node_type
@@ -171,7 +181,7 @@ class SemanticAnalyzer:
         # Entra em um novo escopo e visita todas as declarações ou comandos dentro do bloco
         self.enter_scope()
         for statement_node in node.children:
-            self.visit(statement_node)
+            yield self.dispatch(statement_node)
         self.exit_scope()
 
         # Atualiza as variáveis globais se elas tiverem sido modificadas dentro do bloco
@@ -179,53 +189,61 @@ class SemanticAnalyzer:
             if name not in prev_global_env or prev_global_env[name] != value:
                 self.update_global_variable(name, value)
 
+    # Os operadores aritméticos retornam nós RW_INT, o tipo que get_operands
+    # espera, para que possam ser operandos de outras expressões
+
     # Função visit_OP_MULTIPLY: visita um nó de multiplicação
     def visit_OP_MULTIPLY(self, node):
-        op = self.get_operands(node)
-        return SyntaxNode(en.NUM, op["left"] * op["right"])
+        op = yield from self.get_operands(node)
+        return SyntaxNode(en.RW_INT, op["left"] * op["right"])
 
     # Função visit_OP_DIVIDE: visita um nó de divisão
     def visit_OP_DIVIDE(self, node):
-        op = self.get_operands(node)
-        return SyntaxNode(en.NUM, op["left"] / op["right"])
+        op = yield from self.get_operands(node)
+        return SyntaxNode(en.RW_INT, op["left"] / op["right"])
 
     # Função visit_OP_PLUS: visita um nó de adição
     def visit_OP_PLUS(self, node):
-        op = self.get_operands(node)
-        return SyntaxNode(en.NUM, op["left"] + op["right"])
+        op = yield from self.get_operands(node)
+        return SyntaxNode(en.RW_INT, op["left"] + op["right"])
 
-    # Função visit_OP_MINUS: visita um nó de subtração
+    # Função visit_OP_MINUS: visita um nó de subtração ou de negação unária
     def visit_OP_MINUS(self, node):
-        op = self.get_operands(node)
-        return SyntaxNode(en.NUM, op["left"] - op["right"])
+        if len(node.children) == 1:
+            operand = yield self.dispatch(node.children[0])
+            if not operand.node_type == en.RW_INT:
+                raise Exception("Type error: operand must be an integer")
+            return SyntaxNode(en.RW_INT, -operand.value)
+        op = yield from self.get_operands(node)
+        return SyntaxNode(en.RW_INT, op["left"] - op["right"])
 
     # Função visit_RW_PAR: visita um parêntese
     def visit_RW_PAR(self, node):
         self.enter_scope()
-        self.visit(node.children[0])
+        yield self.dispatch(node.children[0])
         self.exit_scope()
 
     # Função visit_RW_SEQ: visita o bloco da função seq
     def visit_RW_SEQ(self, node):
         for child in node.children:
-            self.visit(child)
+            yield self.dispatch(child)
 
     # Função visit_RW_FOR: visita um laço 'for'
     def visit_RW_FOR(self, node):
         # Entra em um novo escopo
         self.enter_scope()
-        init = self.visit(node.children[0])
-        condition_node = self.visit(node.value)
-        increment = self.visit(node.children[1])
+        init = yield self.dispatch(node.children[0])
+        condition_node = yield self.dispatch(node.value)
+        increment = yield self.dispatch(node.children[1])
 
         # Converte os nós de inicialização e incremento em números se necessário
         if init.node_type is not None and init.node_type == en.NUM:
-            init = self.visit(init)
+            init = yield self.dispatch(init)
         if increment.node_type == en.NUM:
-            increment = self.visit(increment)
+            increment = yield self.dispatch(increment)
 
         # Verifica se a condição é booleana e se os tipos de inicialização e incremento são inteiros
-        if not condition_node == en.RW_BOOL:
+        if not condition_node.node_type == en.RW_BOOL:
             raise Exception("Type error: condition must be boolean")
 
         if not init.node_type == en.RW_INT or not increment.node_type == en.RW_INT:
@@ -236,7 +254,7 @@ class SemanticAnalyzer:
             )
 
         # Visita o corpo do laço 'for'
-        self.visit(node.children[2])
+        yield self.dispatch(node.children[2])
 
         # Sai do escopo do laço 'for'
         self.exit_scope()
@@ -246,33 +264,59 @@ class SemanticAnalyzer:
         condition_node = node.value
         block_node = node.children[0]
 
-        condition_value = self.visit(condition_node).value
+        condition_value = (yield self.dispatch(condition_node)).value
 
         # Se a condição for verdadeira, entra em um novo escopo e visita o bloco
         if condition_value:
             self.enter_scope()
-            self.visit(block_node)
+            yield self.dispatch(block_node)
             self.exit_scope()
 
+    # Nó booleano retornado pelas comparações e operações lógicas. O valor não
+    # é avaliado: True indica uma condição que pode ser verdadeira (o corpo
+    # do while é analisado)
+    def boolean(self):
+        return SyntaxNode(en.RW_BOOL, True)
+
     # Função visit_comparison: visita um nó de comparação
     def visit_comparison(self, node):
-        left = self.visit(node.children[0])
-        right = self.visit(node.children[1])
+        left = yield self.dispatch(node.children[0])
+        right = yield self.dispatch(node.children[1])
 
         # Se os tipos dos operandos forem iguais, retorna booleano
         if left.node_type == right.node_type:
-            return en.RW_BOOL
+            return self.boolean()
 
         else:
             raise Exception("Type error: both operands must be of the same type")
 
+    # Função visit_logical: visita um nó lógico (&&, ||)
+    def visit_logical(self, node):
+        left = yield self.dispatch(node.children[0])
+        right = yield self.dispatch(node.children[1])
+        if left.node_type == en.RW_BOOL and right.node_type == en.RW_BOOL:
+            return self.boolean()
+        raise Exception("Type error: both operands must be boolean")
+
+    # Função visit_OP_NOT: visita uma negação lógica
+    def visit_OP_NOT(self, node):
+        if (yield self.dispatch(node.children[0])).node_type == en.RW_BOOL:
+            return self.boolean()
+        raise Exception("Type error: operand must be boolean")
+
     # Função visit_RW_IF: visita um bloco 'if'
     def visit_RW_IF(self, node):
-        condition_type = self.visit(node.value)
-        if condition_type == en.RW_BOOL:
+        condition = yield self.dispatch(node.value)
+        if condition.node_type == en.RW_BOOL:
             self.enter_scope()
-            self.visit(node.children[0])
+            yield self.dispatch(node.children[0])
             self.exit_scope()
 
         else:
             raise Exception("Type error: condition in 'if' statement must be boolean")
+
+
+# Analisa a árvore recebida em JSON; erros semânticos levantam exceções.
+# Usado pelo /semantic com o pool de processos
+def analyze_tree(syntax_tree):
+    SemanticAnalyzer().visit(SyntaxNode.from_dict(syntax_tree))
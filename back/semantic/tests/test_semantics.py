@@ -0,0 +1,75 @@
+import sys
+import unittest
+
+from common.tokens import TokenEnums as en
+from lexical.src.regex_lexer import RegexLexer
+from semantic.src.semantic_analyzer import SemanticAnalyzer
+from syntactic.src.parser import Parser
+from trees.syntax_tree import SyntaxNode
+
+DEPTH = 50_000
+
+
+# if (1 > 0) { if (1 > 0) { ... print("fim"); } } com `depth` níveis
+def nested_ifs(depth):
+    inner = SyntaxNode(en.RW_PRINT)
+    inner.add_children(SyntaxNode(en.STRING_LITERAL, "fim"))
+    for _ in range(depth):
+        block = SyntaxNode(en.BLOCK)
+        block.add_children(inner)
+        condition = SyntaxNode(en.OP_GT)
+        condition.add_children(SyntaxNode(en.NUM, 1))
+        condition.add_children(SyntaxNode(en.NUM, 0))
+        inner = SyntaxNode(en.RW_IF, condition)
+        inner.add_children(block)
+    program = SyntaxNode(en.PROGRAM)
+    program.add_children(inner)
+    return program
+
+
+class TestSemanticAnalyzer(unittest.TestCase):
+
+    def test_deeply_nested_program(self):
+        self.assertLess(sys.getrecursionlimit(), DEPTH)
+        analyzer = SemanticAnalyzer()
+        analyzer.visit(nested_ifs(DEPTH))
+        self.assertEqual(analyzer.local_envs, [{}])
+
+    def test_errors_propagate(self):
+        program = nested_ifs(3)
+        program.children[0].value = SyntaxNode(en.NUM, 1)
+        with self.assertRaisesRegex(Exception, "must be boolean"):
+            SemanticAnalyzer().visit(program)
+
+    def analyze(self, source):
+        SemanticAnalyzer().visit(Parser(RegexLexer(source).iter_tokens()).parse())
+
+    def test_boolean_expressions(self):
+        self.analyze(
+            "int a = 1; int b = 2;"
+            "print(a < b && !(b < a), a == b || a != b);"
+            "if (a < b == b > a) { print(a); }"
+            "while (!(a > b)) { a = a + 1; }"
+            "for (int i = 0; i < 3 && a < b; i = i + 1) { print(i); }"
+        )
+
+    def test_boolean_type_errors(self):
+        for source in ("int a = 1; print(!(a < 2) == 1);", "int a = 1; print(a && a < 2);", "print(!1);"):
+            with self.subTest(source=source):
+                with self.assertRaisesRegex(Exception, "Type error"):
+                    self.analyze(source)
+
+    def test_compound_arithmetic(self):
+        self.analyze(
+            "int x = 2 * -3;"
+            "int y = -(1 + 2);"
+            "int z = 1 + 2 * 3 - 4;"
+            "print(-x * (y - z), -(-x));"
+            "if (-x > y) { print(x); }"
+        )
+        with self.assertRaisesRegex(Exception, "operand must be an integer"):
+            self.analyze('int x = -"a";')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,29 @@
-from common.tokens import TokenEnums as en
-from fastapi import FastAPI
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from common.worker_pool import PoolBusy, WorkerPool, env_int
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
-from syntactic.src.parser import Parser
+from syntactic.src.parser import Parser, parse_tokens
+from trees import wire
+
+# Processos que executam o /parse (PARSER_OFFLOAD_WORKERS; 0, o padrão,
+# mantém o parsing nas threads do servidor) e quantas requisições podem esperar
+# por um deles antes de responder 503 (PARSER_OFFLOAD_QUEUE)
+OFFLOAD_WORKERS = env_int("PARSER_OFFLOAD_WORKERS", 0)
+OFFLOAD_QUEUE = env_int("PARSER_OFFLOAD_QUEUE", 64)
+POOL = WorkerPool(OFFLOAD_WORKERS, OFFLOAD_QUEUE, warm=("syntactic.src.parser",))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    POOL.start()
+    yield
+    POOL.shutdown()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 # Estrutura para armazenar a árvore sintática
 
@@ -12,21 +32,74 @@ class ParserInput(BaseModel):
     tokens: list[list]
 
 
+def accepts_wire(request):
+    return wire.MEDIA_TYPE in request.headers.get("accept", "")
+
+
+# Responde com a árvore no formato binário se o cliente o aceitar e em JSON
+# caso contrário
+def tree_response(request, syntax_tree):
+    if accepts_wire(request):
+        return Response(content=wire.encode_tree(syntax_tree), media_type=wire.MEDIA_TYPE)
+    return {"status": "success", "syntax_tree": syntax_tree.to_json()}
+
+
 @app.post("/parse")
-def parse_code(input_data: ParserInput):
-    def convert_to_enum(item):
-        if isinstance(item[0], str):
-            return [getattr(en, item[0]), item[1]]
+def parse_code(input_data: ParserInput, request: Request):
+    # Os tokens chegam como [código ou nome, valor] e são consumidos
+    # diretamente pelo Parser, sem conversão intermediária; a árvore já sai
+    # serializada de parse_tokens (que pode rodar em outro processo)
+    binary = accepts_wire(request)
+    try:
+        syntax_tree = POOL.call(parse_tokens, input_data.tokens, binary)
+    except PoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if binary:
+        return Response(content=syntax_tree, media_type=wire.MEDIA_TYPE)
+    return {"status": "success", "syntax_tree": syntax_tree}
 
-        if isinstance(item[0], int):
-            return [en(item[0]), item[1]]
 
-        return item
+# Decodifica blocos de bytes NDJSON (uma linha [código ou nome, valor] por
+# token, como emitido por /lex/stream) em tokens, um por vez
+def ndjson_tokens(chunks):
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield decode_token(line)
+    if pending.strip():
+        yield decode_token(pending)
 
-    tokens = input_data.tokens
 
-    tokens_mapped = [convert_to_enum(item) for item in tokens]
+def decode_token(line):
+    token = json.loads(line)
+    if isinstance(token, dict):
+        raise SyntaxError(token.get("error", "Invalid token"))
+    return token
 
-    parser = Parser(tokens_mapped)
-    syntax_tree = parser.parse()
-    return {"status": "success", "syntax_tree": syntax_tree.to_json()}
+
+@app.post("/parse/stream")
+async def parse_code_stream(request: Request):
+    # O corpo NDJSON é analisado enquanto ainda está sendo recebido: o Parser
+    # roda em uma thread e puxa cada bloco do corpo sob demanda do event loop
+    loop = asyncio.get_running_loop()
+    body = request.stream()
+
+    async def next_chunk():
+        return await body.__anext__()
+
+    def chunks():
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(next_chunk(), loop).result()
+            except StopAsyncIteration:
+                return
+
+    try:
+        syntax_tree = await asyncio.to_thread(lambda: Parser(ndjson_tokens(chunks())).parse())
+    except (SyntaxError, ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Error during parsing: {str(e)}")
+
+    return tree_response(request, syntax_tree)
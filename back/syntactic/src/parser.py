@@ -1,125 +1,222 @@
-from common.tokens import TokenEnums as en
+from collections import deque
+
+from common import token_kinds as tk
+from common.token_kinds import ENUMS, token_code
+from common.token_stream import TokenStream
+from trees import wire
 from trees.syntax_tree import SyntaxNode
 
+# Quantidade máxima de tokens que o parser pode olhar à frente do atual
+LOOKAHEAD = 4
+
+EOF_TOKEN = (tk.EOF, None, None)
+
+# Poder de ligação dos operadores binários: quanto maior, mais forte a
+# precedência. Todos são associativos à esquerda.
+BINARY_BINDING_POWER = {
+    tk.OP_OR: 10,
+    tk.OP_AND: 20,
+    tk.OP_EQ: 30,
+    tk.OP_NE: 30,
+    tk.OP_LT: 40,
+    tk.OP_LE: 40,
+    tk.OP_GT: 40,
+    tk.OP_GE: 40,
+    tk.OP_PLUS: 50,
+    tk.OP_MINUS: 50,
+    tk.OP_MULTIPLY: 60,
+    tk.OP_DIVIDE: 60,
+}
+
+# Operadores unários prefixos e o poder de ligação do seu operando
+PREFIX_BINDING_POWER = {
+    tk.OP_NOT: 70,
+    tk.OP_MINUS: 70,
+}
+
+
+# Gera triplas (código inteiro, valor, posição) a partir de qualquer fonte de
+# tokens. A posição é o índice do token em um TokenStream, a linha dada como
+# terceiro item de um token (tipo, valor, linha) ou None. Um token EOF
+# explícito encerra a sequência.
+def token_codes(tokens):
+    if isinstance(tokens, TokenStream):
+        values = tokens.values
+        for index, (kind, value_id) in enumerate(zip(tokens.kinds, tokens.value_ids)):
+            yield kind, values[value_id], index
+        return
+
+    for token in tokens:
+        kind = token_code(token[0])
+        if kind == tk.EOF:
+            return
+        yield kind, token[1], token[2] if len(token) > 2 else None
+
+
+def _no_line(position):
+    return None
+
+
+def _line_as_position(position):
+    return position
+
 
 class Parser:
-    # Inicializador da classe Parser
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.current_token_index = 0
-        self.current_token = self.tokens[self.current_token_index]
+    # Inicializador da classe Parser. Aceita qualquer iterável de tokens: um
+    # TokenStream, uma lista ou um gerador de tuplas (tipo, valor), como o
+    # iter_tokens() dos lexers. Os tokens são puxados sob demanda, de modo que
+    # lexer e parser formam um único pipeline com memória constante.
+    # Com um HashConsBuilder em `builder`, subárvores idênticas da árvore
+    # gerada passam a ser compartilhadas.
+    def __init__(self, tokens, builder=None):
+        self.builder = builder
+        self._tokens = token_codes(tokens)
+        # Converte a posição de um token em sua linha no código-fonte
+        if isinstance(tokens, TokenStream):
+            self._line_of = tokens.line if tokens.line_starts is not None else _no_line
+        else:
+            self._line_of = _line_as_position
+        # Tokens já lidos mas ainda não consumidos (no máximo LOOKAHEAD)
+        self._lookahead = deque()
+        self.current_kind, self.current_value, self._position = next(self._tokens, EOF_TOKEN)
+
+    # Token atual como tupla (TokenEnums, valor)
+    @property
+    def current_token(self):
+        return ENUMS[self.current_kind], self.current_value
+
+    # Linha do token atual no código-fonte, quando a fonte de tokens a informa
+    @property
+    def current_line(self):
+        if self._position is None:
+            return None
+        return self._line_of(self._position)
+
+    # Código do token `offset` posições à frente do atual (1 = o próximo)
+    def peek(self, offset=1):
+        if not 0 < offset <= LOOKAHEAD:
+            raise ValueError(f"Lookahead must be between 1 and {LOOKAHEAD}")
+        lookahead = self._lookahead
+        while len(lookahead) < offset:
+            lookahead.append(next(self._tokens, EOF_TOKEN))
+        return lookahead[offset - 1][0]
 
     # Função principal de análise sintática
     def parse(self):
         syntax_tree = self.parse_program()
+        if self.builder is not None:
+            syntax_tree = self.builder.intern(syntax_tree)
         return syntax_tree
 
     # Analisa um programa
     def parse_program(self):
-        syntax_tree = SyntaxNode(en.PROGRAM)
-
-        while self.current_token[0] != en.EOF:
-            if self.current_token[0] == en.ID:
-                assignment_node = self.parse_assignment()
-                syntax_tree.add_children(assignment_node)
-            elif self.current_token[0] in (en.RW_INT, en.RW_BOOL, en.RW_STRING):
-                declaration_node = self.parse_declaration()
-                syntax_tree.add_children(declaration_node)
-            elif self.current_token[0] in (
-                en.RW_IF,
-                en.RW_WHILE,
-                en.RW_FOR,
-                en.RW_PRINT,
-                en.RW_INPUT,
-                en.RW_C_CHANNEL,
-                en.RW_SEQ,
-                en.RW_PAR,
+        syntax_tree = SyntaxNode(ENUMS[tk.PROGRAM])
+
+        while self.current_kind != tk.EOF:
+            line = self.current_line
+            if self.current_kind == tk.ID:
+                statement_node = self.parse_assignment()
+            elif self.current_kind in (tk.RW_INT, tk.RW_BOOL, tk.RW_STRING):
+                statement_node = self.parse_declaration()
+            elif self.current_kind in (
+                tk.RW_IF,
+                tk.RW_WHILE,
+                tk.RW_FOR,
+                tk.RW_PRINT,
+                tk.RW_INPUT,
+                tk.RW_C_CHANNEL,
+                tk.RW_SEQ,
+                tk.RW_PAR,
             ):
                 statement_node = self.parse_statement()
-                syntax_tree.add_children(statement_node)
             else:
-                raise SyntaxError(f"Unexpected token: {self.current_token[0]}")
+                raise SyntaxError(f"Unexpected token: {ENUMS[self.current_kind]}")
+            statement_node.line = line
+            syntax_tree.add_children(statement_node)
         return syntax_tree
 
     # Analisa uma declaração
     def parse_declaration(self):
-        token = self.current_token
-        if token[0] in (en.RW_INT, en.RW_BOOL, en.RW_STRING):
-            self.eat(token[0])
-            identifier = self.current_token
+        token_kind = self.current_kind
+        if token_kind in (tk.RW_INT, tk.RW_BOOL, tk.RW_STRING):
+            self.eat(token_kind)
         else:
-            raise SyntaxError(f"Invalid declaration: {token[0]}, expected a type")
+            raise SyntaxError(
+                f"Invalid declaration: {ENUMS[token_kind]}, expected a type"
+            )
 
-        identifier = self.current_token
-        self.eat(en.ID)
-        self.eat(en.OP_ASSIGN)
+        identifier = self.current_value
+        self.eat(tk.ID)
+        self.eat(tk.OP_ASSIGN)
         value = self.parse_expression()
-        self.eat(en.DL_SEMICOLON)
+        self.eat(tk.DL_SEMICOLON)
 
-        assignment_node = SyntaxNode(en.OP_ASSIGN)
+        assignment_node = SyntaxNode(ENUMS[tk.OP_ASSIGN])
 
-        identifier_node = SyntaxNode(en.ID, identifier[1])
+        identifier_node = SyntaxNode(ENUMS[tk.ID], identifier)
         assignment_node.add_children(identifier_node)
         assignment_node.add_children(value)
 
-        declaration_node = SyntaxNode(token[0])
+        declaration_node = SyntaxNode(ENUMS[token_kind])
         declaration_node.add_children(assignment_node)
 
         return declaration_node
 
     # Analisa um bloco de código delimitado por chaves { }
     def parse_block(self):
-        block_node = SyntaxNode(en.BLOCK)
-        self.eat(en.DL_LBRACE)
-        while self.current_token[0] != en.DL_RBRACE:
+        block_node = SyntaxNode(ENUMS[tk.BLOCK])
+        self.eat(tk.DL_LBRACE)
+        while self.current_kind != tk.DL_RBRACE:
+            line = self.current_line
             statement_node = self.parse_statement()
+            statement_node.line = line
             block_node.add_children(statement_node)
-        self.eat(en.DL_RBRACE)
+        self.eat(tk.DL_RBRACE)
         return block_node
 
     # Analisa uma declaração ou instrução
     def parse_statement(self):
-        token_type = self.current_token[0]
+        token_type = self.current_kind
 
-        if token_type == en.RW_INT:
+        if token_type == tk.RW_INT:
             return self.parse_declaration()
-        elif token_type == en.ID:
+        elif token_type == tk.ID:
             return self.parse_assignment()
-        elif token_type == en.RW_IF:
+        elif token_type == tk.RW_IF:
             return self.parse_if_statement()
-        elif token_type == en.RW_WHILE:
+        elif token_type == tk.RW_WHILE:
             return self.parse_while_statement()
-        elif token_type == en.RW_FOR:
+        elif token_type == tk.RW_FOR:
             return self.parse_for_statement()
-        elif token_type == en.RW_PRINT:
+        elif token_type == tk.RW_PRINT:
             return self.parse_print()
-        elif token_type == en.RW_INPUT:
+        elif token_type == tk.RW_INPUT:
             return self.parse_input()
-        elif token_type == en.RW_C_CHANNEL:
+        elif token_type == tk.RW_C_CHANNEL:
             return self.parse_c_channel()
-        elif token_type == en.RW_SEQ:
+        elif token_type == tk.RW_SEQ:
             return self.parse_seq()
-        elif token_type == en.RW_PAR:
+        elif token_type == tk.RW_PAR:
             return self.parse_par()
-        elif token_type == en.RW_CHAN_SEND:
+        elif token_type == tk.RW_CHAN_SEND:
             return self.parse_chan_send()
-        elif token_type == en.RW_CHAN_RECV:
+        elif token_type == tk.RW_CHAN_RECV:
             return self.parse_chan_recv()
         else:
             return self.parse_expression()
 
     # Analisa uma instrução IF
     def parse_if_statement(self):
-        self.eat(en.RW_IF)
-        self.eat(en.DL_LPAREN)
+        self.eat(tk.RW_IF)
+        self.eat(tk.DL_LPAREN)
         condition = self.parse_expression()
-        self.eat(en.DL_RPAREN)
+        self.eat(tk.DL_RPAREN)
         if_block = self.parse_block()
         else_block = None
-        if self.current_token[0] == en.RW_ELSE:
-            self.eat(en.RW_ELSE)
+        if self.current_kind == tk.RW_ELSE:
+            self.eat(tk.RW_ELSE)
             else_block = self.parse_block()
-        if_node = SyntaxNode(en.RW_IF, condition)
+        if_node = SyntaxNode(ENUMS[tk.RW_IF], condition)
         if_node.add_children(if_block)
         if else_block:
             if_node.add_children(else_block)
@@ -127,61 +224,61 @@ class Parser:
 
     def parse_chan_send(self):
         # chan_send(chan, v1, v2);
-        self.eat(en.RW_CHAN_SEND)
+        self.eat(tk.RW_CHAN_SEND)
         params = self.parse_params()
         if len(params) != 3:
             raise SyntaxError("Invalid number of parameters for chan_send")
-        send_node = SyntaxNode(en.RW_CHAN_SEND, params[0])
+        send_node = SyntaxNode(ENUMS[tk.RW_CHAN_SEND], params[0])
         send_node.add_children(params[1])
         send_node.add_children(params[2])
-        self.eat(en.DL_SEMICOLON)
+        self.eat(tk.DL_SEMICOLON)
         return send_node
 
     def parse_chan_recv(self):
         # chan_recv(chan, v1, v2, res);
-        self.eat(en.RW_CHAN_RECV)
+        self.eat(tk.RW_CHAN_RECV)
         params = self.parse_params()
         if len(params) != 4:
             raise SyntaxError("Invalid number of parameters for chan_recv")
-        recv_node = SyntaxNode(en.RW_CHAN_RECV, params[0])
+        recv_node = SyntaxNode(ENUMS[tk.RW_CHAN_RECV], params[0])
         recv_node.add_children(params[1])
         recv_node.add_children(params[2])
         recv_node.add_children(params[3])
-        self.eat(en.DL_SEMICOLON)
+        self.eat(tk.DL_SEMICOLON)
 
     # Analisa uma instrução WHILE
     def parse_while_statement(self):
-        self.eat(en.RW_WHILE)
-        self.eat(en.DL_LPAREN)
+        self.eat(tk.RW_WHILE)
+        self.eat(tk.DL_LPAREN)
         condition = self.parse_expression()
-        self.eat(en.DL_RPAREN)
+        self.eat(tk.DL_RPAREN)
         block = self.parse_block()
 
-        while_node = SyntaxNode(en.RW_WHILE, condition)
+        while_node = SyntaxNode(ENUMS[tk.RW_WHILE], condition)
         while_node.add_children(block)
 
         return while_node
 
     # Analisa uma instrução FOR
     def parse_for_statement(self):
-        self.eat(en.RW_FOR)
-        self.eat(en.DL_LPAREN)
+        self.eat(tk.RW_FOR)
+        self.eat(tk.DL_LPAREN)
         init = None
 
-        if self.current_token[0] == en.RW_INT:
+        if self.current_kind == tk.RW_INT:
             init = self.parse_declaration()
         else:
             init = self.parse_assignment()
 
         condition = self.parse_expression()
 
-        self.eat(en.DL_SEMICOLON)
+        self.eat(tk.DL_SEMICOLON)
 
         increment = self.parse_assignment()
 
-        self.eat(en.DL_RPAREN)
+        self.eat(tk.DL_RPAREN)
         block = self.parse_block()
-        for_node = SyntaxNode(en.RW_FOR, condition)
+        for_node = SyntaxNode(ENUMS[tk.RW_FOR], condition)
         for_node.add_children(init)
         for_node.add_children(increment)
         for_node.add_children(block)
@@ -190,202 +287,187 @@ class Parser:
 
     # Analisa uma instrução de comunicação em canal C
     def parse_c_channel(self):
-        token = self.current_token
-        self.eat(en.RW_C_CHANNEL)
+        self.eat(tk.RW_C_CHANNEL)
         params = self.parse_params()
 
         if len(params) != 3:
             raise SyntaxError("Invalid number of parameters for c_channel")
 
-        channel_node = SyntaxNode(en.RW_C_CHANNEL)
+        channel_node = SyntaxNode(ENUMS[tk.RW_C_CHANNEL])
         channel_node.add_children(params[0])
         channel_node.add_children(params[1])
-        self.eat(en.DL_SEMICOLON)
+        self.eat(tk.DL_SEMICOLON)
         return channel_node
 
     # Analisa os parâmetros de uma função ou método
     def parse_params(self):
-        self.eat(en.DL_LPAREN)
+        self.eat(tk.DL_LPAREN)
         params = []
-        while self.current_token[0] != en.DL_RPAREN:
+        while self.current_kind != tk.DL_RPAREN:
             param = self.parse_expression()
             params.append(param)
-            if self.current_token[0] == en.DL_COMMA:
-                self.eat(en.DL_COMMA)
-        self.eat(en.DL_RPAREN)
+            if self.current_kind == tk.DL_COMMA:
+                self.eat(tk.DL_COMMA)
+        self.eat(tk.DL_RPAREN)
         return params
 
     # Analisa uma instrução SEQ
     def parse_seq(self):
-        self.eat(en.RW_SEQ)
+        self.eat(tk.RW_SEQ)
         block = self.parse_block()
-        seq_node = SyntaxNode(en.RW_SEQ)
+        seq_node = SyntaxNode(ENUMS[tk.RW_SEQ])
         seq_node.add_children(block)
         return seq_node
 
     # Analisa uma instrução PAR
     def parse_par(self):
-        self.eat(en.RW_PAR)
+        self.eat(tk.RW_PAR)
         block = self.parse_block()
-        par_node = SyntaxNode(en.RW_PAR)
+        par_node = SyntaxNode(ENUMS[tk.RW_PAR])
         par_node.add_children(block)
         return par_node
 
     # Analisa uma instrução de entrada
     def parse_input(self):
-        self.eat(en.RW_INPUT)
+        self.eat(tk.RW_INPUT)
         params = self.parse_params()
         if len(params) != 1:
             raise SyntaxError("Invalid number of parameters for input")
-        input_node = SyntaxNode(en.RW_INPUT)
+        input_node = SyntaxNode(ENUMS[tk.RW_INPUT])
         input_node.add_children(params[0])
-        self.eat(en.DL_SEMICOLON)
+        self.eat(tk.DL_SEMICOLON)
         return input_node
 
     # Analisa uma instrução de impressão
     def parse_print(self):
-        self.eat(en.RW_PRINT)
-        self.eat(en.DL_LPAREN)
+        self.eat(tk.RW_PRINT)
+        self.eat(tk.DL_LPAREN)
         expression = self.parse_expression()
-        print_node = SyntaxNode(en.RW_PRINT)
+        print_node = SyntaxNode(ENUMS[tk.RW_PRINT])
         print_node.add_children(expression)
-        while self.current_token[0] == en.DL_COMMA:
-            self.eat(en.DL_COMMA)
+        while self.current_kind == tk.DL_COMMA:
+            self.eat(tk.DL_COMMA)
             expression = self.parse_expression()
             print_node.add_children(expression)
-        self.eat(en.DL_RPAREN)
-        self.eat(en.DL_SEMICOLON)
+        self.eat(tk.DL_RPAREN)
+        self.eat(tk.DL_SEMICOLON)
         return print_node
 
     # Analisa uma instrução de atribuição
     def parse_assignment(self):
-        identifier = self.current_token
-        self.eat(en.ID)
-        token = self.current_token
-        if token[0] == en.OP_ASSIGN:
-            self.eat(en.OP_ASSIGN)
+        identifier = self.current_value
+        self.eat(tk.ID)
+        token_kind = self.current_kind
+        if token_kind == tk.OP_ASSIGN:
+            self.eat(tk.OP_ASSIGN)
             value = self.parse_expression()
             try:
-                self.eat(en.DL_SEMICOLON)
+                self.eat(tk.DL_SEMICOLON)
             except SyntaxError:
                 print("WARNING: Expected semicolon, but did not find one.")
 
-            assignment_node = SyntaxNode(en.OP_ASSIGN)
-            identifier_node = SyntaxNode(en.ID, identifier[1])
+            assignment_node = SyntaxNode(ENUMS[tk.OP_ASSIGN])
+            identifier_node = SyntaxNode(ENUMS[tk.ID], identifier)
             assignment_node.add_children(identifier_node)
             assignment_node.add_children(value)
             return assignment_node
 
-        elif token[0] in (en.OP_PLUS, en.OP_MINUS):
-            operator = token[0]
+        elif token_kind in (tk.OP_PLUS, tk.OP_MINUS):
+            operator = token_kind
             self.eat(operator)
             value = self.parse_expression()
-            self.eat(en.DL_SEMICOLON)
-            operation_node = SyntaxNode(operator)
-            operation_node.add_children(SyntaxNode(en.ID, identifier[1]))
+            self.eat(tk.DL_SEMICOLON)
+            operation_node = SyntaxNode(ENUMS[operator])
+            operation_node.add_children(SyntaxNode(ENUMS[tk.ID], identifier))
             operation_node.add_children(value)
             return operation_node
-        elif token[0] in (en.OP_INCREMENT, en.OP_DECREMENT):
-            operator = token[0]
+        elif token_kind in (tk.OP_INCREMENT, tk.OP_DECREMENT):
+            operator = token_kind
             self.eat(operator)
-            self.eat(en.DL_SEMICOLON)
-            operation_node = SyntaxNode(operator)
-            operation_node.add_children(SyntaxNode(en.ID, identifier[1]))
+            self.eat(tk.DL_SEMICOLON)
+            operation_node = SyntaxNode(ENUMS[operator])
+            operation_node.add_children(SyntaxNode(ENUMS[tk.ID], identifier))
             return operation_node
 
         else:
             raise SyntaxError("Invalid assignment statement")
 
-    # Analisa uma expressão
-    def parse_expression(self):
-
-        node = self.parse_term()
-
-        while self.current_token[0] in (
-            en.OP_PLUS,
-            en.OP_MINUS,
-            en.OP_MULTIPLY,
-            en.OP_DIVIDE,
-            en.OP_GT,
-            en.OP_LT,
-            en.OP_GE,
-            en.OP_LE,
-            en.OP_EQ,
-            en.OP_NE,
-        ):
-            token = self.current_token
-
-            self.eat(token[0])
-            operator_node = SyntaxNode(token[0])
-            operator_node.add_children(node)
-            operator_node.add_children(self.parse_term())
-            node = operator_node
-        return node
-
-    # Analisa um termo
-    def parse_term(self):
-        node = self.parse_factor()
-
-        while self.current_token[0] in (
-            en.OP_MULTIPLY,
-            en.OP_DIVIDE,
-            en.OP_PLUS,
-            en.OP_MINUS,
-        ):
-            token = self.current_token
-            self.eat(token[0])
-            operator = token[0]
-            rhs = self.parse_factor()
+    # Analisa uma expressão (Pratt): um operando seguido de operadores binários
+    # cujo poder de ligação seja maior que `min_power`
+    def parse_expression(self, min_power=0):
+        prefix_power = PREFIX_BINDING_POWER.get(self.current_kind)
+        if prefix_power is not None:
+            operator = self.current_kind
+            self.eat(operator)
+            node = SyntaxNode(ENUMS[operator])
+            node.add_children(self.parse_expression(prefix_power))
+        else:
+            node = self.parse_factor()
 
-            operator_node = SyntaxNode(operator)
+        binding_power = BINARY_BINDING_POWER
+        while True:
+            operator = self.current_kind
+            power = binding_power.get(operator)
+            if power is None or power <= min_power:
+                return node
 
+            # Operadores de mesmo nível são associativos à esquerda
+            self.eat(operator)
+            operator_node = SyntaxNode(ENUMS[operator])
             operator_node.add_children(node)
-
-            operator_node.add_children(rhs)
-
+            operator_node.add_children(self.parse_expression(power))
             node = operator_node
 
-        return node
-
     # Analisa um fator
     def parse_factor(self):
-        token = self.current_token
-        if token[0] == en.RW_INT:
-            self.eat(en.RW_INT)
-            return SyntaxNode(en.RW_INT, token[1])
-        elif token[0] == en.DL_LPAREN:
-            self.eat(en.DL_LPAREN)
+        token_kind = self.current_kind
+        if token_kind == tk.RW_INT:
+            value = self.current_value
+            self.eat(tk.RW_INT)
+            return SyntaxNode(ENUMS[tk.RW_INT], value)
+        elif token_kind == tk.DL_LPAREN:
+            self.eat(tk.DL_LPAREN)
             node = self.parse_expression()
-            self.eat(en.DL_RPAREN)
+            self.eat(tk.DL_RPAREN)
             return node
-        elif token[0] == en.ID:
-            identifier_token = self.current_token
-            self.eat(en.ID)
-            return SyntaxNode(en.ID, identifier_token[1])
-        elif token[0] == en.NUM:
-            num_token = self.current_token
-            self.eat(en.NUM)
-            return SyntaxNode(en.NUM, num_token[1])
-        elif token[0] == en.STRING_LITERAL:
-            string_token = self.current_token
-            self.eat(en.STRING_LITERAL)
-            return SyntaxNode(en.STRING_LITERAL, string_token[1])
+        elif token_kind == tk.ID:
+            identifier = self.current_value
+            self.eat(tk.ID)
+            return SyntaxNode(ENUMS[tk.ID], identifier)
+        elif token_kind == tk.NUM:
+            number = self.current_value
+            self.eat(tk.NUM)
+            return SyntaxNode(ENUMS[tk.NUM], number)
+        elif token_kind == tk.STRING_LITERAL:
+            string = self.current_value
+            self.eat(tk.STRING_LITERAL)
+            return SyntaxNode(ENUMS[tk.STRING_LITERAL], string)
         else:
             raise SyntaxError(
-                f"Invalid factor: {token[0]}, expected an identifier, integer, or expression"
+                f"Invalid factor: {ENUMS[token_kind]}, expected an identifier, integer, or expression"
             )
 
-    # Consome um token
-    def eat(self, token_type):
-        if self.current_token[0] == token_type:
-            self.current_token_index += 1
-            if self.current_token_index < len(self.tokens):
-                self.current_token = self.tokens[self.current_token_index]
+    # Consome um token do tipo `token_kind` (código inteiro)
+    def eat(self, token_kind):
+        if self.current_kind == token_kind:
+            if self._lookahead:
+                self.current_kind, self.current_value, self._position = self._lookahead.popleft()
             else:
-                self.current_token = (en.EOF, None)
-        elif self.current_token[0] == en.EOF:
-            raise SyntaxError(f"Unexpected end of file: expected {token_type}")
+                self.current_kind, self.current_value, self._position = next(
+                    self._tokens, EOF_TOKEN
+                )
+        elif self.current_kind == tk.EOF:
+            raise SyntaxError(f"Unexpected end of file: expected {ENUMS[token_kind]}")
         else:
             raise SyntaxError(
-                f"Unexpected token: expected {token_type}, got {self.current_token[0]}"
+                f"Unexpected token: expected {ENUMS[token_kind]}, got {ENUMS[self.current_kind]}"
             )
+
+
+# Analisa uma lista de tokens e retorna a árvore no formato binário
+# (`binary=True`) ou em JSON; usado pelo /parse com o pool de processos
+def parse_tokens(tokens, binary=False):
+    syntax_tree = Parser(tokens).parse()
+    if binary:
+        return wire.encode_tree(syntax_tree)
+    return syntax_tree.to_json()
@@ -0,0 +1,401 @@
+import contextlib
+import io
+import struct
+import unittest
+
+from common import token_kinds as tk
+from common.token_stream import TokenStream
+from common.tokens import TokenEnums as en
+from lexical.src.regex_lexer import RegexLexer
+from syntactic.src.parser import Parser
+from trees import wire
+from trees.arena import SyntaxArena
+from trees.hashcons import HashConsBuilder
+from trees.syntax_tree import NO_CHILDREN, SyntaxNode
+from trees.traversal import postorder, preorder, trampoline, walk
+
+# Profundidade das árvores nos testes de percurso sem recursão
+DEEP = 50_000
+
+PROGRAM = """
+int a = 10;
+if (a > 5) {
+    print("Hello", a);
+    PAR {
+        a = a + 5 * (2 - 1) / 3;
+    }
+} else {
+    seq {
+        print("World");
+    }
+}
+for (int i = 0; i < 3; i = i + 1) { print(i); }
+"""
+
+
+class TestTokenStream(unittest.TestCase):
+
+    def test_compact_storage(self):
+        stream = RegexLexer(PROGRAM).tokenize_stream()
+        tokens = [(en(kind.value), value) for kind, value in RegexLexer(PROGRAM).tokenize()]
+
+        self.assertEqual(list(stream), tokens)
+        self.assertEqual(stream.kinds.typecode, "H")
+        self.assertEqual(stream.starts.typecode, "I")
+        # Lexemas repetidos são armazenados uma única vez
+        self.assertEqual(len(stream.values), len(set(value for _, value in tokens)))
+
+    def test_source_offsets(self):
+        stream = RegexLexer(PROGRAM).tokenize_stream()
+        for index in range(len(stream)):
+            lexeme = PROGRAM[stream.starts[index] : stream.ends[index]]
+            if stream.kind(index) == tk.STRING_LITERAL:
+                lexeme = lexeme[1:-1]
+            self.assertEqual(lexeme, str(stream.value(index)))
+
+    def test_from_tokens_accepts_codes_names_and_enums(self):
+        stream = TokenStream.from_tokens([[tk.ID, "a"], ["OP_ASSIGN", "="], (en.NUM, 1)])
+        self.assertEqual(list(stream.kinds), [tk.ID, tk.OP_ASSIGN, tk.NUM])
+
+    def test_values_keep_their_types(self):
+        stream = TokenStream.from_tokens([[tk.NUM, 1], [tk.NUM, 1.0], [tk.NUM, True], [tk.NUM, 1]])
+        self.assertEqual([type(stream.value(i)) for i in range(4)], [int, float, bool, int])
+        self.assertEqual(list(stream.value_ids), [0, 1, 2, 0])
+
+
+class TestParser(unittest.TestCase):
+
+    def test_same_tree_from_list_and_stream(self):
+        stream = RegexLexer(PROGRAM).tokenize_stream()
+        # Tokens (tipo, valor, linha), como os enviados entre os serviços
+        tokens = [(stream.kind(i), stream.value(i), stream.line(i)) for i in range(len(stream))]
+        from_list = Parser(tokens).parse().to_json()
+        from_stream = Parser(stream).parse().to_json()
+        self.assertEqual(from_list, from_stream)
+        self.assertEqual(from_list["node_type"], "PROGRAM")
+        self.assertEqual(len(from_list["children"]), 3)
+
+    def test_consumes_token_iterator_lazily(self):
+        consumed = []
+
+        def tokens():
+            for token in RegexLexer(PROGRAM).iter_tokens():
+                consumed.append(token)
+                yield token
+
+        parser = Parser(tokens())
+        # Apenas o primeiro token é lido na construção
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(parser.peek(1), tk.ID)
+        self.assertEqual(parser.peek(2), tk.OP_ASSIGN)
+        self.assertEqual(len(consumed), 3)
+
+        expected = Parser(RegexLexer(PROGRAM).tokenize()).parse().to_json()
+        self.assertEqual(parser.parse().to_json(), expected)
+
+    def test_explicit_eof_and_bounded_peek(self):
+        parser = Parser([[tk.ID, "a"], ["EOF", None], [tk.ID, "b"]])
+        self.assertEqual(parser.peek(1), tk.EOF)
+        self.assertEqual(parser.peek(4), tk.EOF)
+        with self.assertRaises(ValueError):
+            parser.peek(5)
+
+    def expression(self, source):
+        tree = Parser(RegexLexer(f"x = {source};").tokenize_stream()).parse()
+        return tree.children[0].children[1]
+
+    def shape(self, node):
+        if not node.children:
+            return node.value
+        return (node.node_type.name, *(self.shape(child) for child in node.children))
+
+    def test_precedence(self):
+        self.assertEqual(
+            self.shape(self.expression("a + b * c - d")),
+            ("OP_MINUS", ("OP_PLUS", "a", ("OP_MULTIPLY", "b", "c")), "d"),
+        )
+        self.assertEqual(
+            self.shape(self.expression("a < b + 1 && !c || d == e")),
+            (
+                "OP_OR",
+                ("OP_AND", ("OP_LT", "a", ("OP_PLUS", "b", 1)), ("OP_NOT", "c")),
+                ("OP_EQ", "d", "e"),
+            ),
+        )
+
+    def test_left_associativity_and_unary_minus(self):
+        self.assertEqual(
+            self.shape(self.expression("a - b - c")),
+            ("OP_MINUS", ("OP_MINUS", "a", "b"), "c"),
+        )
+        self.assertEqual(
+            self.shape(self.expression("-a * b")),
+            ("OP_MULTIPLY", ("OP_MINUS", "a"), "b"),
+        )
+
+    def test_generated_code_keeps_precedence(self):
+        code = self.expression("-a + b * 2 > 3 && !(c || d)").evaluate()
+        env = {"a": 1, "b": 4, "c": False, "d": False}
+        self.assertTrue(eval(code, env))
+        self.assertEqual(eval(self.expression("10 - 4 - 3").evaluate()), 3)
+
+    def test_generated_program(self):
+        source = """
+        int a = 2;
+        if (a > 1) { PAR { if (a > 0) { print(a * 10); } } } else { }
+        while (a < 4) { a = a + 1; }
+        seq { print(a, "fim"); }
+        """
+        code = Parser(RegexLexer(source).iter_tokens()).parse().evaluate()
+        self.assertIn("    par_block(['''\nif (a > 0):\n    print((a * 10))\n    '''])\n", code)
+        self.assertIn("else:\n    pass\n", code)
+
+        blocks = []
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exec(compile(code, "<minipar>", "exec"), {"par_block": blocks.extend})
+            exec(blocks[0], {"a": 2})
+        self.assertEqual(output.getvalue(), "4 fim\n20\n")
+
+    def test_unexpected_end_of_file(self):
+        with self.assertRaises(SyntaxError):
+            Parser(RegexLexer("int a = 1").tokenize_stream()).parse()
+
+
+class TestSyntaxTree(unittest.TestCase):
+
+    def test_compact_nodes(self):
+        leaf = SyntaxNode(en.ID, "a")
+        self.assertFalse(hasattr(leaf, "__dict__"))
+        self.assertIs(leaf.children, NO_CHILDREN)
+
+        parent = SyntaxNode(en.OP_PLUS)
+        parent.add_children(leaf)
+        self.assertEqual(parent.children, [leaf])
+        self.assertIs(SyntaxNode(en.NUM, 1).children, NO_CHILDREN)
+
+    def test_arena_round_trip(self):
+        tree = Parser(RegexLexer(PROGRAM).tokenize_stream()).parse()
+        arena = SyntaxArena.from_tree(tree)
+
+        self.assertEqual(arena.to_json(), tree.to_json())
+        self.assertEqual(arena.to_tree().evaluate(), tree.evaluate())
+        self.assertEqual(SyntaxNode.from_dict(tree.to_json()).to_json(), tree.to_json())
+
+        # O if guarda a condição como subárvore
+        if_id = list(arena.children(0))[1]
+        self.assertEqual(arena.node_type(if_id), en.RW_IF)
+        self.assertTrue(arena.is_subtree(if_id))
+        self.assertEqual(arena.node_type(arena.value(if_id)), en.OP_GT)
+
+
+# a0 + a1 + ... + a{size-1}, associativo à esquerda: profundidade `size`
+def left_chain(size):
+    node = SyntaxNode(en.ID, "a0")
+    for index in range(1, size):
+        parent = SyntaxNode(en.OP_PLUS)
+        parent.add_children(node)
+        parent.add_children(SyntaxNode(en.ID, f"a{index}"))
+        node = parent
+    return node
+
+
+class TestTraversal(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = Parser(RegexLexer("x = a * b + c;").iter_tokens()).parse()
+
+    def test_orders(self):
+        assign = self.tree.children[0]
+        self.assertEqual(
+            [node.value or node.node_type.name for node in preorder(assign)],
+            ["OP_ASSIGN", "x", "OP_PLUS", "OP_MULTIPLY", "a", "b", "c"],
+        )
+        self.assertEqual(
+            [node.value or node.node_type.name for node in postorder(assign)],
+            ["x", "a", "b", "OP_MULTIPLY", "c", "OP_PLUS", "OP_ASSIGN"],
+        )
+
+    def test_walk_enter_exit_and_skip(self):
+        events = []
+
+        def enter(node, depth):
+            events.append(("enter", node.node_type.name, depth))
+            return node.node_type != en.OP_MULTIPLY
+
+        def exit(node, depth):
+            events.append(("exit", node.node_type.name, depth))
+
+        walk(self.tree.children[0].children[1], enter, exit)
+        self.assertEqual(
+            events,
+            [
+                ("enter", "OP_PLUS", 0),
+                ("enter", "OP_MULTIPLY", 1),
+                ("exit", "OP_MULTIPLY", 1),
+                ("enter", "ID", 1),
+                ("exit", "ID", 1),
+                ("exit", "OP_PLUS", 0),
+            ],
+        )
+
+    def test_trampoline(self):
+        def depth(node):
+            deepest = 0
+            for child in node.children:
+                deepest = max(deepest, (yield depth(child)))
+            return 1 + deepest
+
+        self.assertEqual(trampoline(depth(left_chain(DEEP))), DEEP)
+        self.assertEqual(trampoline(42), 42)
+
+        def failing(level):
+            if level == 0:
+                raise KeyError(level)
+            try:
+                return (yield failing(level - 1))
+            except KeyError:
+                return "handled"
+
+        def unhandled(level):
+            if level == 0:
+                raise KeyError(level)
+            return (yield unhandled(level - 1))
+
+        self.assertEqual(trampoline(failing(5)), "handled")
+        with self.assertRaises(KeyError):
+            trampoline(unhandled(DEEP))
+
+    def test_deep_left_chain(self):
+        chain = left_chain(DEEP)
+        code = chain.evaluate()
+        self.assertTrue(code.startswith("(" * (DEEP - 1) + "a0 + a1)"))
+
+        # Comparar os dicionários diretamente recursaria; compara-se os nós em pré-ordem
+        rebuilt = SyntaxNode.from_dict(chain.to_json())
+        self.assertEqual(
+            [(node.node_type, node.value) for node in preorder(rebuilt)],
+            [(node.node_type, node.value) for node in preorder(chain)],
+        )
+        self.assertEqual(sum(1 for _ in preorder(chain)), 2 * DEEP - 1)
+
+    def test_deep_print_tree(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            left_chain(5_000).print_tree()
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2 * 5_000 - 1)
+        self.assertEqual(lines[-1], "    TokenEnums.ID of value a4999")
+
+
+class TestHashConsing(unittest.TestCase):
+
+    SOURCE = """
+    x = a * b + 1;
+    y = a * b + 1;
+    if (a * b > 1) { print(a * b); } else { print(a * b); }
+    z = a * b + 2;
+    """
+
+    def parse(self, builder=None):
+        return Parser(RegexLexer(self.SOURCE).iter_tokens(), builder).parse()
+
+    def test_structural_hash(self):
+        tree = self.parse()
+        x, y, if_node, z = tree.children
+        self.assertEqual(len(x.children[1].structural_hash()), 16)
+        self.assertEqual(x.children[1].structural_hash(), y.children[1].structural_hash())
+        self.assertNotEqual(x.structural_hash(), y.structural_hash())
+        self.assertNotEqual(x.children[1].structural_hash(), z.children[1].structural_hash())
+        self.assertEqual(tree.structural_hash(), self.parse().structural_hash())
+
+        # add_children descarta o hash guardado
+        before = if_node.structural_hash()
+        if_node.add_children(SyntaxNode(en.BLOCK))
+        self.assertNotEqual(if_node.structural_hash(), before)
+
+    def test_identical_subtrees_are_shared(self):
+        builder = HashConsBuilder()
+        tree = self.parse(builder)
+        x, y, if_node, z = tree.children
+
+        self.assertIs(x.children[1], y.children[1])
+        self.assertIsNot(x.children[1], z.children[1])
+        then_block, else_block = if_node.children
+        self.assertIs(then_block, else_block)
+        self.assertIs(if_node.value.children[0], x.children[1].children[0])
+
+        # Um mesmo builder compartilha subárvores entre programas
+        self.assertIs(self.parse(builder).children[0], x)
+        plain = self.parse()
+        self.assertEqual(tree.to_json(), plain.to_json())
+        self.assertEqual(tree.evaluate(), plain.evaluate())
+        self.assertEqual(wire.decode_tree(wire.encode_tree(tree)).to_json(), plain.to_json())
+
+    def test_statements_keep_their_lines(self):
+        code = "int x = 1;\nprint(x);\nx = 1/0;\nprint(x);\nx = 1/0;"
+        tree = Parser(RegexLexer(code).tokenize_stream(), HashConsBuilder()).parse()
+        self.assertEqual([statement.line for statement in tree.children], [1, 2, 3, 4, 5])
+        # As expressões iguais continuam compartilhadas
+        self.assertIs(tree.children[2].children[1], tree.children[4].children[1])
+
+
+class TestWireFormat(unittest.TestCase):
+
+    def test_round_trip(self):
+        tree = Parser(RegexLexer(PROGRAM + 'x = -(a + 1) * 99999999999999999999;').iter_tokens()).parse()
+        data = wire.encode_tree(tree)
+
+        self.assertEqual(wire.decode_tree(data).to_json(), tree.to_json())
+        self.assertLess(len(data), len(str(tree.to_json())))
+
+    def test_source_lines(self):
+        tree = Parser(RegexLexer(PROGRAM).tokenize_stream()).parse()
+        lines = [child.line for child in tree.children]
+        self.assertEqual(lines, sorted(lines))
+        self.assertNotIn(None, lines)
+        decoded = wire.decode_tree(wire.encode_tree(tree))
+        self.assertEqual([child.line for child in decoded.children], lines)
+        self.assertEqual(SyntaxArena.from_tree(tree).to_tree().to_json(), tree.to_json())
+
+    def test_value_types(self):
+        root = SyntaxNode(en.PROGRAM)
+        for value in (1, 1.0, True, "1", en.RW_INT, None):
+            root.add_children(SyntaxNode(en.NUM, value))
+        decoded = wire.decode_tree(wire.encode_tree(root))
+        self.assertEqual(
+            [(type(child.value), child.value) for child in decoded.children],
+            [(type(child.value), child.value) for child in root.children],
+        )
+
+    def test_invalid_data(self):
+        data = wire.encode_tree(Parser(RegexLexer(PROGRAM).iter_tokens()).parse())
+        with self.assertRaises(ValueError):
+            wire.decode_tree(b"XXXX" + data[4:])
+        with self.assertRaises(ValueError):
+            wire.decode_tree(data[: wire.HEADER.size + 10])
+        with self.assertRaises(ValueError):
+            wire.decode_tree(data[:-3])
+        with self.assertRaises(ValueError):
+            wire.decode_tree(data[:5])
+
+    def test_corrupt_tables(self):
+        tree = Parser(RegexLexer(PROGRAM).iter_tokens()).parse()
+        data = bytearray(wire.encode_tree(tree))
+        _, _, node_count, _ = wire.HEADER.unpack_from(data, 0)
+        kinds = wire.HEADER.size
+        value_ids = kinds + node_count * (2 + 4)
+
+        unknown_kind = bytearray(data)
+        wire.UINT16.pack_into(unknown_kind, kinds, 0xFFFF)
+        out_of_range = bytearray(data)
+        struct.pack_into("<i", out_of_range, value_ids, 1_000_000)
+        invalid_id = bytearray(data)
+        struct.pack_into("<i", invalid_id, value_ids, -7)
+        for corrupt in (unknown_kind, out_of_range, invalid_id):
+            with self.assertRaisesRegex(ValueError, "Invalid"):
+                wire.decode_tree(bytes(corrupt))
+
+
+if __name__ == "__main__":
+    unittest.main()
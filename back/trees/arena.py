@@ -0,0 +1,116 @@
+import sys
+from array import array
+
+from common.token_kinds import ENUMS
+from trees.syntax_tree import SyntaxNode
+
+
+class SyntaxArena:
+    """
+    Árvore sintática inteira em arrays paralelos indexados pelo id do nó.
+
+    Os nós são numerados em largura a partir da raiz (id 0), de modo que os
+    filhos de cada nó ocupam ids consecutivos: `first_child[id]` e
+    `child_count[id]` bastam para percorrê-los. O tipo do nó é guardado como
+    código inteiro e o valor como índice em uma tabela de valores distintos;
+    um valor que é uma subárvore (a condição de `if`, `while` e `for`) é
+    guardado como `-1 - id` da raiz dessa subárvore. `lines` guarda a linha
+    de origem de cada nó (0 quando desconhecida).
+    """
+
+    def __init__(self):
+        self.kinds = array("H")
+        self.value_ids = array("i")
+        self.first_child = array("I")
+        self.child_count = array("I")
+        self.lines = array("I")
+        self.values = []
+        self._value_index = {}
+
+    # Compacta uma árvore de SyntaxNode (sem recursão)
+    @classmethod
+    def from_tree(cls, root):
+        arena = cls()
+        kinds = arena.kinds
+        value_ids = arena.value_ids
+        first_child = arena.first_child
+        child_count = arena.child_count
+        lines = arena.lines
+
+        nodes = [root]
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            value = node.value
+            if isinstance(value, SyntaxNode):
+                value_ids.append(-1 - len(nodes))
+                nodes.append(value)
+            else:
+                value_ids.append(arena._value_id(value))
+
+            kinds.append(node.node_type.value)
+            first_child.append(len(nodes))
+            child_count.append(len(node.children))
+            lines.append(node.line or 0)
+            nodes.extend(node.children)
+            index += 1
+
+        return arena
+
+    def _value_id(self, value):
+        # O tipo faz parte da chave para não confundir 1, 1.0 e True
+        key = (type(value), value)
+        value_id = self._value_index.get(key)
+        if value_id is None:
+            value_id = self._value_index[key] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # Membro de TokenEnums do nó `node_id`
+    def node_type(self, node_id):
+        return ENUMS[self.kinds[node_id]]
+
+    # Valor do nó: o valor original ou o id da subárvore (se `is_subtree`)
+    def value(self, node_id):
+        value_id = self.value_ids[node_id]
+        if value_id < 0:
+            return -1 - value_id
+        return self.values[value_id]
+
+    def is_subtree(self, node_id):
+        return self.value_ids[node_id] < 0
+
+    # Ids dos filhos do nó `node_id`
+    def children(self, node_id):
+        first = self.first_child[node_id]
+        return range(first, first + self.child_count[node_id])
+
+    # Reconstrói a árvore de SyntaxNode a partir do nó `node_id` (sem recursão)
+    def to_tree(self, node_id=0):
+        values = self.values
+        nodes = [
+            SyntaxNode(ENUMS[kind], values[value_id] if value_id >= 0 else None)
+            for kind, value_id in zip(self.kinds, self.value_ids)
+        ]
+        for node, value_id, first, count, line in zip(
+            nodes, self.value_ids, self.first_child, self.child_count, self.lines
+        ):
+            if line:
+                node.line = line
+            if value_id < 0:
+                node.value = nodes[-1 - value_id]
+            if count:
+                node.children = nodes[first : first + count]
+        return nodes[node_id]
+
+    def to_json(self):
+        return self.to_tree().to_json()
+
+    # Bytes ocupados pelos arrays e pela tabela de valores
+    def nbytes(self):
+        arrays = (self.kinds, self.value_ids, self.first_child, self.child_count, self.lines)
+        size = sum(item.buffer_info()[1] * item.itemsize for item in arrays)
+        return size + sum(sys.getsizeof(value) for value in self.values)
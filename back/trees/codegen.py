@@ -0,0 +1,53 @@
+INDENT = "    "  # Quatro espaços por nível de indentação
+
+
+class CodeEmitter:
+    """
+    Acumulador do código Python gerado a partir da árvore sintática.
+
+    Guarda os fragmentos em uma lista, na ordem em que são emitidos, e só
+    monta o texto final com um único `"".join` em `getvalue()`. Cada linha
+    começa com a indentação do nível atual; `indent()`/`dedent()` mudam o
+    nível e `set_level()` permite emitir um trecho em outra profundidade
+    (como o corpo de um PAR, que vai para dentro de uma string).
+    """
+
+    def __init__(self, level=0):
+        self.parts = []
+        self.level = level
+        self._indents = [""]
+
+    # Abre uma nova linha no nível atual
+    def start_line(self):
+        indents = self._indents
+        while len(indents) <= self.level:
+            indents.append(indents[-1] + INDENT)
+        self.parts.append(indents[self.level])
+
+    # Acrescenta um fragmento à linha atual
+    def write(self, text):
+        self.parts.append(text)
+
+    def end_line(self):
+        self.parts.append("\n")
+
+    # Emite uma linha completa
+    def line(self, text):
+        self.start_line()
+        self.parts.append(text)
+        self.parts.append("\n")
+
+    def indent(self):
+        self.level += 1
+
+    def dedent(self):
+        self.level -= 1
+
+    # Troca o nível atual e retorna o anterior
+    def set_level(self, level):
+        previous = self.level
+        self.level = level
+        return previous
+
+    def getvalue(self):
+        return "".join(self.parts)
@@ -0,0 +1,59 @@
+from trees.syntax_tree import SyntaxNode
+from trees.traversal import postorder
+
+
+# Subárvores de um nó: a condição guardada em `value` (se houver) e os filhos
+def _subnodes(node):
+    if isinstance(node.value, SyntaxNode):
+        return [node.value, *node.children]
+    return node.children
+
+
+class HashConsBuilder:
+    """
+    Compartilhamento de subárvores idênticas (hash-consing).
+
+    `intern(tree)` percorre a árvore em pós-ordem e troca cada subárvore por
+    uma instância canônica já vista com o mesmo tipo, valor, linha e filhos,
+    de modo que cópias repetidas de expressões e blocos passam a ser um único
+    objeto. Comandos iguais em linhas diferentes continuam separados, para
+    que cada um mantenha a própria linha.
+    A tabela de canônicos vive no builder, então um mesmo builder pode ser
+    usado em vários programas. As árvores resultantes são DAGs: os nós
+    compartilhados não devem ser alterados.
+    """
+
+    def __init__(self):
+        self._table = {}
+
+    def __len__(self):
+        return len(self._table)
+
+    # Retorna a árvore equivalente a `tree` com as subárvores compartilhadas
+    def intern(self, tree):
+        table = self._table
+        canonical = {}
+
+        for node in postorder(tree, _subnodes):
+            if id(node) in canonical:
+                continue
+
+            value = node.value
+            if isinstance(value, SyntaxNode):
+                value = canonical[id(value)]
+                value_key = (SyntaxNode, id(value))
+            else:
+                # O tipo faz parte da chave para não confundir 1, 1.0 e True
+                value_key = (type(value), value)
+            children = [canonical[id(child)] for child in node.children]
+            key = (node.node_type, node.line, value_key, tuple(map(id, children)))
+
+            shared = table.get(key)
+            if shared is None:
+                node.value = value
+                if children:
+                    node.children = children
+                shared = table[key] = node
+            canonical[id(node)] = shared
+
+        return canonical[id(tree)]
@@ -0,0 +1,234 @@
+"""
+Tradução de árvores sintáticas Minipar diretamente para objetos `ast` do Python.
+
+`lower_program(tree)` produz um `ast.Module` que pode ser passado direto a
+`compile()`, sem gerar e reanalisar texto Python. O resultado é o mesmo
+programa de `SyntaxNode.evaluate()`, com duas diferenças:
+
+- O corpo de cada bloco PAR vira um módulo separado (compilado à parte) e o
+  programa chama `par_block([__minipar_par__[i]])`, em que
+  `__minipar_par__` é a tupla dos code objects dos corpos, na ordem em que
+  aparecem na árvore. Blocos que iniciam PARs ficam dentro de
+  `with par_scope():`, que espera todos os ramos antes do fim do bloco.
+- Cada nó Python recebe como `lineno` a linha Minipar do comando de onde
+  veio (`SyntaxNode.line`), então tracebacks apontam para o código-fonte
+  Minipar. Comandos sem linha conhecida herdam a do comando que os contém.
+
+A tradução é feita com geradores executados por `trampoline`, sem recursão.
+"""
+
+import ast
+
+from common.tokens import TokenEnums as en
+from trees.syntax_tree import STATEMENTS
+from trees.traversal import trampoline
+
+# Nome, nos locals do programa, da tupla de code objects dos blocos PAR
+PAR_CODE_NAME = "__minipar_par__"
+
+BINARY_OPERATORS = {
+    en.OP_PLUS: ast.Add,
+    en.OP_MINUS: ast.Sub,
+    en.OP_MULTIPLY: ast.Mult,
+    en.OP_DIVIDE: ast.Div,
+}
+
+BOOLEAN_OPERATORS = {
+    en.OP_AND: ast.And,
+    en.OP_OR: ast.Or,
+}
+
+COMPARISON_OPERATORS = {
+    en.OP_GT: ast.Gt,
+    en.OP_LT: ast.Lt,
+    en.OP_GE: ast.GtE,
+    en.OP_LE: ast.LtE,
+    en.OP_EQ: ast.Eq,
+    en.OP_NE: ast.NotEq,
+}
+
+# Identificadores que no Python são constantes e não podem ser ast.Name
+CONSTANT_NAMES = {"True": True, "False": False, "None": None}
+
+LOAD = ast.Load()
+STORE = ast.Store()
+
+
+# Valor de uma string Minipar; sequências de escape têm o mesmo significado
+# que teriam no texto gerado por `evaluate()`
+def string_value(text):
+    if "\\" in text:
+        return ast.literal_eval(f'"{text}"')
+    return text
+
+
+class Lowering:
+    """
+    Estado de uma tradução: os módulos dos corpos PAR encontrados até agora.
+    """
+
+    def __init__(self):
+        self.par_bodies = []
+        # ids das listas de comandos que receberam uma chamada a par_block
+        self.scoped = set()
+
+    # Atributos de posição de todos os nós gerados para a linha `line`
+    @staticmethod
+    def location(line):
+        return {"lineno": line, "col_offset": 0, "end_lineno": line, "end_col_offset": 0}
+
+    def name(self, identifier, ctx, loc):
+        if identifier in CONSTANT_NAMES:
+            return ast.Constant(CONSTANT_NAMES[identifier], **loc)
+        return ast.Name(identifier, ctx, **loc)
+
+    def call(self, function, args, loc):
+        return ast.Call(ast.Name(function, LOAD, **loc), args, [], **loc)
+
+    # Expressão Python do nó. Folhas são traduzidas diretamente; os demais nós
+    # retornam um gerador para o trampolim
+    def expression(self, node, loc):
+        node_type = node.node_type
+        if node_type == en.ID:
+            return self.name(node.value, LOAD, loc)
+        if node_type == en.NUM:
+            return ast.Constant(node.value, **loc)
+        if node_type == en.STRING_LITERAL:
+            return ast.Constant(string_value(node.value), **loc)
+        return self._expression(node, loc)
+
+    def _expression(self, node, loc):
+        node_type = node.node_type
+        children = node.children
+
+        # Operadores unários (negação aritmética e lógica)
+        if node_type in (en.OP_MINUS, en.OP_NOT) and len(children) == 1:
+            operand = yield self.expression(children[0], loc)
+            op = ast.Not() if node_type == en.OP_NOT else ast.USub()
+            return ast.UnaryOp(op, operand, **loc)
+
+        if node_type in BINARY_OPERATORS:
+            left = yield self.expression(children[0], loc)
+            right = yield self.expression(children[1], loc)
+            return ast.BinOp(left, BINARY_OPERATORS[node_type](), right, **loc)
+
+        if node_type in BOOLEAN_OPERATORS:
+            left = yield self.expression(children[0], loc)
+            right = yield self.expression(children[1], loc)
+            return ast.BoolOp(BOOLEAN_OPERATORS[node_type](), [left, right], **loc)
+
+        if node_type in COMPARISON_OPERATORS:
+            left = yield self.expression(children[0], loc)
+            right = yield self.expression(children[1], loc)
+            return ast.Compare(left, [COMPARISON_OPERATORS[node_type]()], [right], **loc)
+
+        raise ValueError(f"Invalid node_type enum {node_type}")
+
+    # Acrescenta a `body` os comandos Python do comando `node`
+    def statement(self, node, line, body):
+        line = node.line or line
+        loc = self.location(line)
+        node_type = node.node_type
+
+        if node_type not in STATEMENTS:
+            value = yield self.expression(node, loc)
+            body.append(ast.Expr(value, **loc))
+
+        elif node_type == en.PROGRAM:
+            yield self.block(node, line, body)
+
+        elif node_type in (en.RW_INT, en.RW_STRING):
+            for child in node.children:
+                yield self.statement(child, line, body)
+
+        elif node_type == en.OP_ASSIGN:
+            value = yield self.expression(node.children[1], loc)
+            target = ast.Name(node.children[0].value, STORE, **loc)
+            body.append(ast.Assign([target], value, **loc))
+
+        # Loop for: inicialização seguida de um while com o incremento antes
+        # do corpo
+        elif node_type == en.RW_FOR:
+            yield self.statement(node.children[0], line, body)
+            test = yield self.expression(node.value, loc)
+            loop_body = []
+            yield self.statement(node.children[1], line, loop_body)
+            yield self.statement(node.children[2], line, loop_body)
+            body.append(ast.While(test, loop_body, [], **loc))
+
+        elif node_type == en.RW_IF:
+            test = yield self.expression(node.value, loc)
+            then_body = []
+            yield self.statement(node.children[0], line, then_body)
+            else_body = []
+            if len(node.children) > 1:
+                yield self.statement(node.children[1], line, else_body)
+            body.append(ast.If(test, then_body, else_body, **loc))
+
+        elif node_type == en.RW_WHILE:
+            test = yield self.expression(node.value, loc)
+            loop_body = []
+            yield self.statement(node.children[0], line, loop_body)
+            body.append(ast.While(test, loop_body, [], **loc))
+
+        elif node_type == en.BLOCK:
+            if not node.children:
+                body.append(ast.Pass(**loc))
+            yield self.block(node, line, body)
+
+        elif node_type == en.RW_PRINT:
+            args = []
+            for child in node.children:
+                args.append((yield self.expression(child, loc)))
+            body.append(ast.Expr(self.call("print", args, loc), **loc))
+
+        elif node_type == en.RW_INPUT:
+            target = node.children[0]
+            if target.node_type != en.ID:
+                raise ValueError(f"Invalid input target {target.node_type}")
+            value = self.call("input", [], loc)
+            body.append(ast.Assign([ast.Name(target.value, STORE, **loc)], value, **loc))
+
+        # Paralelismo: o corpo é um módulo à parte, referenciado pelo índice
+        elif node_type == en.RW_PAR:
+            par_body = []
+            yield self.statement(node.children[0], line, par_body)
+            index = len(self.par_bodies)
+            self.par_bodies.append(ast.Module(par_body, []))
+            code = ast.Subscript(
+                ast.Name(PAR_CODE_NAME, LOAD, **loc), ast.Constant(index, **loc), LOAD, **loc
+            )
+            call = self.call("par_block", [ast.List([code], LOAD, **loc)], loc)
+            body.append(ast.Expr(call, **loc))
+            self.scoped.add(id(body))
+
+        elif node_type == en.RW_SEQ:
+            yield self.statement(node.children[0], line, body)
+
+        elif node_type == en.RW_C_CHANNEL:
+            host = yield self.expression(node.children[0], loc)
+            kind = yield self.expression(node.children[1], loc)
+            body.append(ast.Expr(self.call("c_channel", [host, kind], loc), **loc))
+
+    # Acrescenta a `body` os comandos filhos de `node`; se algum deles
+    # iniciar um PAR, todos ficam dentro de `with par_scope():`
+    def block(self, node, line, body):
+        statements = []
+        for child in node.children:
+            yield self.statement(child, line, statements)
+        if id(statements) not in self.scoped:
+            body.extend(statements)
+            return
+
+        loc = self.location(node.line or line)
+        scope = ast.withitem(self.call("par_scope", [], loc))
+        body.append(ast.With([scope], statements, **loc))
+
+
+# Traduz a árvore do programa. Retorna o módulo principal e a lista dos
+# módulos dos corpos PAR, na ordem dos índices usados em `__minipar_par__`
+def lower_program(tree):
+    lowering = Lowering()
+    body = []
+    trampoline(lowering.statement(tree, 1, body))
+    return ast.Module(body, []), lowering.par_bodies
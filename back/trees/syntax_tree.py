@@ -1,211 +1,312 @@
+from hashlib import blake2b
+
 from common.tokens import TokenEnums as en
+from trees.codegen import CodeEmitter
+from trees.traversal import postorder, trampoline, walk
+
+# Filhos de todo nó folha: uma tupla vazia compartilhada, trocada por uma
+# lista própria no primeiro add_children
+NO_CHILDREN = ()
+
+# Nós que geram linhas completas; os demais são expressões
+STATEMENTS = frozenset(
+    (
+        en.PROGRAM,
+        en.RW_INT,
+        en.RW_STRING,
+        en.OP_ASSIGN,
+        en.RW_FOR,
+        en.RW_IF,
+        en.RW_WHILE,
+        en.BLOCK,
+        en.RW_PRINT,
+        en.RW_INPUT,
+        en.RW_PAR,
+        en.RW_SEQ,
+        en.RW_C_CHANNEL,
+    )
+)
+
+# Operadores binários emitidos entre parênteses
+BINARY_OPERATORS = {
+    en.OP_PLUS: " + ",
+    en.OP_MINUS: " - ",
+    en.OP_MULTIPLY: " * ",
+    en.OP_DIVIDE: " / ",
+    en.OP_AND: " and ",
+    en.OP_OR: " or ",
+}
+
+COMPARISON_OPERATORS = {
+    en.OP_GT: " > ",
+    en.OP_LT: " < ",
+    en.OP_GE: " >= ",
+    en.OP_LE: " <= ",
+    en.OP_EQ: " == ",
+    en.OP_NE: " != ",
+}
+
+
+# Subárvores de um nó (condição guardada em `value` e filhos) sem hash calculado
+def _unhashed_subnodes(node):
+    nodes = [child for child in node.children if child._hash is None]
+    if isinstance(node.value, SyntaxNode) and node.value._hash is None:
+        nodes.append(node.value)
+    return nodes
+
+
+def _merkle_hash(node):
+    digest = blake2b(digest_size=16)
+    digest.update(node.node_type.value.to_bytes(2, "little"))
+    value = node.value
+    if isinstance(value, SyntaxNode):
+        digest.update(b"N" + value._hash)
+    else:
+        digest.update(b"V" + repr(value).encode() + b"\0")
+    for child in node.children:
+        digest.update(child._hash)
+    return digest.digest()
 
 
 class SyntaxNode:
+    # Atributos fixos, sem __dict__ por instância
+    __slots__ = ("node_type", "value", "scope", "nparams", "children", "line", "_hash")
+
     # Inicializa um nó da árvore sintática com um tipo de nó e um valor opcional
     def __init__(self, node_type, value=None):
         self.node_type = node_type
         self.value = value
         self.scope = None
         self.nparams = None
-        self.children = []
+        self.children = NO_CHILDREN
+        # Linha do código-fonte Minipar em que o comando começa (se conhecida)
+        self.line = None
+        self._hash = None
 
     # Adiciona um nó filho ao nó atual
     def add_children(self, child_node):
-        self.children.append(child_node)
+        self._hash = None
+        if self.children is NO_CHILDREN:
+            self.children = [child_node]
+        else:
+            self.children.append(child_node)
+
+    # Hash estrutural (Merkle) da subárvore: 16 bytes que dependem apenas do
+    # tipo, do valor e dos hashes dos filhos, iguais para subárvores idênticas
+    # em qualquer processo. É calculado uma vez e guardado em cada nó, então
+    # serve de chave de cache para as etapas seguintes; a subárvore não deve
+    # ser alterada depois do cálculo.
+    def structural_hash(self):
+        if self._hash is None:
+            for node in postorder(self, _unhashed_subnodes):
+                node._hash = _merkle_hash(node)
+        return self._hash
 
     # Imprime a árvore sintática
     def print_tree(self, level=0):
-        indent = "    " * level
-        print(
-            f'{indent}{self.node_type} of value {self.value if self.value is not None else "--"}'
-        )
+        def enter(node, depth):
+            indent = "    " * (level + depth)
+            print(
+                f'{indent}{node.node_type} of value {node.value if node.value is not None else "--"}'
+            )
 
-        for child in self.children:
-            child.print_tree(level + 1)
+        walk(self, enter)
 
     # Converte o nó da árvore sintática em JSON
     def to_json(self):
+        return trampoline(self._to_json())
+
+    def _to_json(self):
         def convert_enum_to_str(value):
             if isinstance(value, en):
                 return value.name
             return value
 
+        if isinstance(self.value, SyntaxNode):
+            value = yield self.value._to_json()
+        else:
+            value = convert_enum_to_str(self.value) if self.value is not None else "--"
+
+        children = []
+        for child in self.children:
+            children.append((yield child._to_json()))
+
         node_json = {
             "node_type": convert_enum_to_str(self.node_type),
-            "value": (
-                self.value.to_json()
-                if isinstance(self.value, SyntaxNode)
-                else convert_enum_to_str(self.value) if self.value is not None else "--"
-            ),
-            "children": [child.to_json() for child in self.children],
+            "value": value,
+            "children": children,
         }
+        if self.line is not None:
+            node_json["line"] = self.line
         return node_json
 
     # Avalia a árvore sintática e gera código Python correspondente
     def evaluate(self, indent_level=0):
-        indent = "    " * indent_level  # Quatro espaços por nível de indentação
-        newline = "\n" if indent_level == 0 else ""
+        out = CodeEmitter(indent_level)
+        trampoline(self._emit(out))
+        return out.getvalue()
+
+    # Emite um comando: expressões usadas como comando ocupam uma linha própria
+    def _emit_statement(self, out):
+        if self.node_type in STATEMENTS:
+            yield self._emit(out)
+        else:
+            out.start_line()
+            yield self._emit(out)
+            out.end_line()
+
+    # Emite os comandos de um bloco um nível abaixo do atual
+    def _emit_body(self, out):
+        out.indent()
+        yield self._emit(out)
+        out.dedent()
+
+    # Escreve o código do nó em `out`. Folhas são escritas diretamente; os
+    # demais nós retornam um gerador para o trampolim, em que cada `yield`
+    # emite um nó filho na posição atual
+    def _emit(self, out):
+        node_type = self.node_type
+        if node_type == en.ID:
+            out.write(self.value)
+        elif node_type == en.NUM:
+            out.write(str(self.value))
+        elif node_type == en.STRING_LITERAL:
+            out.write(f'"{self.value}"')
+        else:
+            return self._emit_node(out)
+
+    def _emit_node(self, out):
+        node_type = self.node_type
 
-        if self.node_type == en.PROGRAM:
-            code = newline
+        if node_type == en.PROGRAM:
+            out.end_line()
             for child in self.children:
-                code += child.evaluate(indent_level) + "\n"
-            return code
+                yield child._emit_statement(out)
 
-        if self.node_type in [en.RW_INT, en.RW_STRING]:
-            output = ""
+        elif node_type in [en.RW_INT, en.RW_STRING]:
             for child in self.children:
-                output += child.evaluate(indent_level) + "\n"
-            return output
-
-        elif self.node_type == en.OP_ASSIGN:
-            variable = self.children[0].value
-            expression = self.children[1]
-            return f"{indent}{variable} = {expression.evaluate()}"
-
-        # Operações aritméticas
-        elif self.node_type in [en.OP_PLUS, en.OP_MINUS, en.OP_MULTIPLY, en.OP_DIVIDE]:
-            left = self.children[0].evaluate()
-            right = self.children[1].evaluate()
-
-            match self.node_type:
-                case en.OP_PLUS:
-                    return f"({left} + {right})"
-                case en.OP_MINUS:
-                    return f"({left} - {right})"
-                case en.OP_MULTIPLY:
-                    return f"({left} * {right})"
-                case en.OP_DIVIDE:
-                    return f"({left} / {right})"
-                case _:
-                    raise ValueError(f"Invalid node_type enum {self.node_type}")
-
-        # Identificador
-        elif self.node_type == en.ID:
-            return self.value
-
-        # Número
-        elif self.node_type == en.NUM:
-            return str(self.value)
-
-        # Literal de string
-        elif self.node_type == en.STRING_LITERAL:
-            return f'"{self.value}"'
+                yield child._emit_statement(out)
+
+        elif node_type == en.OP_ASSIGN:
+            out.start_line()
+            out.write(f"{self.children[0].value} = ")
+            yield self.children[1]._emit(out)
+            out.end_line()
+
+        # Operadores unários (negação aritmética e lógica)
+        elif node_type in [en.OP_MINUS, en.OP_NOT] and len(self.children) == 1:
+            out.write("(not " if node_type == en.OP_NOT else "(-")
+            yield self.children[0]._emit(out)
+            out.write(")")
+
+        # Operações aritméticas e lógicas
+        elif node_type in BINARY_OPERATORS:
+            out.write("(")
+            yield self.children[0]._emit(out)
+            out.write(BINARY_OPERATORS[node_type])
+            yield self.children[1]._emit(out)
+            out.write(")")
+
+        # Operações de comparação, entre parênteses para que comparações
+        # aninhadas não virem comparações encadeadas do Python
+        elif node_type in COMPARISON_OPERATORS:
+            out.write("(")
+            yield self.children[0]._emit(out)
+            out.write(COMPARISON_OPERATORS[node_type])
+            yield self.children[1]._emit(out)
+            out.write(")")
 
         # Loop for
-        elif self.node_type == en.RW_FOR:
-            init = self.children[0].evaluate()
-            condition = self.value.evaluate()
-            increment = self.children[1].evaluate(indent_level + 1)
-            block = self.children[2].evaluate(indent_level + 1)
-            return f"{indent}{init}\n{indent}while {condition}:\n{increment}\n{block}"
+        elif node_type == en.RW_FOR:
+            yield self.children[0]._emit_statement(out)
+            out.start_line()
+            out.write("while ")
+            yield self.value._emit(out)
+            out.write(":")
+            out.end_line()
+            out.indent()
+            yield self.children[1]._emit_statement(out)
+            yield self.children[2]._emit(out)
+            out.dedent()
 
         # Estrutura de controle if
-        elif self.node_type == en.RW_IF:
-            condition = self.value.evaluate()
-            block_true = self.children[0].evaluate(indent_level + 1)
+        elif node_type == en.RW_IF:
+            out.start_line()
+            out.write("if ")
+            yield self.value._emit(out)
+            out.write(":")
+            out.end_line()
+            yield self.children[0]._emit_body(out)
             if len(self.children) > 1:
-                block_false = self.children[1].evaluate(indent_level + 1)
-                return (
-                    f"{indent}if {condition}:\n{block_true}{indent}else:\n{block_false}"
-                )
-            else:
-                return f"{indent}if {condition}:\n{block_true}"
-
-        # Bloco de código
-        elif self.node_type == en.BLOCK:
-            block_code = ""
+                out.line("else:")
+                yield self.children[1]._emit_body(out)
+
+        # Loop while
+        elif node_type == en.RW_WHILE:
+            out.start_line()
+            out.write("while ")
+            yield self.value._emit(out)
+            out.write(":")
+            out.end_line()
+            yield self.children[0]._emit_body(out)
+
+        # Bloco de código (a indentação é definida pelo nó pai, como while e if)
+        elif node_type == en.BLOCK:
+            if not self.children:
+                out.line("pass")
             for child in self.children:
-                # Não incrementar o nível de indentação aqui, pois já está sendo considerado nos nós pai (como while, if).
-                block_code += child.evaluate(indent_level) + "\n"
-            return block_code.rstrip()
+                yield child._emit_statement(out)
 
         # Impressão
-        elif self.node_type == en.RW_PRINT:
-            expression = ""
-            num_children = len(self.children)
-            for i, child in enumerate(self.children):
-                expression += child.evaluate()
-                if i < num_children - 1:
-                    expression += ", "
-
-            return f"{indent}print({expression})\n"
+        elif node_type == en.RW_PRINT:
+            out.start_line()
+            out.write("print(")
+            for index, child in enumerate(self.children):
+                if index:
+                    out.write(", ")
+                yield child._emit(out)
+            out.write(")")
+            out.end_line()
 
         # Entrada de dados
-        elif self.node_type == en.RW_INPUT:
-            variable = self.children[0].evaluate()
-            return f"{indent}{variable} = input()"
-
-        # Operações de comparação
-        elif self.node_type in [
-            en.OP_GT,
-            en.OP_LT,
-            en.OP_GE,
-            en.OP_LE,
-            en.OP_EQ,
-            en.OP_NE,
-        ]:
-            left = self.children[0].evaluate()
-            right = self.children[1].evaluate()
-            if self.node_type == en.OP_GT:
-                return f"{left} > {right}"
-            elif self.node_type == en.OP_LT:
-                return f"{left} < {right}"
-            elif self.node_type == en.OP_GE:
-                return f"{left} >= {right}"
-            elif self.node_type == en.OP_LE:
-                return f"{left} <= {right}"
-            elif self.node_type == en.OP_EQ:
-                return f"{left} == {right}"
-            elif self.node_type == en.OP_NE:
-                return f"{left} != {right}"
-
-        # Loop while
-        elif self.node_type == en.RW_WHILE:
-            condition = self.value.evaluate()
-            block = self.children[0].evaluate(indent_level + 1)
-            return f"{indent}while {condition}:\n{block}"
-
-        # Paralelismo
-        elif self.node_type == en.RW_PAR:
-            block_code = self.children[0].evaluate(indent_level + 1).strip()
-            indent = "    " * indent_level
-
-            lines = block_code.splitlines()
-            st = "    " + lines[0]
-            lines[0] = st
-            # Calcula a indentação mínima considerando apenas linhas não vazias
-            min_indent = min((len(line) - len(line.lstrip())) for line in lines if line.strip())
-
-            # Remove a indentação mínima global, preservando a indentação relativa
-            normalized_block = "\n".join(
-                [(line[min_indent:] if line.strip() else "") for line in lines]
-            )
-
-
-#             for i in lines:
-#                 i.replace("    ", "")
-            # print("BLOCO NORMALIZADO: ",normalized_block)
-            # Retorna o código formatado dentro de par_block
-            return f"{indent}par_block(['''\n{normalized_block}\n{indent}'''])"
-
+        elif node_type == en.RW_INPUT:
+            out.start_line()
+            yield self.children[0]._emit(out)
+            out.write(" = input()")
+            out.end_line()
+
+        # Paralelismo: o corpo vai para dentro de uma string executada por
+        # par_block, então é emitido a partir da coluna zero
+        elif node_type == en.RW_PAR:
+            out.line("par_block(['''")
+            level = out.set_level(0)
+            yield self.children[0]._emit(out)
+            out.set_level(level)
+            out.line("'''])")
 
         # Sequencial
-        elif self.node_type == en.RW_SEQ:
-            block = self.children[0].evaluate(indent_level)
-            return f"{indent}{block}"
+        elif node_type == en.RW_SEQ:
+            yield self.children[0]._emit(out)
 
         # Canal de comunicação
-        elif self.node_type == en.RW_C_CHANNEL:
-            host = self.children[0].evaluate(indent_level)
-            type = self.children[1].evaluate(indent_level)
-            return f"{indent}c_channel({host}, {type})\n"
+        elif node_type == en.RW_C_CHANNEL:
+            out.start_line()
+            out.write("c_channel(")
+            yield self.children[0]._emit(out)
+            out.write(", ")
+            yield self.children[1]._emit(out)
+            out.write(")")
+            out.end_line()
+
         else:
-            raise ValueError(f"Invalid node_type enum {self.node_type}")
+            raise ValueError(f"Invalid node_type enum {node_type}")
 
     @classmethod
     def from_dict(cls, node_dict) -> "SyntaxNode":
+        return trampoline(cls._from_dict(node_dict))
+
+    @classmethod
+    def _from_dict(cls, node_dict):
         def convert_str_to_enum(value):
             if isinstance(value, str) and hasattr(en, value):
                 return getattr(en, value)
@@ -215,12 +316,13 @@ class SyntaxNode:
         node_type = convert_str_to_enum(node_dict["node_type"])
         value = node_dict["value"]
         if isinstance(value, dict):
-            value = cls.from_dict(value)
+            value = yield cls._from_dict(value)
         else:
             value = convert_str_to_enum(value) if value != "--" else None
 
         node = cls(node_type, value)
+        node.line = node_dict.get("line")
         for child_dict in node_dict["children"]:
-            child_node = cls.from_dict(child_dict)
+            child_node = yield cls._from_dict(child_dict)
             node.add_children(child_node)
         return node
@@ -0,0 +1,98 @@
+"""
+Percursos de árvores sintáticas sem recursão em Python.
+
+Todos usam uma pilha explícita, então a profundidade da árvore não esbarra
+no limite de recursão do interpretador:
+
+- `walk`: visita em profundidade com callbacks de entrada e saída.
+- `preorder` / `postorder`: geradores de nós em pré-ordem e pós-ordem.
+- `trampoline`: executa um percurso escrito como gerador recursivo. Onde
+  uma função recursiva chamaria `f(filho)`, o gerador faz
+  `resultado = yield f(filho)`; o trampolim empilha o subgerador e devolve
+  seu valor de retorno. Qualquer valor que não seja um gerador é devolvido
+  imediatamente, como o resultado de uma chamada que não recursa.
+"""
+
+from types import GeneratorType
+
+
+# Filhos de um nó (apenas a lista `children`)
+def node_children(node):
+    return node.children
+
+
+# Percorre a árvore chamando `enter(node, depth)` ao descer e
+# `exit(node, depth)` ao subir. Se `enter` retornar False, os filhos do nó
+# não são visitados (mas `exit` ainda é chamado).
+def walk(root, enter=None, exit=None, children=node_children):
+    stack = [(root, 0, False)]
+    while stack:
+        node, depth, leaving = stack.pop()
+        if leaving:
+            exit(node, depth)
+            continue
+
+        descend = enter(node, depth) if enter is not None else None
+        if exit is not None:
+            stack.append((node, depth, True))
+        if descend is not False:
+            stack.extend((child, depth + 1, False) for child in reversed(children(node)))
+
+
+# Nós em pré-ordem (pai antes dos filhos, filhos da esquerda para a direita)
+def preorder(root, children=node_children):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children(node)))
+
+
+# Nós em pós-ordem (filhos, da esquerda para a direita, antes do pai)
+def postorder(root, children=node_children):
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        if visited:
+            yield node
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children(node)))
+
+
+# Executa um gerador recursivo (ver o docstring do módulo) até o fim e
+# retorna seu valor. Exceções levantadas em um subgerador se propagam pelos
+# geradores que o aguardam, como em uma pilha de chamadas comum.
+def trampoline(generator):
+    if not isinstance(generator, GeneratorType):
+        return generator
+
+    stack = [generator]
+    send_value = None
+    error = None
+    while stack:
+        current = stack[-1]
+        try:
+            if error is not None:
+                pending, error = error, None
+                request = current.throw(pending)
+            else:
+                request = current.send(send_value)
+        except StopIteration as stop:
+            stack.pop()
+            send_value = stop.value
+            continue
+        except BaseException as e:
+            stack.pop()
+            if not stack:
+                raise
+            error = e
+            continue
+
+        if isinstance(request, GeneratorType):
+            stack.append(request)
+            send_value = None
+        else:
+            send_value = request
+
+    return send_value
@@ -0,0 +1,215 @@
+"""
+Formato binário de árvores sintáticas para troca entre os microsserviços.
+
+Layout (little-endian):
+
+    cabeçalho   b"MPST", versão (B), nº de nós (I), nº de valores (I)
+    tipos       código de TokenEnums de cada nó, em pré-ordem (H por nó)
+    filhos      quantidade de filhos de cada nó (I por nó)
+    valores     índice na tabela de valores (i por nó); NO_VALUE indica
+                ausência e SUBTREE indica que o valor é a subárvore que vem
+                logo a seguir, antes dos filhos
+    linhas      linha de origem de cada nó no código Minipar (I por nó; 0
+                quando desconhecida)
+    tabela      valores distintos, cada um com uma etiqueta de tipo
+
+Codificação e decodificação são iterativas, sem recursão.
+"""
+
+import struct
+import sys
+from array import array
+
+from common.token_kinds import ENUMS
+from common.tokens import TokenEnums
+from trees.syntax_tree import SyntaxNode
+
+MEDIA_TYPE = "application/x-minipar-ast"
+
+MAGIC = b"MPST"
+VERSION = 2
+HEADER = struct.Struct("<4sBII")
+
+NO_VALUE = -1
+SUBTREE = -2
+
+# Etiquetas da tabela de valores
+TAG_INT = b"i"
+TAG_BIG_INT = b"I"
+TAG_FLOAT = b"f"
+TAG_STR = b"s"
+TAG_BOOL = b"b"
+TAG_ENUM = b"e"
+
+INT64 = struct.Struct("<q")
+FLOAT64 = struct.Struct("<d")
+UINT32 = struct.Struct("<I")
+UINT16 = struct.Struct("<H")
+
+
+def _little_endian(*arrays):
+    if sys.byteorder == "big":
+        for item in arrays:
+            item.byteswap()
+
+
+def _encode_value(value, out):
+    if isinstance(value, bool):
+        out += TAG_BOOL + bytes([value])
+    elif isinstance(value, int):
+        if -(2**63) <= value < 2**63:
+            out += TAG_INT + INT64.pack(value)
+        else:
+            data = str(value).encode()
+            out += TAG_BIG_INT + UINT32.pack(len(data)) + data
+    elif isinstance(value, float):
+        out += TAG_FLOAT + FLOAT64.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += TAG_STR + UINT32.pack(len(data)) + data
+    elif isinstance(value, TokenEnums):
+        out += TAG_ENUM + UINT16.pack(value.value)
+    else:
+        raise TypeError(f"Cannot encode node value of type {type(value).__name__}")
+
+
+# Codifica a árvore com raiz `root` em bytes
+def encode_tree(root):
+    kinds = array("H")
+    counts = array("I")
+    value_ids = array("i")
+    lines = array("I")
+    values = []
+    value_index = {}
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        value = node.value
+        kinds.append(node.node_type.value)
+        counts.append(len(node.children))
+        lines.append(node.line or 0)
+        stack.extend(reversed(node.children))
+
+        if value is None:
+            value_ids.append(NO_VALUE)
+        elif isinstance(value, SyntaxNode):
+            value_ids.append(SUBTREE)
+            stack.append(value)
+        else:
+            # O tipo faz parte da chave para não confundir 1, 1.0 e True
+            key = (type(value), value)
+            value_id = value_index.get(key)
+            if value_id is None:
+                value_id = value_index[key] = len(values)
+                values.append(value)
+            value_ids.append(value_id)
+
+    _little_endian(kinds, counts, value_ids, lines)
+    out = bytearray(HEADER.pack(MAGIC, VERSION, len(kinds), len(values)))
+    out += kinds.tobytes()
+    out += counts.tobytes()
+    out += value_ids.tobytes()
+    out += lines.tobytes()
+    for value in values:
+        _encode_value(value, out)
+    return bytes(out)
+
+
+def _decode_values(data, offset, count):
+    values = []
+    view = memoryview(data)
+    for _ in range(count):
+        tag = data[offset : offset + 1]
+        offset += 1
+        if tag == TAG_INT:
+            values.append(INT64.unpack_from(data, offset)[0])
+            offset += INT64.size
+        elif tag == TAG_FLOAT:
+            values.append(FLOAT64.unpack_from(data, offset)[0])
+            offset += FLOAT64.size
+        elif tag in (TAG_STR, TAG_BIG_INT):
+            (size,) = UINT32.unpack_from(data, offset)
+            offset += UINT32.size
+            text = str(view[offset : offset + size], "utf-8")
+            values.append(text if tag == TAG_STR else int(text))
+            offset += size
+        elif tag == TAG_BOOL:
+            values.append(bool(data[offset]))
+            offset += 1
+        elif tag == TAG_ENUM:
+            values.append(ENUMS[UINT16.unpack_from(data, offset)[0]])
+            offset += UINT16.size
+        else:
+            raise ValueError(f"Invalid value tag {tag!r} in syntax tree")
+    return values
+
+
+# Decodifica bytes gerados por encode_tree de volta em uma árvore de SyntaxNode
+def decode_tree(data):
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated syntax tree header")
+    magic, version, node_count, value_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Unsupported syntax tree encoding")
+    if node_count == 0:
+        raise ValueError("Empty syntax tree")
+
+    offset = HEADER.size
+    kinds = array("H")
+    counts = array("I")
+    value_ids = array("i")
+    lines = array("I")
+    for item in (kinds, counts, value_ids, lines):
+        size = node_count * item.itemsize
+        item.frombytes(data[offset : offset + size])
+        offset += size
+    _little_endian(kinds, counts, value_ids, lines)
+    try:
+        values = _decode_values(data, offset, value_count)
+    except (struct.error, IndexError) as e:
+        raise ValueError("Truncated syntax tree value table") from e
+    except KeyError as e:
+        raise ValueError(f"Invalid token kind {e} in syntax tree value table") from e
+
+    root = None
+    # Nós abertos: [nó, filhos restantes, aguardando subárvore do valor]
+    stack = []
+    for kind, count, value_id, line in zip(kinds, counts, value_ids, lines):
+        try:
+            node_type = ENUMS[kind]
+        except KeyError:
+            raise ValueError(f"Invalid token kind {kind} in syntax tree") from None
+        if value_id >= 0:
+            try:
+                value = values[value_id]
+            except IndexError:
+                raise ValueError(f"Invalid value id {value_id} in syntax tree") from None
+        elif value_id in (NO_VALUE, SUBTREE):
+            value = None
+        else:
+            raise ValueError(f"Invalid value id {value_id} in syntax tree")
+        node = SyntaxNode(node_type, value)
+        if line:
+            node.line = line
+
+        if stack:
+            parent = stack[-1]
+            if parent[2]:
+                parent[0].value = node
+                parent[2] = False
+            else:
+                parent[0].add_children(node)
+                parent[1] -= 1
+        elif root is None:
+            root = node
+        else:
+            raise ValueError("Invalid syntax tree encoding: more than one root")
+
+        stack.append([node, count, value_id == SUBTREE])
+        while stack and not stack[-1][1] and not stack[-1][2]:
+            stack.pop()
+
+    if stack:
+        raise ValueError("Truncated syntax tree")
+    return root
@@ -18,8 +18,8 @@ const CodeEditor = () => {
         console.log('Submit');
         const headers = new Headers()
         headers.append("Content-Type", "application/json")
-        setOutput("Executando o microsserviço interpretador. . . ");
-        const response = await fetch("http://localhost:8000/interpret",{body: JSON.stringify({code: value, export: false}), method:"POST", headers})
+        setOutput("Executando o programa. . . ");
+        const response = await fetch("http://localhost:8005/run",{body: JSON.stringify({code: value, target: "interpret"}), method:"POST", headers})
         const data = await response.json();
         if(data.status == "error"){
             setOutput(data.message);